@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass
+class Coverage:
+    """
+    How much of the consumption the production covers per step, e.g. per quarter hour.
+    All statistics are computed on whole arrays, so a year of quarter hours takes a few array passes.
+
+    Steps without consumption have a coverage of 0.
+
+    Example:
+        coverage = Coverage(production_renewables, consumption)
+
+        surplus_80, surplus_90, surplus = coverage.count_covered((0.8, 0.9, 1.0))
+        histogram = coverage.get_histogram(resolution=10, clamp_overshoot=True, upper_limit=100)
+
+    Attributes:
+    -----------
+    production (NDArray) : The production per step.
+    consumption (NDArray) : The consumption per step, in the same unit as the production.
+
+    Methods:
+    --------
+    get_ratio() -> NDArray
+        Returns the production relative to the consumption per step.
+    get_percentages(rounding: str = 'round') -> NDArray
+        Returns the coverage per step in whole percent.
+    count_covered(shares: tuple[float, ...]) -> NDArray
+        Returns the number of steps in which the production covers each share of the consumption.
+    get_histogram(resolution: int = 1, clamp_overshoot: bool = False, upper_limit: int | None = None, rounding: str = 'floor') -> NDArray
+        Returns the number of steps per coverage slot.
+    """
+    production: NDArray
+    consumption: NDArray
+
+    def __post_init__(self):
+        self.production = np.asarray(self.production, dtype=float)
+        self.consumption = np.asarray(self.consumption, dtype=float)
+
+        if self.production.shape != self.consumption.shape:
+            raise ValueError(f'Production and consumption differ in shape: {self.production.shape} != {self.consumption.shape}')
+
+        # Masked division, steps without consumption stay at 0
+        self.ratio: NDArray = np.zeros(self.production.shape)
+        np.divide(self.production, self.consumption, out=self.ratio, where=self.consumption != 0)
+
+    def get_ratio(self) -> NDArray:
+        return self.ratio
+
+    def get_percentages(self, rounding: str = 'round') -> NDArray:
+        """
+        Returns the coverage per step in whole percent.
+
+        Args:
+            rounding (str, optional): 'round' to the nearest percent, like round(), or 'floor', like int(). Defaults to 'round'.
+
+        Returns:
+            NDArray: The percentages as integers. Never negative.
+
+        Raises:
+            ValueError: If the rounding is unknown.
+        """
+        if rounding == 'round':
+            percentages = np.rint(self.ratio * 100)
+        elif rounding == 'floor':
+            percentages = np.floor(self.ratio * 100)
+        else:
+            raise ValueError(f'Unknown rounding: {rounding}')
+
+        return np.maximum(percentages, 0).astype(np.int64)
+
+    def count_covered(self, shares: tuple[float, ...]) -> NDArray:
+        """
+        Returns the number of steps in which the production covers each share of the consumption,
+        i.e. consumption * share <= production.
+
+        Args:
+            shares (tuple[float, ...]): The shares, e.g. (0.8, 0.9, 1.0).
+
+        Returns:
+            NDArray: The number of steps per share.
+        """
+        shares = np.asarray(shares, dtype=float)
+
+        return np.count_nonzero(self.consumption[np.newaxis, :] * shares[:, np.newaxis] <= self.production[np.newaxis, :], axis=1)
+
+    def get_histogram(self, resolution: int = 1, clamp_overshoot: bool = False, upper_limit: int | None = None, rounding: str = 'floor') -> NDArray:
+        """
+        Returns the number of steps per coverage slot.
+        Slot i counts the steps with a coverage from i * resolution up to (i + 1) * resolution percent.
+
+        Args:
+            resolution (int, optional): The width of a slot in percent. Defaults to 1.
+            clamp_overshoot (bool, optional): Whether steps above the upper limit are counted in the last slot.
+                                              Otherwise they are not counted. Defaults to False.
+            upper_limit (int | None, optional): The coverage of the last slot in percent. Defaults to the largest coverage.
+            rounding (str, optional): How the coverage is rounded to whole percent, see get_percentages(). Defaults to 'floor'.
+
+        Returns:
+            NDArray: The number of steps per slot.
+        """
+        percentages = self.get_percentages(rounding)
+
+        if upper_limit is None:
+            upper_limit = int(percentages.max(initial=0))
+        elif clamp_overshoot:
+            percentages = np.minimum(percentages, upper_limit)
+        else:
+            percentages = percentages[percentages <= upper_limit]
+
+        return np.bincount(percentages // resolution, minlength=upper_limit // resolution + 1)
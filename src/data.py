@@ -13,6 +13,8 @@ from matplotlib.widgets import Button, Slider
 from typing import List
 import threading
 
+from progress import ProgressReporter, get_default_sink
+
 
 REFERENCE_YEAR = 2030
 RES_PATH = './static/res/'
@@ -107,87 +109,43 @@ def main():
     print(f'Number of entries with less than 100 MWh Wind production: {entries_with_no_wind}')
 
     # Compute commulative energy production of PV per month in 2020
-    pv_per_month_2020 = np.empty(12, dtype=int)
-    pv_per_month_2021 = np.empty(12, dtype=int)
-    pv_per_month_2022 = np.empty(12, dtype=int)
+    # The axes of the structured data are (year, month, day, hour, quarter),
+    # so the sums per month reduce the last three axes
+    pv_per_month_2020, pv_per_month_2021, pv_per_month_2022 = get_values(structured_data, 'pv').sum(axis=(2, 3, 4))
 
-    installed_pv_per_month_2020 = np.empty(12, dtype=int)
-    installed_pv_per_month_2021 = np.empty(12, dtype=int)
-    installed_pv_per_month_2022 = np.empty(12, dtype=int)
+    # The installed power of a month is that of its first quarter hour
+    installed_pv_per_month_2020, installed_pv_per_month_2021, installed_pv_per_month_2022 = get_values(structured_data[:, :, 0, 0, 0], 'installed_pv')
 
     print(f'#' * 100)
     print(f'# PV production and installed PV per month')
     print(f'~' * 100)
     print(f'                   2020        2021        2022                           2020        2021        2022')
 
-    for month in range(0, 12):
-        for day in range(0, 31):
-            for hour in range(0, 24):
-                for quarter in range(0, 4):
-                    pv_per_month_2020[month] += structured_data[0, month, day, hour, quarter].pv
-                    pv_per_month_2021[month] += structured_data[1, month, day, hour, quarter].pv
-                    pv_per_month_2022[month] += structured_data[2, month, day, hour, quarter].pv
-                    installed_pv_per_month_2020[month] = structured_data[0, month, 0, 0, 0].installed_pv
-                    installed_pv_per_month_2021[month] = structured_data[1, month, 0, 0, 0].installed_pv
-                    installed_pv_per_month_2022[month] = structured_data[2, month, 0, 0, 0].installed_pv
-
     for i in range(0, 12):
         print(f'PV Production:    {pv_per_month_2020[i] / 1_000_000_000_000:6.2f} TWh    {pv_per_month_2021[i] / 1_000_000_000_000:6.2f} TWh    {pv_per_month_2022[i] / 1_000_000_000_000:6.2f} TWh', end='')
         print(f' │ Installed PV:    {installed_pv_per_month_2020[i] / 1_000_000_000:6.2f} GW    {installed_pv_per_month_2021[i] / 1_000_000_000:6.2f} GW    {installed_pv_per_month_2022[i] / 1_000_000_000:6.2f} GW')
 
     # Compute commulative energy production of PV per month in 2020
-    wind_offshore_per_month_2020 = np.empty(12, dtype=int)
-    wind_offshore_per_month_2021 = np.empty(12, dtype=int)
-    wind_offshore_per_month_2022 = np.empty(12, dtype=int)
-
-    installed_wind_offshore_per_month_2020 = np.empty(12, dtype=int)
-    installed_wind_offshore_per_month_2021 = np.empty(12, dtype=int)
-    installed_wind_offshore_per_month_2022 = np.empty(12, dtype=int)
+    wind_offshore_per_month_2020, wind_offshore_per_month_2021, wind_offshore_per_month_2022 = get_values(structured_data, 'wind_offshore').sum(axis=(2, 3, 4))
+    installed_wind_offshore_per_month_2020, installed_wind_offshore_per_month_2021, installed_wind_offshore_per_month_2022 = get_values(structured_data[:, :, 0, 0, 0], 'installed_wind_offshore')
 
     print(f'#' * 100)
     print(f'# Wind Offshore production and installed Wind Offshore per month')
     print(f'~' * 100)
     print(f'                   2020        2021        2022                           2020        2021        2022')
 
-    for month in range(0, 12):
-        for day in range(0, 31):
-            for hour in range(0, 24):
-                for quarter in range(0, 4):
-                    wind_offshore_per_month_2020[month] += structured_data[0, month, day, hour, quarter].wind_offshore
-                    wind_offshore_per_month_2021[month] += structured_data[1, month, day, hour, quarter].wind_offshore
-                    wind_offshore_per_month_2022[month] += structured_data[2, month, day, hour, quarter].wind_offshore
-                    installed_wind_offshore_per_month_2020[month] = structured_data[0, month, 0, 0, 0].installed_wind_offshore
-                    installed_wind_offshore_per_month_2021[month] = structured_data[1, month, 0, 0, 0].installed_wind_offshore
-                    installed_wind_offshore_per_month_2022[month] = structured_data[2, month, 0, 0, 0].installed_wind_offshore
-
     for i in range(0, 12):
         print(f'Wind Offshore Production:    {wind_offshore_per_month_2020[i] / 1_000_000_000_000:6.2f} TWh    {wind_offshore_per_month_2021[i] / 1_000_000_000_000:6.2f} TWh    {wind_offshore_per_month_2022[i] / 1_000_000_000_000:6.2f} TWh', end='')
         print(f' │ Installed Wind Offshore:    {installed_wind_offshore_per_month_2020[i] / 1_000_000_000:6.2f} GW    {installed_wind_offshore_per_month_2021[i] / 1_000_000_000:6.2f} GW    {installed_wind_offshore_per_month_2022[i] / 1_000_000_000:6.2f} GW')
 
-    wind_onshore_per_month_2020 = np.empty(12, dtype=int)
-    wind_onshore_per_month_2021 = np.empty(12, dtype=int)
-    wind_onshore_per_month_2022 = np.empty(12, dtype=int)
-
-    installed_wind_onshore_per_month_2020 = np.empty(12, dtype=int)
-    installed_wind_onshore_per_month_2021 = np.empty(12, dtype=int)
-    installed_wind_onshore_per_month_2022 = np.empty(12, dtype=int)
+    wind_onshore_per_month_2020, wind_onshore_per_month_2021, wind_onshore_per_month_2022 = get_values(structured_data, 'wind_onshore').sum(axis=(2, 3, 4))
+    installed_wind_onshore_per_month_2020, installed_wind_onshore_per_month_2021, installed_wind_onshore_per_month_2022 = get_values(structured_data[:, :, 0, 0, 0], 'installed_wind_onshore')
 
     print(f'#' * 100)
     print(f'# Wind Onshore production and installed Wind Onshore per month')
     print(f'~' * 100)
     print(f'                   2020        2021        2022                           2020        2021        2022')
 
-    for month in range(0, 12):
-        for day in range(0, 31):
-            for hour in range(0, 24):
-                for quarter in range(0, 4):
-                    wind_onshore_per_month_2020[month] += structured_data[0, month, day, hour, quarter].wind_onshore
-                    wind_onshore_per_month_2021[month] += structured_data[1, month, day, hour, quarter].wind_onshore
-                    wind_onshore_per_month_2022[month] += structured_data[2, month, day, hour, quarter].wind_onshore
-                    installed_wind_onshore_per_month_2020[month] = structured_data[0, month, 0, 0, 0].installed_wind_onshore
-                    installed_wind_onshore_per_month_2021[month] = structured_data[1, month, 0, 0, 0].installed_wind_onshore
-                    installed_wind_onshore_per_month_2022[month] = structured_data[2, month, 0, 0, 0].installed_wind_onshore
-
     for i in range(0, 12):
         print(f'Wind Onshore Production:    {wind_onshore_per_month_2020[i] / 1_000_000_000_000:6.2f} TWh    {wind_onshore_per_month_2021[i] / 1_000_000_000_000:6.2f} TWh    {wind_onshore_per_month_2022[i] / 1_000_000_000_000:6.2f} TWh', end='')
         print(f' │ Installed Wind Onshore:    {installed_wind_onshore_per_month_2020[i] / 1_000_000_000:6.2f} GW    {installed_wind_onshore_per_month_2021[i] / 1_000_000_000:6.2f} GW    {installed_wind_onshore_per_month_2022[i] / 1_000_000_000:6.2f} GW')
@@ -198,23 +156,21 @@ def main():
     # 2020
     years = [2020, 2021, 2022]
 
+    # The sums per year reduce all axes but the first
+    yearly_axes = (1, 2, 3, 4)
+
+    total_load_per_year = get_values(structured_power_consumption_data, 'total_load').sum(axis=yearly_axes)
+    production_fossil_fuels_per_year = get_values(structured_data, 'total_fossil_fuels').sum(axis=yearly_axes)
+    production_renewables_per_year = get_values(structured_data, 'total_renewables').sum(axis=yearly_axes)
+    production_nuclear_per_year = get_values(structured_data, 'nuclear').sum(axis=yearly_axes)
+    production_total_per_year = get_values(structured_data, 'total_production').sum(axis=yearly_axes)
+
     for i, year in enumerate(years):
-        production_fossil_fuels = 0
-        production_renewables = 0
-        production_nuclear = 0
-        production_total = 0
-        total_load = 0
-        net_balance = 0
-
-        for month in range(0, 12):
-            for day in range(0, 31):
-                for hour in range(0, 24):
-                    for quarter in range(0, 4):
-                        total_load += structured_power_consumption_data[i, month, day, hour, quarter].total_load
-                        production_fossil_fuels += structured_data[i, month, day, hour, quarter].total_fossil_fuels()
-                        production_renewables += structured_data[i, month, day, hour, quarter].total_renewables()
-                        production_nuclear += structured_data[i, month, day, hour, quarter].nuclear
-                        production_total += structured_data[i, month, day, hour, quarter].total_production()
+        production_fossil_fuels = production_fossil_fuels_per_year[i]
+        production_renewables = production_renewables_per_year[i]
+        production_nuclear = production_nuclear_per_year[i]
+        production_total = production_total_per_year[i]
+        total_load = total_load_per_year[i]
 
         net_balance = production_total - total_load
 
@@ -246,24 +202,15 @@ def main():
     print(f'Maximum PV production per hour relative to installed capacity')
     print('~' * 40)
 
-    max_percentage = 0.0
-    max_timestamp = (None, None)
+    interpolated_pv_production = get_values(structured_data, 'pv') * 4
+    installed_pv = get_values(structured_data[:, :, 0, 0, 0], 'installed_pv')[:, :, np.newaxis, np.newaxis, np.newaxis]
+    percentages = (interpolated_pv_production / installed_pv * 100).ravel()
 
-    for year in range(0, 3):
-        for month in range(0, 12):
-            for day in range(0, 31):
-                for hour in range(0, 24):
-                    for quarter in range(0, 4):
-                        pv_production = structured_data[year, month, day, hour, quarter].pv
-                        interpolated_pv_production = pv_production * 4
-                        installed_pv = structured_data[year, month, 0, 0, 0].installed_pv
-                        percentage = interpolated_pv_production / installed_pv * 100
+    # The last quarter hour with the maximum
+    i = percentages.size - 1 - np.argmax(percentages[::-1])
 
-                        start_time = structured_data[year, month, day, hour, quarter].start
-                        end_time = structured_data[year, month, day, hour, quarter].end
-
-                        max_timestamp = (start_time, end_time) if percentage >= max_percentage else max_timestamp
-                        max_percentage = max(max_percentage, percentage)
+    max_percentage = max(0.0, percentages[i])
+    max_timestamp = (structured_data.flat[i].start, structured_data.flat[i].end)
 
 
     print(f'Maximum PV production: {max_percentage:.2f}%')
@@ -334,24 +281,33 @@ def main():
 
 def compute_best_pv_month(data):
     # Compute average pv production per month
-    pv_per_month = np.empty(12, dtype=int)
-
-    for month in range(0, 12):
-        for day in range(0, 31):
-            for hour in range(0, 24):
-                for quarter in range(0, 4):
-                    pv_per_month[month] += data[0, month, day, hour, quarter].pv
-
+    pv_per_month = get_values(data[0], 'pv').sum(axis=(1, 2, 3))
 
     # Find month with highest pv production
-    best_month = 0
-    for month in range(0, 12):
-        if pv_per_month[month] > pv_per_month[best_month]:
-            best_month = month
+    best_month = int(np.argmax(pv_per_month))
 
     return best_month
 
 
+def get_values(data: np.ndarray, name: str) -> np.ndarray:
+    """
+    Returns an attribute of every entry of structured data as one float array,
+    so aggregations over the calendar axes are array reductions.
+
+    Args:
+        data (np.ndarray): The structured data, e.g. of shape (3, 12, 31, 24, 4).
+        name (str): The attribute, e.g. 'pv', or a method without arguments, e.g. 'total_renewables'.
+
+    Returns:
+        np.ndarray: The values in the shape of the data.
+    """
+    def get_value(entry) -> float:
+        value = getattr(entry, name)
+        return value() if callable(value) else value
+
+    return np.vectorize(get_value, otypes=[float])(data)
+
+
 def plot_day(p_data, c_data):
     # Merge data array into one array
     p_data = p_data.flatten()
@@ -652,8 +608,6 @@ def load_power_consumption_data() -> np.ndarray:
     print(f'╠ Importing data...')
     print(f'╠ Path: {path}')
     print(f'╠')
-    print(f'╠ Reading row: ')
-    print(f'╠ Parsing data: ', end='')
     sys.stdout.flush()
 
     import_success = False
@@ -662,6 +616,9 @@ def load_power_consumption_data() -> np.ndarray:
 
     i = 0
 
+    # Rate-limited, so the terminal isn't updated for every row
+    progress = ProgressReporter(total=data.size, sink=get_default_sink(prefix='╠ Parsing data: '))
+
     try:
         with open(path, 'r') as file:
             reader = csv.reader(file, delimiter=';')
@@ -673,19 +630,7 @@ def load_power_consumption_data() -> np.ndarray:
                 data_entry = PowerConsumptionData()
                 data_entry.init(row)
                 data[i] = data_entry
-                # Go one line up
-                print('\033[1A', end='')
-                # Set cursor to x 16
-                print('\033[17G', end='')
-                # Print row number
-                print(f'{i+1}', end='')
-                # Go one line down
-                print('\033[1B', end='')
-                # Set cursor to x 16
-                print('\033[17G', end='')
-                sys.stdout.flush()
-
-                print(data_entry.start.strftime('%d.%m.%Y %H:%M'), end='')
+                progress.update(i + 1, data_entry.start.strftime('%d.%m.%Y %H:%M'))
                 # data = np.append(data, data_entry)
                 i += 1
 
@@ -703,7 +648,7 @@ def load_power_consumption_data() -> np.ndarray:
         err = 'Unknown error.'
         err_msg = str(e)
     finally:
-        print('\n', end='')
+        progress.finish()
         print(f'╠')
         print(f'╠ Summary')
         print(f'╠ Imported {i} data entries.')
@@ -749,8 +694,6 @@ def load_installed_capacity(data: np.ndarray) -> np.ndarray:
     print(f'╠ Importing data...')
     print(f'╠ Path: {path}')
     print(f'╠')
-    print(f'╠ Reading row: ')
-    print(f'╠ Parsing data: ', end='')
 
     import_success = False
     err = ''
@@ -758,6 +701,9 @@ def load_installed_capacity(data: np.ndarray) -> np.ndarray:
 
     i = 0
 
+    # Rate-limited, so the terminal isn't updated for every row
+    progress = ProgressReporter(total=data.size, sink=get_default_sink(prefix='╠ Parsing data: '))
+
     try:
         with open(path, 'r') as file:
             reader = csv.reader(file, delimiter=';')
@@ -769,19 +715,7 @@ def load_installed_capacity(data: np.ndarray) -> np.ndarray:
 
             for row in reader:
                 data[i].init_installed_capacity(row)
-                # Go one line up
-                print('\033[1A', end='')
-                # Set cursor to x 16
-                print('\033[17G', end='')
-                # Print row number
-                print(f'{i+1}', end='')
-                # Go one line down
-                print('\033[1B', end='')
-                # Set cursor to x 16
-                print('\033[17G', end='')
-                sys.stdout.flush()
-
-                print(data[i].start.strftime('%d.%m.%Y %H:%M'), end='')
+                progress.update(i + 1, data[i].start.strftime('%d.%m.%Y %H:%M'))
                 i += 1
 
             import_success = True
@@ -798,7 +732,7 @@ def load_installed_capacity(data: np.ndarray) -> np.ndarray:
         err = 'Unknown error.'
         err_msg = str(e)
     finally:
-        print('\n', end='')
+        progress.finish()
         print(f'╠')
         print(f'╠ Summary')
         print(f'╠ Imported {i} data entries.')
@@ -903,8 +837,6 @@ def load_data() -> np.ndarray:
     print(f'╠ Importing data...')
     print(f'╠ Path: {path}')
     print(f'╠')
-    print(f'╠ Reading row: ')
-    print(f'╠ Parsing data: ', end='')
 
     import_success = False
     err = ''
@@ -912,6 +844,9 @@ def load_data() -> np.ndarray:
 
     i = 0
 
+    # Rate-limited, so the terminal isn't updated for every row
+    progress = ProgressReporter(total=data.size, sink=get_default_sink(prefix='╠ Parsing data: '))
+
     try:
         with open(path, 'r') as file:
             reader = csv.reader(file, delimiter=';')
@@ -925,19 +860,7 @@ def load_data() -> np.ndarray:
                 data_entry = Data()
                 data_entry.init(row)
                 data[i] = data_entry
-                # Go one line up
-                print('\033[1A', end='')
-                # Set cursor to x 16
-                print('\033[17G', end='')
-                # Print row number
-                print(f'{i+1}', end='')
-                # Go one line down
-                print('\033[1B', end='')
-                # Set cursor to x 16
-                print('\033[17G', end='')
-                sys.stdout.flush()
-
-                print(data_entry.start.strftime('%d.%m.%Y %H:%M'), end='')
+                progress.update(i + 1, data_entry.start.strftime('%d.%m.%Y %H:%M'))
                 i += 1
 
             import_success = True
@@ -954,7 +877,7 @@ def load_data() -> np.ndarray:
         err = 'Unknown error.'
         err_msg = str(e)
     finally:
-        print('\n', end='')
+        progress.finish()
         print(f'╠')
         print(f'╠ Summary')
         print(f'╠ Imported {i} data entries.')
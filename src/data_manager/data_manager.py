@@ -1,14 +1,14 @@
-from dataclasses import dataclass, field
-from io import TextIOWrapper
+from dataclasses import dataclass, field, fields, replace
+import hashlib
 import os
 import sys
-from threading import Thread
+from threading import Lock, Thread
 from time import sleep, time, perf_counter
-from typing import Callable, Type, TypeAlias
+from typing import Callable, ClassVar, Iterator, Type, TypeAlias
 import datetime as dt
-from pytz import timezone
-import csv
+from datetime import tzinfo
 import numpy as np
+import pandas as pd
 from numpy.typing import NDArray
 
 @dataclass(unsafe_hash=True)
@@ -131,6 +131,273 @@ class Data:
 DataArray: TypeAlias = type[np.ndarray[Data]]
 
 
+# Column names of the columnar storage, e.g. 'production.pv' or 'consumption.load'.
+# The order matches the rows of Collection.values.
+COLUMNS: list[str] = [
+    *[f'production.{f.name}' for f in fields(Data.Production)],
+    *[f'power.{f.name}' for f in fields(Data.Power)],
+    *[f'consumption.{f.name}' for f in fields(Data.Consumption)],
+]
+
+COLUMN_INDEX: dict[str, int] = {name: i for i, name in enumerate(COLUMNS)}
+
+RENEWABLES: list[str] = ['pv', 'wind_offshore', 'wind_onshore', 'biomass', 'hydro', 'other_renewables']
+FOSSILS: list[str]    = ['coal', 'lignite', 'gas', 'other_conventionals']
+
+
+# The aggregations of Collection.resample() and DataView.group_by().
+AGGREGATIONS: tuple[str, ...] = ('sum', 'mean', 'min', 'max', 'first', 'last', 'quantile')
+
+# The calendar keys of DataView.group_by() and the attributes of a pandas DatetimeIndex they are read from.
+CALENDAR_KEYS: dict[str, str] = {
+    'year':           'year',
+    'month_of_year':  'month',
+    'day_of_month':   'day',
+    'day_of_week':    'dayofweek',
+    'hour_of_day':    'hour',
+    'minute_of_hour': 'minute',
+}
+
+
+class Aggregation:
+    """
+    Reductions over segments of consecutive rows, shared by the rollups,
+    Collection.resample() and DataView.group_by().
+    Every aggregation is a single pass over the rows with np.ufunc.reduceat or fancy indexing.
+    """
+    @staticmethod
+    def reduce(values: NDArray[np.float64], offsets: NDArray[np.int64], agg: str = 'sum', q: float = 0.5) -> NDArray[np.float64]:
+        """
+        Reduces the rows of every segment.
+
+        Args:
+            values (NDArray[np.float64]): The 2D values of shape (columns, rows).
+            offsets (NDArray[np.int64]): The position of the first row of every segment, followed by the number of rows.
+                                         Segments must not be empty.
+            agg (str, optional): One of AGGREGATIONS. Defaults to 'sum'.
+            q (float, optional): The quantile from 0 to 1 of 'quantile'. Defaults to 0.5, the median.
+
+        Returns:
+            NDArray[np.float64]: The 2D values of shape (columns, segments).
+
+        Raises:
+            ValueError: If the aggregation is unknown or the quantile is out of range.
+        """
+        starts = offsets[:-1]
+
+        if agg not in AGGREGATIONS:
+            raise ValueError(f'Unknown aggregation: {agg}')
+
+        if starts.size == 0:
+            return np.zeros((values.shape[0], 0))
+
+        if agg == 'sum':
+            return np.add.reduceat(values, starts, axis=1)
+        elif agg == 'mean':
+            return np.add.reduceat(values, starts, axis=1) / np.diff(offsets)
+        elif agg == 'min':
+            return np.minimum.reduceat(values, starts, axis=1)
+        elif agg == 'max':
+            return np.maximum.reduceat(values, starts, axis=1)
+        elif agg == 'first':
+            return values[:, starts]
+        elif agg == 'last':
+            return values[:, offsets[1:] - 1]
+
+        return Aggregation.get_quantiles(values, offsets, q)
+
+    @staticmethod
+    def get_quantiles(values: NDArray[np.float64], offsets: NDArray[np.int64], q: float) -> NDArray[np.float64]:
+        """
+        Returns the quantile of every segment, interpolated linearly like np.quantile().
+
+        Args:
+            values (NDArray[np.float64]): The 2D values of shape (columns, rows).
+            offsets (NDArray[np.int64]): The position of the first row of every segment, followed by the number of rows.
+            q (float): The quantile from 0 to 1.
+
+        Returns:
+            NDArray[np.float64]: The 2D values of shape (columns, segments).
+
+        Raises:
+            ValueError: If the quantile is out of range.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f'The quantile has to be between 0 and 1, not {q}.')
+
+        counts = np.diff(offsets)
+        segments = np.repeat(np.arange(counts.size), counts)
+
+        # The position of the quantile in every sorted segment
+        positions = offsets[:-1] + q * (counts - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, offsets[1:] - 1)
+        fraction = positions - lower
+
+        result = np.empty((values.shape[0], counts.size))
+
+        for i, column in enumerate(values):
+            # Sort the values within their segments
+            ordered = column[np.lexsort((column, segments))]
+            result[i] = ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+        return result
+
+
+@dataclass(frozen=True)
+class DataView:
+    """
+    A read-only view onto the columnar storage of a Collection.
+
+    The view shares its memory with the Collection it was created from.
+    Iterating or indexing a single row materializes a Data object,
+    which keeps the old object-based API usable.
+    For reductions use get_column() and get_total() instead.
+
+    Attributes:
+    -----------
+    timestamps (NDArray[np.int64]) : The unix start timestamps of the rows.
+    values (NDArray[np.float64]) : The 2D array of shape (len(COLUMNS), size).
+    tz (tzinfo | None) : The timezone of materialized datetimes. None means local time.
+    """
+    timestamps: NDArray[np.int64]
+    values: NDArray[np.float64]
+    tz: tzinfo | None = None
+
+    @property
+    def size(self) -> int:
+        return self.timestamps.size
+
+    def __len__(self) -> int:
+        return self.timestamps.size
+
+    def __iter__(self) -> Iterator[Data]:
+        for i in range(self.timestamps.size):
+            yield self.get_data(i)
+
+    def __getitem__(self, key: int | slice) -> 'Data | DataView':
+        if isinstance(key, slice):
+            return DataView(self.timestamps[key], self.values[:, key], self.tz)
+
+        return self.get_data(key)
+
+    def get_data(self, index: int) -> Data:
+        """
+        Materializes the row at the given index as a Data object.
+
+        Args:
+            index (int): The index of the row.
+
+        Returns:
+            Data: A new Data object holding a copy of the row.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        start = dt.datetime.fromtimestamp(int(self.timestamps[index]), tz=self.tz)
+        data = Data(start=start)
+
+        row = self.values[:, index]
+
+        for name, value in zip(COLUMNS, row):
+            category, value_field = name.split('.')
+            setattr(getattr(data, category), value_field, float(value))
+
+        return data
+
+    def get_column(self, name: str) -> NDArray[np.float64]:
+        """
+        Returns the column with the given name, e.g. 'production.pv'.
+
+        Args:
+            name (str): The name of the column.
+
+        Returns:
+            NDArray[np.float64]: A view onto the column.
+
+        Raises:
+            KeyError: If the column does not exist.
+        """
+        return self.values[COLUMN_INDEX[name]]
+
+    def get_total(self, category: str, value_fields: list[str] | None = None) -> NDArray[np.float64]:
+        """
+        Returns the row-wise sum of the given fields of a category.
+
+        Args:
+            category (str): The category, i.e. 'production', 'power' or 'consumption'.
+            value_fields (list[str], optional): The fields to sum. Defaults to all fields of the category.
+
+        Returns:
+            NDArray[np.float64]: The row-wise sum.
+        """
+        if value_fields is None:
+            rows = [i for name, i in COLUMN_INDEX.items() if name.startswith(f'{category}.')]
+        else:
+            rows = [COLUMN_INDEX[f'{category}.{f}'] for f in value_fields]
+
+        return self.values[rows].sum(axis=0)
+
+    def get_total_renewables(self, category: str = 'production') -> NDArray[np.float64]:
+        return self.get_total(category, RENEWABLES)
+
+    def get_total_fossils(self, category: str = 'production') -> NDArray[np.float64]:
+        return self.get_total(category, FOSSILS)
+
+    def get_datetimes(self) -> NDArray[np.datetime64]:
+        """
+        Returns the start timestamps as UTC datetime64 values.
+
+        Returns:
+            NDArray[np.datetime64]: The start timestamps.
+        """
+        return self.timestamps.astype('datetime64[s]')
+
+    def group_by(self, keys: str | tuple[str, ...], fields: list[str] | None = None, agg: str = 'sum', q: float = 0.5, tz: str = 'Europe/Berlin') -> pd.DataFrame:
+        """
+        Aggregates the rows by calendar keys, e.g. the mean PV production per hour of the day.
+        The rows are sorted by their group once, so every aggregation is a reduction over consecutive rows.
+
+        Args:
+            keys (str | tuple[str, ...]): One or more of CALENDAR_KEYS, e.g. ('year', 'month_of_year').
+            fields (list[str], optional): The columns, e.g. ['production.pv']. Defaults to all columns.
+            agg (str, optional): One of AGGREGATIONS. 'first' and 'last' refer to the order of the rows. Defaults to 'sum'.
+            q (float, optional): The quantile from 0 to 1 of 'quantile'. Defaults to 0.5, the median.
+            tz (str, optional): The timezone of the calendar. Defaults to 'Europe/Berlin'.
+
+        Returns:
+            pd.DataFrame: One row per group with rows, indexed by the keys, and one column per field.
+
+        Raises:
+            KeyError: If a key or a column is unknown.
+            ValueError: If the aggregation is unknown.
+        """
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        fields = COLUMNS if fields is None else fields
+
+        datetimes = pd.to_datetime(self.timestamps, unit='s', utc=True).tz_convert(tz)
+
+        # Number the values of every key and combine the numbers into one label per row
+        uniques, inverses = zip(*[np.unique(getattr(datetimes, CALENDAR_KEYS[key]).to_numpy(), return_inverse=True) for key in keys])
+        dims = tuple(max(u.size, 1) for u in uniques)
+        groups, labels = np.unique(np.ravel_multi_index(inverses, dims), return_inverse=True)
+
+        order = np.argsort(labels, kind='stable')
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=groups.size)))).astype(np.int64)
+
+        values = Aggregation.reduce(self.values[[COLUMN_INDEX[name] for name in fields]][:, order], offsets, agg, q)
+
+        index = pd.MultiIndex.from_arrays(
+            [u[i] for u, i in zip(uniques, np.unravel_index(groups, dims))],
+            names=keys,
+        )
+
+        if len(keys) == 1:
+            index = index.get_level_values(0)
+
+        return pd.DataFrame(values.T, index=index, columns=fields)
+
+
 class DataNotFoundException(Exception):
     """
     A class representing a data not found exception.
@@ -139,6 +406,14 @@ class DataNotFoundException(Exception):
         super().__init__(message)
 
 
+class CollectionFrozenException(Exception):
+    """
+    A class representing an exception raised when a frozen Collection is modified.
+    """
+    def __init__(self, message: str = 'Collection is frozen. Use copy() to get a mutable Collection.') -> None:
+        super().__init__(message)
+
+
 @dataclass(unsafe_hash=True)
 class TestCaseResult:
     """
@@ -249,57 +524,381 @@ class TestCase:
 
 
 @dataclass
-class Collection:
+class TimestampIndex:
+    """
+    A lookup index over the start timestamps of a Collection.
+
+    If the timestamps form a gapless grid (e.g. every 15 minutes),
+    positions are computed arithmetically. Otherwise a binary search
+    over the sorted timestamps is used.
+
+    Attributes:
+    -----------
+    timestamps (NDArray[np.int64]) : The sorted timestamps.
+    order (NDArray[np.int64] | None) : The row positions of the sorted timestamps. None if the rows are already sorted.
+    step (int | None) : The grid step in seconds. None if the timestamps are not on a regular grid.
+    """
+    timestamps: NDArray[np.int64]    = field(default=None)
+    order: NDArray[np.int64] | None  = field(default=None)
+    step: int | None                 = field(default=None)
+
+    @staticmethod
+    def build(timestamps: NDArray[np.int64]) -> 'TimestampIndex':
+        """
+        Builds an index over the given timestamps.
+
+        Args:
+            timestamps (NDArray[np.int64]): The start timestamps of the rows.
+
+        Returns:
+            TimestampIndex: The index.
+        """
+        order = None
+
+        if np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+
+        step = None
+        steps = np.diff(timestamps)
+
+        if steps.size > 0 and steps[0] > 0 and np.all(steps == steps[0]):
+            step = int(steps[0])
+
+        return TimestampIndex(timestamps=timestamps, order=order, step=step)
+
+    def find(self, timestamp: int) -> int:
+        """
+        Returns the row position of the given timestamp.
+
+        Args:
+            timestamp (int): The unix start timestamp.
+
+        Returns:
+            int: The row position or -1 if the timestamp was not found.
+        """
+        return int(self.find_many(np.array([timestamp], dtype=np.int64))[0])
+
+    def find_many(self, timestamps: NDArray[np.int64]) -> NDArray[np.int64]:
+        """
+        Returns the row positions of the given timestamps.
+
+        Args:
+            timestamps (NDArray[np.int64]): The unix start timestamps.
+
+        Returns:
+            NDArray[np.int64]: The row positions. Missing timestamps are -1.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+
+        if self.timestamps.size == 0:
+            return np.full(timestamps.shape, -1, dtype=np.int64)
+
+        if self.step is not None:
+            positions = (timestamps - self.timestamps[0]) // self.step
+        else:
+            positions = np.searchsorted(self.timestamps, timestamps, side='left')
+
+        positions = np.clip(positions, 0, self.timestamps.size - 1)
+        found = self.timestamps[positions] == timestamps
+
+        if self.order is not None:
+            positions = self.order[positions]
+
+        return np.where(found, positions, -1)
+
+    def search(self, timestamp: int, side: str = 'left') -> int:
+        """
+        Returns the sorted position at which the given timestamp would be inserted.
+
+        Args:
+            timestamp (int): The unix timestamp.
+            side (str, optional): 'left' or 'right', see np.searchsorted. Defaults to 'left'.
+
+        Returns:
+            int: The insertion position.
+        """
+        return int(np.searchsorted(self.timestamps, timestamp, side=side))
+
+
+# The calendar levels of the pre-aggregated rollups of a Collection, from fine to coarse.
+ROLLUP_LEVELS: tuple[str, ...] = ('hour', 'day', 'week', 'month', 'year')
+
+# The finer level every level is aggregated from. Its buckets have to nest, e.g. weeks don't nest in months.
+ROLLUP_PARENTS: dict[str, str] = {'day': 'hour', 'week': 'day', 'month': 'day', 'year': 'month'}
+
+# Columns that hold a level instead of an amount, e.g. the installed power.
+# Rollups keep their last value instead of summing them.
+LEVEL_COLUMNS: list[str] = [f'power.{f.name}' for f in fields(Data.Power)]
+
+
+@dataclass(frozen=True)
+class Rollup:
     """
-    A collection of Data objects.
+    The rows of a Collection pre-aggregated to one calendar level, e.g. one row per month.
+    Production and consumption are summed over the rows of a bucket,
+    the columns in LEVEL_COLUMNS keep the value of the last row.
+
+    Buckets are consecutive rows with the same calendar key, so they refer to the rows in time order.
 
     Attributes:
     -----------
-    length (int) : The number of elements in the data array.
-    data (DataArray) : The data array.
+    level (str) : The level, one of ROLLUP_LEVELS.
+    tz (str) : The timezone of the calendar.
+    timestamps (NDArray[np.int64]) : The unix start timestamp of the first row of every bucket.
+    offsets (NDArray[np.int64]) : The position of the first row of every bucket, followed by the number of rows.
+    values (NDArray[np.float64]) : The 2D array of shape (len(COLUMNS), number of buckets).
+    """
+    level: str
+    tz: str
+    timestamps: NDArray[np.int64]
+    offsets: NDArray[np.int64]
+    values: NDArray[np.float64]
+
+    @property
+    def size(self) -> int:
+        return self.timestamps.size
+
+    def get_all(self) -> DataView:
+        """
+        Returns the buckets as a view, one row per bucket.
+
+        Returns:
+            DataView: The buckets.
+        """
+        return DataView(self.timestamps, self.values)
+
+    @staticmethod
+    def build_all(timestamps: NDArray[np.int64], values: NDArray[np.float64], tz: str = 'Europe/Berlin') -> dict[str, 'Rollup']:
+        """
+        Builds the rollups of all levels. The calendar is computed once for all of them
+        and only the hours are aggregated from the rows, coarser levels from the level in ROLLUP_PARENTS.
+
+        Args:
+            timestamps (NDArray[np.int64]): The sorted unix start timestamps of the rows.
+            values (NDArray[np.float64]): The 2D values of the rows in the same order.
+            tz (str, optional): The timezone of the calendar. Defaults to 'Europe/Berlin'.
+
+        Returns:
+            dict[str, Rollup]: The rollup per level in ROLLUP_LEVELS.
+        """
+        datetimes = pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(tz).tz_localize(None).to_numpy()
+
+        rollups = {}
+
+        for level in ROLLUP_LEVELS:
+            parent = rollups.get(ROLLUP_PARENTS.get(level))
+
+            # The rows or buckets of the parent the level is aggregated from
+            if parent is None:
+                source_offsets = np.arange(timestamps.size + 1)
+                source_values = values
+            else:
+                source_offsets = parent.offsets
+                source_values = parent.values
+
+            keys = Rollup.get_keys(datetimes[source_offsets[:-1]], level)
+
+            # A bucket starts wherever the key changes
+            starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+            starts = np.concatenate(([0], starts, [keys.size])) if keys.size > 0 else np.zeros(1)
+            starts = starts.astype(np.int64)
+
+            offsets = source_offsets[starts]
+
+            rollup = Rollup(level, tz, timestamps[offsets[:-1]], offsets, Rollup.aggregate(source_values, starts))
+
+            for array in (rollup.timestamps, rollup.offsets, rollup.values):
+                array.flags.writeable = False
+
+            rollups[level] = rollup
+
+        return rollups
+
+    @staticmethod
+    def get_keys(datetimes: NDArray[np.datetime64], level: str) -> NDArray[np.int64]:
+        """
+        Returns the calendar key of every row. Rows in the same bucket have the same key.
+
+        Args:
+            datetimes (NDArray[np.datetime64]): The local wall-clock start datetimes of the rows.
+            level (str): The level, one of ROLLUP_LEVELS.
+
+        Returns:
+            NDArray[np.int64]: The key per row.
+
+        Raises:
+            ValueError: If the level is unknown.
+        """
+        if level == 'hour':
+            return datetimes.astype('datetime64[h]').astype(np.int64)
+        elif level == 'day':
+            return datetimes.astype('datetime64[D]').astype(np.int64)
+        elif level == 'week':
+            # 1970-01-05 is the first Monday of the epoch
+            return (datetimes.astype('datetime64[D]').astype(np.int64) - 4) // 7
+        elif level == 'month':
+            return datetimes.astype('datetime64[M]').astype(np.int64)
+        elif level == 'year':
+            return datetimes.astype('datetime64[Y]').astype(np.int64)
+
+        raise ValueError(f'Unknown rollup level: {level}')
+
+    @staticmethod
+    def aggregate(values: NDArray[np.float64], offsets: NDArray[np.int64]) -> NDArray[np.float64]:
+        """
+        Aggregates consecutive rows into buckets: sums, except for LEVEL_COLUMNS, which keep the last value.
+
+        Args:
+            values (NDArray[np.float64]): The 2D values of the rows.
+            offsets (NDArray[np.int64]): The position of the first row of every bucket, followed by the number of rows.
+                                         Buckets must not be empty.
+
+        Returns:
+            NDArray[np.float64]: The 2D values of the buckets.
+        """
+        result = Aggregation.reduce(values, offsets, 'sum')
+
+        last = [COLUMN_INDEX[name] for name in LEVEL_COLUMNS]
+        result[last] = Aggregation.reduce(values[last], offsets, 'last')
+
+        return result
+
+
+@dataclass
+class Collection:
     """
-    length: int                = field(default=0, init=False)
-    name: str                  = field(default='n/a', init=False)
-    parse_func: Callable       = field(default=None, init=False)
-    test_cases: list[TestCase] = field(default_factory=list, init=False)
+    A collection of energy data stored column-wise.
 
-    def data_field() -> DataArray:
-        return np.array(0, dtype=Data)
+    Every field of Data (e.g. 'production.pv') is stored as one contiguous
+    float64 array and the start datetimes are stored as int64 unix timestamps.
+    All columns live in one 2D array, so slicing the collection never copies.
 
-    data: DataArray = field(default_factory=data_field, init=False)
+    Attributes:
+    -----------
+    length (int) : The number of rows.
+    timestamps (NDArray[np.int64]) : The unix start timestamps of the rows.
+    values (NDArray[np.float64]) : The 2D array of shape (len(COLUMNS), length).
+    tz (tzinfo | None) : The timezone of materialized datetimes. None means local time.
+    index (TimestampIndex | None) : The lookup index over the timestamps. None until it is built.
+    frozen (bool) : Whether the Collection is read-only. Frozen Collections are shared between sessions.
+    version (str | None) : Identifies the loaded data, e.g. for cache keys. None if unknown.
+    rollups (dict[str, Rollup] | None) : The pre-aggregated rows per level. Built when the Collection is frozen.
+    """
+    length: int                       = field(default=0, init=False)
+    name: str                         = field(default='n/a', init=False)
+    parse_func: Callable              = field(default=None, init=False)
+    test_cases: list[TestCase]        = field(default_factory=list, init=False)
+    timestamps: NDArray[np.int64]     = field(default=None, init=False)
+    values: NDArray[np.float64]       = field(default=None, init=False)
+    tz: tzinfo | None                 = field(default=None, init=False)
+    index: TimestampIndex | None      = field(default=None, init=False)
+    frozen: bool                      = field(default=False, init=False)
+    version: str | None               = field(default=None, init=False)
+    rollups: dict[str, Rollup] | None = field(default=None, init=False)
 
     def __init__(self, size: int=0) -> None:
         """
         Initializes a Collection object.
 
         Args:
-            size (int, optional): The size of the data array. Defaults to 0.
+            size (int, optional): The number of rows. Defaults to 0.
         """
         self.length = size
         self.name = 'n/a'
         self.parse_func = None
         self.test_cases = list()
-        self.data = np.empty(size, dtype=Data)
-
-    def __iter__(self) -> iter:
+        self.tz = None
+        self.index = None
+        self.frozen = False
+        self.version = None
+        self.rollups = None
+        self.set_size(size)
+
+    def __iter__(self) -> Iterator[Data]:
         """
-        Returns an iterator for the data array.
+        Returns an iterator over the rows as Data objects.
 
         Returns:
-            Data: An iterator for the data array.
+            Iterator[Data]: An iterator over the rows.
         """
-        return iter(self.data)
+        return iter(self.get_all())
 
     def set_size(self, size: int) -> None:
         """
-        Sets the size of the data array.
+        Sets the number of rows. All previous data will be discarded.
+
+        Args:
+            size (int): The new number of rows.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+        """
+        self.check_frozen()
+
+        self.timestamps = np.zeros(size, dtype=np.int64)
+        self.values = np.zeros((len(COLUMNS), size), dtype=np.float64)
+
+        self.length = size
+        self.index = None
+
+    def freeze(self) -> None:
+        """
+        Makes the Collection read-only, so it can be shared by reference.
+        Modifying methods raise a CollectionFrozenException afterwards.
+        """
+        # Build the index and the rollups now, so readers never have to build them concurrently
+        self.get_index()
+        self.rollups = self.build_rollups()
+
+        self.timestamps.flags.writeable = False
+        self.values.flags.writeable = False
+
+        self.frozen = True
+
+    def is_frozen(self) -> bool:
+        return self.frozen
+
+    def check_frozen(self) -> None:
+        """
+        Checks that the Collection may be modified.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+        """
+        if self.frozen:
+            raise CollectionFrozenException()
+
+    def copy(self) -> 'Collection':
+        """
+        Returns a mutable copy of the Collection.
+        This is the copy-on-write path for callers that want to modify a frozen Collection.
+        The copy has no version, since it is meant to be modified.
+
+        Returns:
+            Collection: The copy.
+        """
+        collection = Collection()
+        collection.set_name(self.name)
+        collection.set_tz(self.tz)
+        collection.set_parse_func(self.parse_func)
+        collection.test_cases = list(self.test_cases)
+        collection.set_columns(np.array(self.timestamps), np.array(self.values))
+        collection.index = self.index
+
+        return collection
+
+    def set_version(self, version: str | None) -> None:
+        """
+        Sets the version of the loaded data.
 
         Args:
-            size (int): The new size of the data array.
+            version (str | None): The version. None if unknown.
         """
-        self.data = np.empty(size, dtype=Data)
+        self.version = version
 
-        self.length = self.data.size
+    def get_version(self) -> str | None:
+        return self.version
 
     def set_name(self, name: str):
         """
@@ -310,12 +909,22 @@ class Collection:
         """
         self.name = name
 
+    def set_tz(self, tz: tzinfo | None) -> None:
+        """
+        Sets the timezone used to materialize datetimes.
+
+        Args:
+            tz (tzinfo | None): The timezone. None means local time.
+        """
+        self.tz = tz
+
     def set_parse_func(self, func: Callable) -> None:
         """
         Sets the parse function of the collection.
+        The function takes the CSV file as a DataFrame and returns the timestamps and the values.
 
         Args:
-            func (Type[Data]): The new parse function of the collection.
+            func (Callable[[pd.DataFrame], tuple[NDArray[np.int64], NDArray[np.float64]]]): The new parse function of the collection.
         """
         self.parse_func = func
 
@@ -337,30 +946,261 @@ class Collection:
         """
         self.test_cases.append(test_case)
 
-    def get_all(self) -> DataArray:
+    def get_all(self) -> DataView:
         """
-        Returns the entire data array.
+        Returns a view onto the entire collection.
 
         Returns:
-            DataArray: The entire data array.
+            DataView: A view onto the entire collection.
         """
-        return self.data
+        return DataView(self.timestamps, self.values, self.tz)
 
-    def get_range(self, start: dt.datetime, end: dt.datetime) -> DataArray:
+    def get_column(self, name: str) -> NDArray[np.float64]:
         """
-        Returns a subset of the data array based on the given start and end datetimes.
+        Returns the column with the given name, e.g. 'production.pv'.
 
         Args:
-            start (dt.datetime): The starting datetime of the subset.
-            end (dt.datetime): The ending datetime of the subset.
+            name (str): The name of the column.
 
         Returns:
-            DataArray: A subset of the data array.
+            NDArray[np.float64]: A view onto the column.
+
+        Raises:
+            KeyError: If the column does not exist.
         """
-        data_as_list = [d for d in self.data if d.start >= start and d.start <= end]
-        data_as_NDArray = np.array(data_as_list, dtype=Data)
-        return data_as_NDArray
+        return self.values[COLUMN_INDEX[name]]
 
+    def set_column(self, name: str, values: NDArray) -> None:
+        """
+        Overwrites the column with the given name.
+
+        Args:
+            name (str): The name of the column.
+            values (NDArray): The new values. Scalars are broadcast.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+            KeyError: If the column does not exist.
+        """
+        self.check_frozen()
+
+        self.values[COLUMN_INDEX[name]] = values
+
+    def set_timestamps(self, timestamps: NDArray) -> None:
+        """
+        Overwrites the start timestamps.
+
+        Args:
+            timestamps (NDArray): The unix start timestamps.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+        """
+        self.check_frozen()
+
+        self.timestamps[:] = timestamps
+
+        self.index = None
+
+    def get_range(self, start: dt.datetime, end: dt.datetime, inclusive: bool = True) -> DataView:
+        """
+        Returns a subset of the collection based on the given start and end datetimes.
+
+        Args:
+            start (dt.datetime): The starting datetime of the subset.
+            end (dt.datetime): The ending datetime of the subset.
+            inclusive (bool, optional): If False, the end is excluded (half-open interval). Defaults to True.
+
+        Returns:
+            DataView: A subset of the collection.
+        """
+        return self.get_range_by_timestamp(int(start.timestamp()), int(end.timestamp()), inclusive)
+
+    def get_range_by_timestamp(self, start: int, end: int, inclusive: bool = True) -> DataView:
+        """
+        Returns a subset of the collection based on the given start and end timestamps.
+        The subset is a view and shares its memory with the collection.
+
+        Args:
+            start (int): The starting unix timestamp of the subset.
+            end (int): The ending unix timestamp of the subset.
+            inclusive (bool, optional): If False, the end is excluded (half-open interval). Defaults to True.
+
+        Returns:
+            DataView: A subset of the collection.
+        """
+        index = self.get_index()
+
+        if index.order is not None:
+            # Unsorted rows cannot be sliced, so we fall back to a copy
+            mask = (self.timestamps >= start) & ((self.timestamps <= end) if inclusive else (self.timestamps < end))
+            return DataView(self.timestamps[mask], self.values[:, mask], self.tz)
+
+        start_index = index.search(start, side='left')
+        end_index = index.search(end, side='right' if inclusive else 'left')
+
+        return self.get_by_index_range(start_index, end_index)
+
+    def build_rollups(self, tz: str = 'Europe/Berlin') -> dict[str, Rollup]:
+        """
+        Builds the rollups of all levels in ROLLUP_LEVELS.
+
+        Args:
+            tz (str, optional): The timezone of the calendar. Defaults to 'Europe/Berlin'.
+
+        Returns:
+            dict[str, Rollup]: The rollup per level.
+        """
+        index = self.get_index()
+
+        if index.order is None:
+            return Rollup.build_all(self.timestamps, self.values, tz)
+
+        return Rollup.build_all(index.timestamps, self.values[:, index.order], tz)
+
+    def get_rollup(self, level: str) -> Rollup:
+        """
+        Returns the rollup of the given level.
+        Frozen Collections return the rollup built by freeze(), others build it on every call,
+        since their values may have changed.
+
+        Args:
+            level (str): The level, one of ROLLUP_LEVELS.
+
+        Returns:
+            Rollup: The rollup.
+
+        Raises:
+            KeyError: If the level is unknown.
+        """
+        if self.rollups is not None:
+            return self.rollups[level]
+
+        return self.build_rollups()[level]
+
+    def get_rollup_range(self, level: str, start: dt.datetime, end: dt.datetime, inclusive: bool = True) -> DataView:
+        """
+        Returns the rows between the given start and end datetimes aggregated to the given level.
+
+        Args:
+            level (str): The level, one of ROLLUP_LEVELS.
+            start (dt.datetime): The starting datetime.
+            end (dt.datetime): The ending datetime.
+            inclusive (bool, optional): If False, the end is excluded (half-open interval). Defaults to True.
+
+        Returns:
+            DataView: One row per bucket, see get_rollup_range_by_timestamp().
+        """
+        return self.get_rollup_range_by_timestamp(level, int(start.timestamp()), int(end.timestamp()), inclusive)
+
+    def get_rollup_range_by_timestamp(self, level: str, start: int, end: int, inclusive: bool = True) -> DataView:
+        """
+        Returns the rows between the given start and end timestamps aggregated to the given level.
+        Buckets that lie completely in the range are read from the rollup,
+        so e.g. eight years of quarter hours by month read about a hundred rows.
+        Buckets cut by the start or the end only aggregate the rows in the range.
+
+        Args:
+            level (str): The level, one of ROLLUP_LEVELS.
+            start (int): The starting unix timestamp.
+            end (int): The ending unix timestamp.
+            inclusive (bool, optional): If False, the end is excluded (half-open interval). Defaults to True.
+
+        Returns:
+            DataView: One row per bucket. The timestamp of a bucket is that of its first row in the range.
+                      A view onto the rollup, if no bucket is cut.
+
+        Raises:
+            KeyError: If the level is unknown.
+        """
+        rollup = self.get_rollup(level)
+        index = self.get_index()
+
+        # Positions in time order, like the offsets of the rollup
+        start_index = index.search(start, side='left')
+        end_index = max(index.search(end, side='right' if inclusive else 'left'), start_index)
+
+        # The buckets from first to last lie completely in the range
+        first = int(np.searchsorted(rollup.offsets, start_index, side='left'))
+        last = int(np.searchsorted(rollup.offsets, end_index, side='right')) - 1
+
+        def aggregate_rows(row_start: int, row_end: int) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+            rows = np.arange(row_start, row_end)
+
+            if index.order is not None:
+                rows = index.order[rows]
+
+            return self.timestamps[rows[:1]], Rollup.aggregate(self.values[:, rows], np.array([0, rows.size]))
+
+        if first > last:
+            # The range lies within one bucket
+            if start_index == end_index:
+                return DataView(rollup.timestamps[:0], rollup.values[:, :0], self.tz)
+
+            return DataView(*aggregate_rows(start_index, end_index), self.tz)
+
+        parts = []
+
+        if start_index < rollup.offsets[first]:
+            parts.append(aggregate_rows(start_index, rollup.offsets[first]))
+
+        parts.append((rollup.timestamps[first:last], rollup.values[:, first:last]))
+
+        if rollup.offsets[last] < end_index:
+            parts.append(aggregate_rows(rollup.offsets[last], end_index))
+
+        if len(parts) == 1:
+            return DataView(*parts[0], self.tz)
+
+        return DataView(
+            np.concatenate([timestamps for timestamps, _ in parts]),
+            np.concatenate([values for _, values in parts], axis=1),
+            self.tz,
+        )
+
+    def resample(self, freq: str, fields: list[str] | None = None, agg: str = 'sum', q: float = 0.5) -> pd.DataFrame:
+        """
+        Aggregates the rows to a calendar level, e.g. the daily mean of the load.
+        The buckets are those of the rollup of the level, so aggregations the rollup already holds,
+        i.e. sums and the last values of LEVEL_COLUMNS, are read from it.
+
+        Args:
+            freq (str): The level, one of ROLLUP_LEVELS.
+            fields (list[str], optional): The columns, e.g. ['production.pv']. Defaults to all columns.
+            agg (str, optional): One of AGGREGATIONS. Defaults to 'sum'.
+            q (float, optional): The quantile from 0 to 1 of 'quantile'. Defaults to 0.5, the median.
+
+        Returns:
+            pd.DataFrame: One row per bucket, indexed by the start of its first row, and one column per field.
+
+        Raises:
+            KeyError: If the level or a column is unknown.
+            ValueError: If the aggregation is unknown.
+        """
+        fields = COLUMNS if fields is None else fields
+        rows = [COLUMN_INDEX[name] for name in fields]
+
+        rollup = self.get_rollup(freq)
+
+        if all(agg == ('last' if name in LEVEL_COLUMNS else 'sum') for name in fields):
+            values = rollup.values[rows]
+        else:
+            index = self.get_index()
+            values = self.values[rows] if index.order is None else self.values[rows][:, index.order]
+            values = Aggregation.reduce(values, rollup.offsets, agg, q)
+
+        start = pd.to_datetime(rollup.timestamps, unit='s', utc=True).tz_convert(rollup.tz).rename('start')
+
+        return pd.DataFrame(values.T, index=start, columns=fields)
+
+    def group_by(self, keys: str | tuple[str, ...], fields: list[str] | None = None, agg: str = 'sum', q: float = 0.5, tz: str = 'Europe/Berlin') -> pd.DataFrame:
+        """
+        Aggregates all rows by calendar keys, see DataView.group_by().
+
+        Returns:
+            pd.DataFrame: One row per group with rows, indexed by the keys, and one column per field.
+        """
+        return self.get_all().group_by(keys, fields, agg, q, tz)
 
     def get(self, start: dt.datetime, unsafe_return: bool = False) -> Data | None:
         """
@@ -376,230 +1216,708 @@ class Collection:
         Raises:
             DataNotFoundException: If no data was found for the given start datetime and unsafe_return is False.
         """
-        data: Data | None = next((d for d in self.data if d.start == start), None)
+        index = self.find(int(start.timestamp()))
+
+        if index < 0:
+            if not unsafe_return:
+                raise DataNotFoundException(f'No data found for start datetime {start}')
+            return None
+
+        return self.get_all().get_data(index)
+
+    def get_year(self, year: int) -> DataView:
+        """
+        Returns the data for the given year.
+
+        Args:
+            year (dt.datetime): The year of the data to return.
+
+        Returns:
+            DataView: The data for the given year.
+        """
+        start = dt.datetime(year, 1, 1, 0, 0)
+        end = dt.datetime(year + 1, 1, 1, 0, 0)
+        return self.get_range(start, end, inclusive=False)
+
+    def get_month(self, year: int, month: int) -> DataView:
+        """
+        Returns the data for the given month.
+
+        Args:
+            year (dt.datetime): The year of the data to return.
+            month (dt.datetime): The month of the data to return.
+
+        Returns:
+            DataView: The data for the given month.
+        """
+        start = dt.datetime(year, month, 1, 0, 0)
+        end = dt.datetime(year + month // 12, month % 12 + 1, 1, 0, 0)
+        return self.get_range(start, end, inclusive=False)
+
+    def get_day(self, year: int, month: int, day: int) -> DataView:
+        """
+        Returns the data for the given day.
+
+        Args:
+            year (dt.datetime): The year of the data to return.
+            month (dt.datetime): The month of the data to return.
+            day (dt.datetime): The day of the data to return.
+
+        Returns:
+            DataView: The data for the given day.
+        """
+        start = dt.datetime(year, month, day, 0, 0)
+        end = start + dt.timedelta(days=1)
+        return self.get_range(start, end, inclusive=False)
+
+    def get_by_timestamp(self, start: int, unsafe_return: bool = False) -> Data | None:
+        """
+        Returns the data at the given start timestamp.
+
+        Args:
+            start (int): The start timestamp of the data to return.
+            unsafe_return (bool, optional): If True, the function will return None if no data was found. Defaults to False.
+
+        Returns:
+            Data | None: The data at the given start timestamp or None if no data was found and unsafe_return is True.
+
+        Raises:
+            DataNotFoundException: If no data was found for the given start timestamp and unsafe_return is False.
+        """
+        index = self.find(start)
+
+        if index < 0:
+            if not unsafe_return:
+                raise DataNotFoundException(f'No data found for start datetime {dt.datetime.fromtimestamp(start)}')
+            return None
+
+        return self.get_all().get_data(index)
+
+    def build_index(self) -> TimestampIndex:
+        """
+        Builds the lookup index over the start timestamps.
+        The index is dropped whenever the timestamps change.
+
+        Returns:
+            TimestampIndex: The new index.
+        """
+        self.index = TimestampIndex.build(self.timestamps)
+
+        return self.index
+
+    def get_index(self) -> TimestampIndex:
+        """
+        Returns the lookup index and builds it if necessary.
+
+        Returns:
+            TimestampIndex: The lookup index.
+        """
+        if self.index is None:
+            self.build_index()
+
+        return self.index
+
+    def find(self, timestamp: int) -> int:
+        """
+        Returns the row index of the given start timestamp.
+
+        Args:
+            timestamp (int): The unix start timestamp.
+
+        Returns:
+            int: The row index or -1 if the timestamp was not found.
+        """
+        return self.get_index().find(timestamp)
+
+    def find_many(self, timestamps: NDArray[np.int64]) -> NDArray[np.int64]:
+        """
+        Returns the row indices of the given start timestamps.
+
+        Args:
+            timestamps (NDArray[np.int64]): The unix start timestamps.
+
+        Returns:
+            NDArray[np.int64]: The row indices. Missing timestamps are -1.
+        """
+        return self.get_index().find_many(timestamps)
+
+    def get_by_index(self, index: int, unsafe_return: bool = False) -> Data | None:
+        """
+        Returns the data at the given index.
+
+        Args:
+            index (int): The index of the data to return.
+            unsafe_return (bool, optional): If True, the function will return None if the index is out of range. Defaults to False.
+
+        Returns:
+            Data | None: The data at the given index or None if the index is out of range and unsafe_return is True.
+
+        Raises:
+            DataNotFoundException: If the index is out of range and unsafe_return is False.
+        """
+        try:
+            return self.get_all().get_data(index)
+        except IndexError as _:
+            if not unsafe_return:
+                raise DataNotFoundException(f'No data found for index {index}')
+            else:
+                return None
+
+    def get_by_index_range(self, start: int, end: int) -> DataView:
+        """
+        Returns a subset of the collection based on the given start and end indices.
+
+        Args:
+            start (int): The starting index of the subset.
+            end (int): The ending index of the subset.
+
+        Returns:
+            DataView: A subset of the collection.
+        """
+        return self.get_all()[start:end]
+
+    def get_last_of_year(self, year: int) -> Data:
+        """
+        Returns the last data of the given year.
+
+        Args:
+            year (int): The year of the data to return.
+
+        Returns:
+            Data: The last data of the given year.
+        """
+        year: DataView = self.get_year(year)
+        return year[-1]
+
+    def get_length(self) -> int:
+        """
+        Returns the number of rows.
+
+        Returns:
+        int: The number of rows.
+        """
+        return self.length
+
+    def add(self, data: Data) -> None:
+        """
+        Adds the given data at the end of the Collection.
+
+        Args:
+            data: The data to add to the array.
+        """
+        self.append(np.array([data], dtype=Data))
+
+    def insert(self, data: Data, index: int) -> None:
+        """
+        Inserts the given data at the given index of the Collection.
+
+        Args:
+            data: The data to insert into the array.
+            index: The index at which the data will be inserted.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+            IndexError: If the given index is out of range.
+        """
+        self.check_frozen()
+
+        try:
+            self.timestamps[index] = int(data.start.timestamp())
+        except IndexError as e:
+            raise IndexError(f'Index {index} is out of range. This Collection only has {self.length} elements.') from e
+
+        self.values[:, index] = Collection.to_row(data)
+
+        self.index = None
+
+    def append(self, data: DataArray) -> None:
+        """
+        Appends the given data to the end of the Collection.
+
+        Args:
+            data: The data to append to the array.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+        """
+        self.check_frozen()
+
+        timestamps, values = Collection.to_columns(data)
+
+        self.timestamps = np.concatenate((self.timestamps, timestamps))
+        self.values = np.concatenate((self.values, values), axis=1)
+
+        self.length = self.timestamps.size
+        self.index = None
+
+    def remove(self, data: Data) -> bool:
+        """
+        Removes the given data from the Collection.
+
+        Args:
+            data: The data to remove from the array.
+
+        Returns:
+            bool: True if the data was found and removed, False otherwise.
+        """
+        mask = (self.timestamps == int(data.start.timestamp()))
+        mask &= np.all(self.values == Collection.to_row(data)[:, np.newaxis], axis=0)
+
+        return self.remove_mask(mask)
+
+    def remove_by_start(self, start: dt.datetime) -> bool:
+        """
+        Removes the data with the given start datetime from the Collection.
+
+        Args:
+            start (dt.datetime): The start datetime of the data to remove.
+
+        Returns:
+            bool: True if the data was found and removed, False otherwise.
+        """
+        return self.remove_mask(self.timestamps == int(start.timestamp()))
+
+    def remove_mask(self, mask: NDArray[np.bool_]) -> bool:
+        """
+        Removes all rows where the given mask is True.
+
+        Args:
+            mask (NDArray[np.bool_]): The rows to remove.
+
+        Returns:
+            bool: True if at least one row was removed, False otherwise.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+        """
+        self.check_frozen()
+
+        prev_length = self.length
+
+        self.timestamps = self.timestamps[~mask]
+        self.values = self.values[:, ~mask]
+
+        self.length = self.timestamps.size
+        self.index = None
+
+        return prev_length != self.length
+
+    def set(self, data: DataArray | DataView) -> int:
+        """
+        Sets the entire content of the Collection to the given data.
+        All previous data will be overwritten.
+
+        Args:
+            data (DataArray | DataView): The data to set.
+
+        Returns:
+            int: The length of the new data.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+        """
+        self.check_frozen()
+
+        if isinstance(data, DataView):
+            self.timestamps = np.array(data.timestamps, dtype=np.int64)
+            self.values = np.array(data.values, dtype=np.float64)
+        else:
+            self.timestamps, self.values = Collection.to_columns(data)
+
+        self.length = self.timestamps.size
+        self.index = None
+
+        return self.length
+
+    def set_columns(self, timestamps: NDArray[np.int64], values: NDArray[np.float64]) -> int:
+        """
+        Sets the storage arrays of the Collection without copying them.
+        The arrays may be read-only, e.g. memory-mapped from a cache file.
+
+        Args:
+            timestamps (NDArray[np.int64]): The unix start timestamps.
+            values (NDArray[np.float64]): The 2D array of shape (len(COLUMNS), size).
+
+        Returns:
+            int: The length of the new data.
+
+        Raises:
+            CollectionFrozenException: If the Collection is frozen.
+            ValueError: If the shapes don't match.
+        """
+        self.check_frozen()
+
+        if values.shape != (len(COLUMNS), timestamps.size):
+            raise ValueError(f'Expected values of shape {(len(COLUMNS), timestamps.size)}, got {values.shape}')
+
+        self.timestamps = timestamps
+        self.values = values
 
-        if data is None and not unsafe_return:
-            raise DataNotFoundException(f'No data found for start datetime {start}')
+        self.length = timestamps.size
+        self.index = None
 
-        return data
+        return self.length
 
-    def get_year(self, year: int) -> NDArray:
+    @staticmethod
+    def to_row(data: Data) -> NDArray[np.float64]:
         """
-        Returns the data for the given year.
+        Converts a Data object into one column of Collection.values.
 
         Args:
-            year (dt.datetime): The year of the data to return.
+            data (Data): The data to convert.
 
         Returns:
-            DataArray: The data for the given year.
+            NDArray[np.float64]: The values in the order of COLUMNS.
         """
-        start = dt.datetime(year, 1, 1, 0, 0)
-        end = dt.datetime(year, 12, 31, 23, 59)
-        return self.get_range(start, end)
+        row = np.empty(len(COLUMNS), dtype=np.float64)
+
+        for i, name in enumerate(COLUMNS):
+            category, value_field = name.split('.')
+            row[i] = getattr(getattr(data, category), value_field)
+
+        return row
 
-    def get_month(self, year: int, month: int) -> NDArray:
+    @staticmethod
+    def to_columns(data: DataArray) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
         """
-        Returns the data for the given month.
+        Converts an array of Data objects into timestamps and values.
 
         Args:
-            year (dt.datetime): The year of the data to return.
-            month (dt.datetime): The month of the data to return.
+            data (DataArray): The data to convert.
 
         Returns:
-            DataArray: The data for the given month.
+            tuple[NDArray[np.int64], NDArray[np.float64]]: The timestamps and the 2D values.
         """
-        start = dt.datetime(year, month, 1, 0, 0)
-        end = dt.datetime(year, month, 31, 23, 59)
-        return self.get_range(start, end)
+        timestamps = np.array([int(d.start.timestamp()) for d in data], dtype=np.int64)
+        values = np.empty((len(COLUMNS), len(data)), dtype=np.float64)
 
-    def get_day(self, year: int, month: int, day: int) -> NDArray:
-        """
-        Returns the data for the given day.
+        for i, d in enumerate(data):
+            values[:, i] = Collection.to_row(d)
 
-        Args:
-            year (dt.datetime): The year of the data to return.
-            month (dt.datetime): The month of the data to return.
-            day (dt.datetime): The day of the data to return.
+        return timestamps, values
 
-        Returns:
-            DataArray: The data for the given day.
-        """
-        start = dt.datetime(year, month, day, 0, 0)
-        end = dt.datetime(year, month, day, 23, 59)
-        return self.get_range(start, end)
 
-    def get_by_timestamp(self, start: int, unsafe_return: bool = False) -> Data | None:
+@dataclass(frozen=True)
+class Projection:
+    """
+    Maps the rows of a reference year onto the calendar of a target year by local wall-clock time,
+    so e.g. the 1st of March 12:00 of the target year gets the data of the 1st of March 12:00 of the reference year.
+
+    Rows of the target year without a counterpart are filled by the fill policy:
+    - 'previous_day' takes the same wall-clock time one day earlier, e.g. the 28th of February for a leap day
+      or the day before a daylight saving time change the reference year didn't have on that date.
+    - 'previous' takes the latest earlier wall-clock time of the reference year.
+    If neither exists, the first row of the reference year is used.
+    The repeated hour at the end of daylight saving time maps onto its first occurrence if the reference year has it only once.
+    Rows of the reference year without a counterpart, e.g. a leap day, are skipped.
+
+    Projections are cached per reference calendar, target year, timezone and fill policy, see create().
+
+    Attributes:
+    -----------
+    target_year (int) : The target year.
+    tz (str) : The timezone of the wall-clock times, e.g. 'Europe/Berlin'.
+    fill (str) : The fill policy, i.e. 'previous_day' or 'previous'.
+    timestamps (NDArray[np.int64]) : The unix start timestamps of the target year in 15-minute steps.
+    index (NDArray[np.int64]) : The row of the reference year for every row of the target year.
+    """
+    target_year: int
+    tz: str
+    fill: str
+    timestamps: NDArray[np.int64]
+    index: NDArray[np.int64]
+
+    CACHE: ClassVar[dict[tuple, 'Projection']] = {}
+    LOCK: ClassVar[Lock] = Lock()
+
+    @property
+    def size(self) -> int:
+        return self.timestamps.size
+
+    @staticmethod
+    def create(reference: NDArray[np.int64], target_year: int, tz: str = 'Europe/Berlin', fill: str = 'previous_day') -> 'Projection':
         """
-        Returns the data at the given start timestamp.
+        Returns the projection of a reference year onto a target year.
 
         Args:
-            start (int): The start timestamp of the data to return.
-            unsafe_return (bool, optional): If True, the function will return None if no data was found. Defaults to False.
+            reference (NDArray[np.int64]): The sorted unix start timestamps of the reference year, e.g. of Collection.get_year().
+            target_year (int): The target year.
+            tz (str, optional): The timezone of the wall-clock times. Defaults to 'Europe/Berlin'.
+            fill (str, optional): The fill policy, i.e. 'previous_day' or 'previous'. Defaults to 'previous_day'.
 
         Returns:
-            Data | None: The data at the given start timestamp or None if no data was found and unsafe_return is True.
+            Projection: The projection. Its arrays are read-only, since they are shared.
 
         Raises:
-            DataNotFoundException: If no data was found for the given start timestamp and unsafe_return is False.
+            ValueError: If the reference is empty or the fill policy is unknown.
         """
-        start = dt.datetime.fromtimestamp(start)
+        if reference.size == 0:
+            raise ValueError('The reference year has no rows.')
 
-        data: Data | None = next((d for d in self.data if d.start == start), None)
+        if fill not in ('previous_day', 'previous'):
+            raise ValueError(f'Unknown fill policy: {fill}')
 
-        if data is None and not unsafe_return:
-            raise DataNotFoundException(f'No data found for start datetime {start}')
+        key = (reference.size, int(reference[0]), int(reference[-1]), target_year, tz, fill)
 
-        return data
+        with Projection.LOCK:
+            projection = Projection.CACHE.get(key)
 
-    def get_by_index(self, index: int, unsafe_return: bool = False) -> Data | None:
-        """
-        Returns the data at the given index.
+        if projection is not None:
+            return projection
 
-        Args:
-            index (int): The index of the data to return.
-            unsafe_return (bool, optional): If True, the function will return None if the index is out of range. Defaults to False.
+        target = pd.date_range(
+            start=dt.datetime(target_year, 1, 1, 0, 0),
+            end=dt.datetime(target_year, 12, 31, 23, 45),
+            freq='15min',
+            tz=tz
+        )
+        timestamps = target.asi8 // 1_000_000_000
 
-        Returns:
-            Data | None: The data at the given index or None if the index is out of range and unsafe_return is True.
+        reference_keys = Projection.get_keys(pd.to_datetime(reference, unit='s', utc=True).tz_convert(tz))
+        target_keys = Projection.get_keys(target)
 
-        Raises:
-            DataNotFoundException: If the index is out of range and unsafe_return is False.
-        """
-        try:
-            return self.data[index]
-        except IndexError as _:
-            if not unsafe_return:
-                raise DataNotFoundException(f'No data found for index {index}')
-            else:
-                return None
+        # The sorted wall-clock keys of the reference year and their rows
+        keys, rows = np.unique(reference_keys, return_index=True)
+
+        index = Projection.find(keys, rows, target_keys)
+
+        # The second occurrence of the repeated hour falls back to the first one
+        missing = index < 0
+        index[missing] = Projection.find(keys, rows, target_keys[missing] & ~1)
+
+        if fill == 'previous_day':
+            missing = index < 0
+            previous_day = Projection.get_keys(target[missing] - pd.Timedelta(days=1)) & ~1
+            index[missing] = Projection.find(keys, rows, previous_day)
+
+        missing = index < 0
+        previous = np.searchsorted(keys, target_keys[missing], side='right') - 1
+        index[missing] = rows[np.maximum(previous, 0)]
+
+        timestamps.flags.writeable = False
+        index.flags.writeable = False
+
+        projection = Projection(target_year, tz, fill, timestamps, index)
 
-    def get_by_index_range(self, start: int, end: int) -> DataArray:
+        with Projection.LOCK:
+            Projection.CACHE[key] = projection
+
+        return projection
+
+    @staticmethod
+    def get_keys(datetimes: pd.DatetimeIndex) -> NDArray[np.int64]:
         """
-        Returns a subset of the data array based on the given start and end indices.
+        Returns a key per datetime that sorts like the wall-clock time within a year.
+        The lowest bit marks the second occurrence of the repeated hour at the end of daylight saving time.
 
         Args:
-            start (int): The starting index of the subset.
-            end (int): The ending index of the subset.
+            datetimes (pd.DatetimeIndex): The timezone-aware datetimes.
 
         Returns:
-            DataArray: A subset of the data array.
+            NDArray[np.int64]: The keys.
         """
-        return self.data[start:end]
+        month = datetimes.month.to_numpy(dtype=np.int64)
+        day = datetimes.day.to_numpy(dtype=np.int64)
+        hour = datetimes.hour.to_numpy(dtype=np.int64)
+        quarter = datetimes.minute.to_numpy(dtype=np.int64) // 15
 
-    def get_last_of_year(self, year: int) -> Data:
+        keys = (((month * 32 + day) * 24 + hour) * 4 + quarter) * 2
+
+        # A wall-clock time that already occurred is the second occurrence
+        _, first = np.unique(keys, return_index=True)
+        second = np.ones(keys.size, dtype=bool)
+        second[first] = False
+
+        return keys + second
+
+    @staticmethod
+    def find(keys: NDArray[np.int64], rows: NDArray[np.int64], queries: NDArray[np.int64]) -> NDArray[np.int64]:
         """
-        Returns the last data of the given year.
+        Returns the row of every query key or -1 if the key does not exist.
 
         Args:
-            year (int): The year of the data to return.
+            keys (NDArray[np.int64]): The sorted keys.
+            rows (NDArray[np.int64]): The row of every key.
+            queries (NDArray[np.int64]): The keys to look up.
 
         Returns:
-            Data: The last data of the given year.
+            NDArray[np.int64]: The rows.
         """
-        year: DataArray = self.get_year(year)
-        return year[-1]
+        positions = np.clip(np.searchsorted(keys, queries), 0, keys.size - 1)
 
-    def get_length(self) -> int:
-        """
-        Returns the number of elements in the data array.
+        return np.where(keys[positions] == queries, rows[positions], -1).astype(np.int64)
 
-        Returns:
-        int: The number of elements in the data array.
-        """
-        return self.data.size
 
-    def add(self, data: Data) -> None:
-        """
-        Adds the given data at the end of the Collection.
+@dataclass(frozen=True)
+class ScenarioOverlay:
+    """
+    A derived collection defined as a base DataView plus per-column scale factors and additive columns.
 
-        Args:
-            data: The data to add to the array.
-        """
-        self.data = np.append(self.data, data)
+    Every column is evaluated lazily as base * scale + addition and cached on first access.
+    The base is never modified, so one base can back many overlays at the same time.
+    Modifying methods return a new overlay that shares the base and all unaffected cached columns.
+
+    Attributes:
+    -----------
+    base (DataView) : The base data, e.g. a reference year.
+    timestamps (NDArray[np.int64]) : The unix start timestamps of the derived rows.
+    tz (tzinfo | None) : The timezone of materialized datetimes. None means local time.
+    scales (dict[str, float]) : The scale factors per column. Missing columns use default_scale.
+    additions (dict[str, NDArray[np.float64] | float]) : The values added per column. Scalars are broadcast.
+    default_scale (float) : The scale factor of columns that are not in scales.
+    index (NDArray[np.int64] | None) : The base row of every derived row, e.g. of a Projection.
+                                       None uses the first len(timestamps) rows.
+    cache (dict[str, NDArray[np.float64]]) : The evaluated columns.
+    """
+    base: DataView
+    timestamps: NDArray[np.int64]
+    tz: tzinfo | None                                 = None
+    scales: dict[str, float]                          = field(default_factory=dict)
+    additions: dict[str, NDArray[np.float64] | float] = field(default_factory=dict)
+    default_scale: float                              = 1.0
+    index: NDArray[np.int64] | None                   = field(default=None, compare=False, repr=False)
+    cache: dict[str, NDArray[np.float64]]             = field(default_factory=dict, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for name in (*self.scales, *self.additions):
+            if name not in COLUMN_INDEX:
+                raise KeyError(name)
 
-        self.length = self.data.size
+        if self.index is not None:
+            if self.index.size != self.timestamps.size:
+                raise ValueError(f'The index has {self.index.size} rows, but {self.timestamps.size} are required.')
 
-    def insert(self, data: Data, index: int) -> None:
+            if self.index.size > 0 and self.index.max() >= self.base.size:
+                raise ValueError(f'The index refers to row {self.index.max()}, but the base has {self.base.size} rows.')
+
+            return
+
+        if self.base.size < self.timestamps.size:
+            raise ValueError(f'The base has {self.base.size} rows, but {self.timestamps.size} are required.')
+
+        object.__setattr__(self, 'base', self.base[:self.timestamps.size])
+
+    @property
+    def size(self) -> int:
+        return self.timestamps.size
+
+    def __len__(self) -> int:
+        return self.timestamps.size
+
+    def get_column(self, name: str) -> NDArray[np.float64]:
         """
-        Inserts the given data at the given index of the Collection.
+        Returns the evaluated column with the given name, e.g. 'production.pv'.
 
         Args:
-            data: The data to insert into the array.
-            index: The index at which the data will be inserted.
+            name (str): The name of the column.
+
+        Returns:
+            NDArray[np.float64]: The read-only column.
 
         Raises:
-            IndexError: If the given index is out of range.
+            KeyError: If the column does not exist.
         """
-        try:
-            self.data[index] = data
-        except IndexError as e:
-            raise IndexError(f'Index {index} is out of range. This Collection only has {self.data.size} elements.') from e
+        if name in self.cache:
+            return self.cache[name]
 
-        self.length = self.data.size
+        scale = self.scales.get(name, self.default_scale)
 
-    def append(self, data: DataArray) -> None:
+        if scale == 0:
+            column = np.zeros(self.size, dtype=np.float64)
+        elif self.index is not None:
+            column = self.base.get_column(name)[self.index] * scale
+        else:
+            column = self.base.get_column(name) * scale
+
+        if name in self.additions:
+            column += self.additions[name]
+
+        column.flags.writeable = False
+        self.cache[name] = column
+
+        return column
+
+    def get_total(self, category: str, value_fields: list[str] | None = None) -> NDArray[np.float64]:
         """
-        Appends the given data to the end of the Collection.
+        Returns the row-wise sum of the given fields of a category.
 
         Args:
-            data: The data to append to the array.
+            category (str): The category, i.e. 'production', 'power' or 'consumption'.
+            value_fields (list[str], optional): The fields to sum. Defaults to all fields of the category.
+
+        Returns:
+            NDArray[np.float64]: The row-wise sum.
         """
-        self.data = np.append(self.data, data)
+        if value_fields is None:
+            names = [name for name in COLUMNS if name.startswith(f'{category}.')]
+        else:
+            names = [f'{category}.{f}' for f in value_fields]
 
-        self.length = self.data.size
+        total = np.zeros(self.size, dtype=np.float64)
 
-    def remove(self, data: Data) -> bool:
+        for name in names:
+            total += self.get_column(name)
+
+        return total
+
+    def with_scale(self, name: str, scale: float) -> 'ScenarioOverlay':
         """
-        Removes the given data from the Collection.
+        Returns a new overlay with the scale factor of the given column replaced.
 
         Args:
-            data: The data to remove from the array.
+            name (str): The name of the column.
+            scale (float): The new scale factor.
 
         Returns:
-            bool: True if the data was found and removed, False otherwise.
+            ScenarioOverlay: The new overlay.
         """
-        prev_length = self.data.size
-
-        self.data = np.delete(self.data, np.where(self.data == data))
-
-        self.length = self.data.size
+        cache = {k: v for k, v in self.cache.items() if k != name}
 
-        return prev_length != self.data.size
+        return replace(self, scales={**self.scales, name: scale}, cache=cache)
 
-    def remove_by_start(self, start: dt.datetime) -> bool:
+    def with_addition(self, name: str, values: NDArray[np.float64] | float) -> 'ScenarioOverlay':
         """
-        Removes the data with the given start datetime from the Collection.
+        Returns a new overlay with the additive values of the given column replaced.
 
         Args:
-            start (dt.datetime): The start datetime of the data to remove.
+            name (str): The name of the column.
+            values (NDArray[np.float64] | float): The new values. Scalars are broadcast.
 
         Returns:
-            bool: True if the data was found and removed, False otherwise.
+            ScenarioOverlay: The new overlay.
         """
-        prev_length = self.data.size
+        cache = {k: v for k, v in self.cache.items() if k != name}
 
-        self.data = np.delete(self.data, np.where(self.data.start == start))
+        return replace(self, additions={**self.additions, name: values}, cache=cache)
 
-        self.length = self.data.size
+    def get_all(self) -> DataView:
+        """
+        Evaluates all columns and returns them as a DataView.
+
+        Returns:
+            DataView: The evaluated data.
+        """
+        values = np.stack([self.get_column(name) for name in COLUMNS])
 
-        return prev_length != self.data.size
+        return DataView(self.timestamps, values, self.tz)
 
-    def set(self, data: DataArray) -> int:
+    def to_collection(self, name: str = 'n/a') -> Collection:
         """
-        Sets the entire content of the Collection to the given data.
-        All previous data will be overwritten.
+        Evaluates all columns and returns them as a new Collection,
+        e.g. to use range queries on the derived data.
 
         Args:
-            data (DataArray): The data to set.
+            name (str, optional): The name of the collection. Defaults to 'n/a'.
 
         Returns:
-            int: The length of the new data.
+            Collection: The evaluated data.
         """
-        self.data = data
-
-        self.length = self.data.size
+        collection = Collection()
+        collection.set_name(name)
+        collection.set_tz(self.tz)
+        collection.set_columns(np.array(self.timestamps), self.get_all().values)
 
-        return self.length
+        return collection
 
 
 @dataclass
@@ -617,6 +1935,12 @@ class Collections:
     --------
     set_test_cases() -> None
         Sets the test cases for the collections.
+    freeze() -> None
+        Makes all collections read-only.
+    get_version() -> str | None
+        Returns the combined version of all loaded collections.
+    copy() -> Collections
+        Returns a mutable copy of all collections.
     """
     smard: Collection            = field(default_factory=Collection, init=False)
     energycharts: Collection     = field(default_factory=Collection, init=False)
@@ -627,12 +1951,48 @@ class Collections:
         self.energycharts.set_name('energycharts')
         self.agora.set_name('agora')
 
-        self.smard.set_parse_func(Parser.parse_smard)
-        self.energycharts.set_parse_func(Parser.parse_energycharts)
+        self.smard.set_parse_func(Parser.parse_smard_frame)
+        self.energycharts.set_parse_func(Parser.parse_energycharts_frame)
         # self.agora.set_parse_func(parse_agora)
 
         self.set_test_cases()
 
+    def freeze(self) -> None:
+        """
+        Makes all collections read-only, so they can be shared by reference.
+        """
+        self.smard.freeze()
+        self.energycharts.freeze()
+        self.agora.freeze()
+
+    def get_version(self) -> str | None:
+        """
+        Returns the combined version of all loaded collections.
+
+        Returns:
+            str | None: The version or None if any loaded collection has an unknown version.
+        """
+        versions = [c.get_version() for c in (self.smard, self.energycharts, self.agora) if c.get_length() > 0]
+
+        if None in versions:
+            return None
+
+        return '+'.join(versions)
+
+    def copy(self) -> 'Collections':
+        """
+        Returns a mutable copy of all collections.
+
+        Returns:
+            Collections: The copy.
+        """
+        collections = Collections()
+        collections.smard = self.smard.copy()
+        collections.energycharts = self.energycharts.copy()
+        collections.agora = self.agora.copy()
+
+        return collections
+
     def set_test_cases(self) -> None:
         """
         Sets the test cases for the collections.
@@ -956,119 +2316,121 @@ class Parser:
 
     Attributes:
     -----------
-    None
+    VERSION (int) : The version of the parser. Bump it whenever the parsed values change,
+                    so cached collections are rebuilt.
 
     Methods:
     --------
-    parse_energycharts(vals: dict) -> Data
-        Parses the given dictionary and returns a Data object.
-    parse_smard(vals: dict) -> Data
-        Parses the given dictionary and returns a Data object.
+    parse_energycharts_frame(df: pd.DataFrame) -> tuple[NDArray[np.int64], NDArray[np.float64]]
+        Parses the given DataFrame column-wise.
+    parse_smard_frame(df: pd.DataFrame) -> tuple[NDArray[np.int64], NDArray[np.float64]]
+        Parses the given DataFrame column-wise.
     """
+    VERSION: int = 1
+
+    # Maps each column to the CSV columns it is the sum of.
+    # Columns that are missing in a source stay zero.
+    ENERGYCHARTS_COLUMNS: dict[str, list[str]] = {
+        'production.pv':                  ['Solar'],
+        'production.wind_offshore':       ['Wind offshore'],
+        'production.wind_onshore':        ['Wind onshore'],
+        'production.biomass':             ['Biomass'],
+        'production.hydro':               ['Hydro Run-of-River', 'Hydro water reservoir'],
+        'production.other_renewables':    ['Geothermal'],
+        'production.coal':                ['Fossil hard coal'],
+        'production.lignite':             ['Fossil brown coal / lignite'],
+        'production.gas':                 ['Fossil gas'],
+        'production.other_conventionals': ['Fossil oil', 'Others', 'Waste'],
+        'production.nuclear':             ['Nuclear'],
+        'consumption.load':               ['Load'],
+        'consumption.residual':           ['Residual load'],
+    }
+
+    SMARD_COLUMNS: dict[str, list[str]] = {
+        'production.pv':                  ['Solar'],
+        'production.wind_offshore':       ['Wind offshore'],
+        'production.wind_onshore':        ['Wind onshore'],
+        'production.biomass':             ['Biomass'],
+        'production.hydro':               ['Hydro'],
+        'production.other_renewables':    ['Other renewables'],
+        'production.coal':                ['Fossil hard coal'],
+        'production.lignite':             ['Fossil brown coal / lignite'],
+        'production.gas':                 ['Fossil gas'],
+        'production.other_conventionals': ['Other conventionals'],
+        'production.nuclear':             ['Nuclear'],
+        'power.pv':                       ['Installed solar'],
+        'power.wind_offshore':            ['Installed wind offshore'],
+        'power.wind_onshore':             ['Installed wind onshore'],
+        'power.biomass':                  ['Installed biomass'],
+        'power.hydro':                    ['Installed hydro'],
+        'power.other_renewables':         ['Installed other renewables'],
+        'power.coal':                     ['Installed fossil hard coal'],
+        'power.lignite':                  ['Installed fossil brown coal / lignite'],
+        'power.gas':                      ['Installed fossil gas'],
+        'power.other_conventionals':      ['Installed other conventionals'],
+        'power.nuclear':                  ['Installed nuclear'],
+        'consumption.load':               ['Load'],
+        'consumption.residual':           ['Residual load'],
+    }
+
     @staticmethod
-    def parse_energycharts(vals: dict) -> Data:
+    def parse_frame(df: pd.DataFrame, columns: dict[str, list[str]], factor: float) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
         """
-        Parses the given dictionary and returns a Data object.
+        Parses the given DataFrame column-wise.
 
         Args:
-            vals (dict): The dictionary to parse.
+            df (pd.DataFrame): The CSV file as a DataFrame.
+            columns (dict[str, list[str]]): Maps each column to the CSV columns it is the sum of.
+            factor (float): The unit conversion factor applied to every column.
 
         Returns:
-            Data: The parsed Data object.
+            tuple[NDArray[np.int64], NDArray[np.float64]]: The timestamps and the values.
         """
-        # tz = timezone('Europe/Berlin')
-        start = dt.datetime.fromtimestamp(int(vals['unix_seconds']))
-        data = Data(start=start)
+        timestamps = df['unix_seconds'].to_numpy(dtype=np.int64)
+        values = np.zeros((len(COLUMNS), timestamps.size), dtype=np.float64)
 
-        try:
-            data.production.pv                  = float(vals['Solar'])
-            data.production.wind_offshore       = float(vals['Wind offshore'])
-            data.production.wind_onshore        = float(vals['Wind onshore'])
-            data.production.biomass             = float(vals['Biomass'])
-            data.production.hydro               = float(vals['Hydro Run-of-River']) + float(vals['Hydro water reservoir'])
-            data.production.other_renewables    = float(vals['Geothermal'])
-            data.production.coal                = float(vals['Fossil hard coal'])
-            data.production.lignite             = float(vals['Fossil brown coal / lignite'])
-            data.production.gas                 = float(vals['Fossil gas'])
-            data.production.other_conventionals = float(vals['Fossil oil']) + float(vals['Others']) + float(vals['Waste'])
-            data.production.nuclear             = float(vals['Nuclear'])
-
-            # Multiply by 1_000_000 to convert from MW to W
-            data.production *= 1_000_000
-
-            # Divide by 4 to convert from MW to MW/h
-            data.production /= 4
-
-            data.consumption.load               = float(vals['Load'])
-            data.consumption.residual           = float(vals['Residual load'])
-
-            # Multiply by 1_000_000 to convert from MW to W
-            data.consumption *= 1_000_000
-
-            # Divide by 4 to convert from MW to MW/h
-            data.consumption /= 4
-
-        except KeyError as e:
-            print(f'KeyError: {e}')
-        finally:
-            return data
+        for name, sources in columns.items():
+            try:
+                row = values[COLUMN_INDEX[name]]
+
+                for source in sources:
+                    row += df[source].to_numpy(dtype=np.float64)
+
+            except KeyError as e:
+                print(f'KeyError: {e}')
+
+        values *= factor
+
+        return timestamps, values
 
     @staticmethod
-    def parse_smard(vals: dict) -> Data:
+    def parse_energycharts_frame(df: pd.DataFrame) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
         """
-        Parses the given dictionary and returns a Data object.
+        Parses the given DataFrame column-wise.
 
         Args:
-            vals (dict): The dictionary to parse.
+            df (pd.DataFrame): The CSV file as a DataFrame.
 
         Returns:
-            Data: The parsed Data object.
+            tuple[NDArray[np.int64], NDArray[np.float64]]: The timestamps and the values.
         """
-        tz = timezone('Europe/Berlin')
-        start = dt.datetime.fromtimestamp(int(vals['unix_seconds']))
-        data = Data(start=start)
+        # Multiply by 1_000_000 to convert from MW to W
+        # Divide by 4 to convert from MW to MW/h
+        return Parser.parse_frame(df, Parser.ENERGYCHARTS_COLUMNS, 1_000_000 / 4)
 
-        try:
-            data.production.pv                  = float(vals['Solar'])
-            data.production.wind_offshore       = float(vals['Wind offshore'])
-            data.production.wind_onshore        = float(vals['Wind onshore'])
-            data.production.biomass             = float(vals['Biomass'])
-            data.production.hydro               = float(vals['Hydro'])
-            data.production.other_renewables    = float(vals['Other renewables'])
-            data.production.coal                = float(vals['Fossil hard coal'])
-            data.production.lignite             = float(vals['Fossil brown coal / lignite'])
-            data.production.gas                 = float(vals['Fossil gas'])
-            data.production.other_conventionals = float(vals['Other conventionals'])
-            data.production.nuclear             = float(vals['Nuclear'])
-
-            # Multiply by 1_000_000 to convert from MWh to Wh
-            data.production *= 1_000_000
-
-            data.power.pv                  = float(vals['Installed solar'])
-            data.power.wind_offshore       = float(vals['Installed wind offshore'])
-            data.power.wind_onshore        = float(vals['Installed wind onshore'])
-            data.power.biomass             = float(vals['Installed biomass'])
-            data.power.hydro               = float(vals['Installed hydro'])
-            data.power.other_renewables    = float(vals['Installed other renewables'])
-            data.power.coal                = float(vals['Installed fossil hard coal'])
-            data.power.lignite             = float(vals['Installed fossil brown coal / lignite'])
-            data.power.gas                 = float(vals['Installed fossil gas'])
-            data.power.other_conventionals = float(vals['Installed other conventionals'])
-            data.power.nuclear             = float(vals['Installed nuclear'])
-
-            # Multiply by 1_000_000 to convert from MWh to Wh
-            data.power *= 1_000_000
-
-            data.consumption.load               = float(vals['Load'])
-            data.consumption.residual           = float(vals['Residual load'])
-
-            # Multiply by 1_000_000 to convert from MWh to Wh
-            data.consumption *= 1_000_000
-
-        except KeyError as e:
-            print(f'KeyError: {e}')
+    @staticmethod
+    def parse_smard_frame(df: pd.DataFrame) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """
+        Parses the given DataFrame column-wise.
 
-        return data
+        Args:
+            df (pd.DataFrame): The CSV file as a DataFrame.
+
+        Returns:
+            tuple[NDArray[np.int64], NDArray[np.float64]]: The timestamps and the values.
+        """
+        # Multiply by 1_000_000 to convert from MWh to Wh
+        return Parser.parse_frame(df, Parser.SMARD_COLUMNS, 1_000_000)
 
 
 @dataclass
@@ -1081,6 +2443,9 @@ class DataManager:
     -----------
     collections (Collections) : The collections of the data manager.
     res_path (str) : The path to the resources directory.
+    use_cache (bool) : Whether parsed collections are cached as binary files next to the CSV files.
+    use_mmap (bool) : Whether cached values are memory-mapped read-only instead of loaded.
+                      All processes mapping the same cache share one copy in the page cache.
 
     Methods:
     --------
@@ -1090,14 +2455,24 @@ class DataManager:
         Loads the data from the CSV files into the collections.
     get_filepath(collection: Collection) -> str
         Returns the filepath of the given collection.
+    get_cache_filepath(collection: Collection) -> str
+        Returns the filepath of the binary cache of the given collection.
+    get_cache_values_filepath(collection: Collection, source_hash: str) -> str
+        Returns the filepath of the cached values of the given collection.
     load_dataset(collection: Collection) -> None
         Loads the data from the CSV file into the given collection.
+    load_cache(collection: Collection, source_stat: os.stat_result) -> bool
+        Loads the given collection from its binary cache, if the cache is still valid.
+    write_cache(collection: Collection, source_stat: os.stat_result, source_hash: str | None = None) -> None
+        Writes the given collection to its binary cache.
+    get_version(source_hash: str) -> str
+        Returns the version of a collection parsed from the source with the given hash.
+    get_source_hash(filepath: str) -> str
+        Returns the SHA-256 hash of the given file.
     test_dataset(collection: Collection) -> bool
         Tests the given collection.
     print_test(test_result: TestCaseResult) -> None
         Prints the given test result.
-    count_rows(file: TextIOWrapper) -> int
-        Counts the number of rows in the given file.
 
     Raises:
     -------
@@ -1106,6 +2481,8 @@ class DataManager:
     collections: Collections = field(default_factory=Collections, init=False)
     res_path: str            = field(default='./static/res/', init=False)
     is_cached: bool          = field(default=False, init=False)
+    use_cache: bool          = field(default=True, init=False)
+    use_mmap: bool           = field(default=True, init=False)
 
     def get_data(self) -> Collections:
         if not self.is_cached:
@@ -1126,80 +2503,68 @@ class DataManager:
     def get_filepath(self, collection: Collection) -> str:
         return f'{self.res_path}{collection.name}.csv'
 
+    def get_cache_filepath(self, collection: Collection) -> str:
+        return f'{self.res_path}{collection.name}.cache.npz'
+
+    def get_cache_values_filepath(self, collection: Collection, source_hash: str) -> str:
+        return f'{self.res_path}{collection.name}.cache.{source_hash[:16]}.v{Parser.VERSION}.npy'
+
     def load_dataset(self, collection: Collection) -> None:
+        print('#' * 50)
+        print(f'Loading data for {collection.name}')
+
+        total_start_time = time()
+
+        filepath = self.get_filepath(collection)
+
         try:
-            file = open(self.get_filepath(collection), 'r', encoding='utf-8')
+            source_stat = os.stat(filepath)
         except FileNotFoundError as e:
             print(f'FileNotFoundError: {e}')
             return
 
-        reader = csv.DictReader(file)
+        if self.use_cache and self.load_cache(collection, source_stat):
+            print('# Loaded from cache.')
+        else:
+            # Read the whole file in one pass into typed columns
+            df = pd.read_csv(filepath, engine='pyarrow')
 
-        row_count = 0
-        row_count = DataManager.count_rows(file)
+            # Parse and convert whole columns at once instead of row by row
+            timestamps, values = collection.parse_func(df)
 
-        collection.set_size(row_count)
+            collection.set_size(timestamps.size)
+            collection.set_timestamps(timestamps)
+            collection.values[:] = values
 
-        load_times = np.empty(row_count, dtype=float)
+            source_hash = DataManager.get_source_hash(filepath)
+            collection.set_version(DataManager.get_version(source_hash))
 
-        print('#' * 50)
-        print(f'Loading data for {collection.name}')
+            if self.use_cache:
+                self.write_cache(collection, source_stat, source_hash)
 
-        i: int = 0
+                # Map the freshly written cache, so this process shares it as well
+                self.load_cache(collection, source_stat)
 
-        total_start_time = time()
+        row_count = collection.get_length()
+
+        # Build the timestamp index once, so lookups don't scan the collection
+        collection.build_index()
+
+        total_end_time = time()
 
-        for row in reader:
-            start_time = time()
-            print(f'Parsing data for {i + 1}/{row_count}...', end='\n')
-            print('[', end='')
-            print('\033[94m', end='')
-            print('#' * round(i / row_count * 50), end='')
-            print('\033[0m', end='')
-            print(' ' * (50 - round(i / row_count * 50)), end='')
-            print(']', end='')
-
-            d: Data = collection.parse_func(row)
-
-            # Slow way
-            # Takes about 4 minutes
-            # self.collections.energycharts.add(d)
-
-            # Fast way
-            # Takes about 3 seconds
-            collection.insert(d, i)
-
-            end_time = time()
-            # Print elapsed time in nanoseconds
-            time_elapsed = (end_time - start_time) * 1_000_000
-            load_times[i] = time_elapsed
-
-            print(f' {round(time_elapsed, 2)} µs       ', end='')
-            print('\033[1A', end='')
-            print('\033[0G', end='')
-            i += 1
-
-        print('\033[1B', end='')
-        print('\033[23G', end='')
-        print(' DONE ', end='')
-
-        print('\033[60G', end='\n')
         print('#' * 50)
         print(f'# \033[1mSummary\033[0m')
         print('#')
 
-        total_end_time = time()
-
         print(f'# Loaded {row_count} rows.')
         total_elapsed_time = total_end_time - total_start_time
         print(f'# Total time:        {round(total_elapsed_time, 2)} s')
 
-
-        avg_load_time = np.average(load_times)
-        print(f'# Average load time: {round(avg_load_time, 2)} µs')
-
         print('#' * 50)
 
+        if row_count == 0:
+            return
+
         # Get first entry
         first_entry = collection.get_by_index(0)
 
@@ -1212,10 +2577,151 @@ class DataManager:
 
         print('#' * 50)
 
-        file.close()
-
         sys.stdout.flush()
 
+    def load_cache(self, collection: Collection, source_stat: os.stat_result) -> bool:
+        """
+        Loads the given collection from its binary cache.
+        The cache is only used if it was built by the current parser version
+        from a source file with the same size and modification time or, failing that, the same hash.
+        With use_mmap the values are memory-mapped read-only and not copied into the process.
+
+        Args:
+            collection (Collection): The collection to load.
+            source_stat (os.stat_result): The stat of the source CSV file.
+
+        Returns:
+            bool: True if the collection was loaded from the cache, False otherwise.
+        """
+        try:
+            with np.load(self.get_cache_filepath(collection), allow_pickle=False) as cache:
+                if int(cache['parser_version']) != Parser.VERSION:
+                    return False
+
+                if int(cache['source_size']) != source_stat.st_size:
+                    return False
+
+                source_hash = None
+
+                # A fresh checkout or copy changes the modification time but not the content
+                if int(cache['source_mtime']) != source_stat.st_mtime_ns:
+                    source_hash = DataManager.get_source_hash(self.get_filepath(collection))
+
+                    if str(cache['source_hash']) != source_hash:
+                        return False
+
+                timestamps = cache['timestamps']
+                cached_hash = str(cache['source_hash'])
+                values_filepath = self.get_cache_values_filepath(collection, cached_hash)
+
+            values = np.load(values_filepath, mmap_mode='r' if self.use_mmap else None, allow_pickle=False)
+
+            collection.set_columns(timestamps, values)
+            collection.set_version(DataManager.get_version(cached_hash))
+
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return False
+
+        # Store the new modification time, so the next start doesn't hash the file again
+        if source_hash is not None:
+            self.write_cache(collection, source_stat, source_hash)
+
+        return True
+
+    def write_cache(self, collection: Collection, source_stat: os.stat_result, source_hash: str | None = None) -> None:
+        """
+        Writes the given collection to its binary cache.
+        The timestamps and the source key are stored in an npz file,
+        the values in a plain npy file that can be memory-mapped.
+        The files are written to a temporary path first and then moved into place,
+        so concurrent readers never see a partial cache.
+
+        Args:
+            collection (Collection): The collection to write.
+            source_stat (os.stat_result): The stat of the source CSV file.
+            source_hash (str, optional): The hash of the source CSV file. Computed if not given.
+        """
+        if source_hash is None:
+            source_hash = DataManager.get_source_hash(self.get_filepath(collection))
+
+        cache_filepath = self.get_cache_filepath(collection)
+        values_filepath = self.get_cache_values_filepath(collection, source_hash)
+
+        tmp_filepaths = [f'{cache_filepath}.{os.getpid()}.tmp', f'{values_filepath}.{os.getpid()}.tmp']
+
+        try:
+            # The values don't change when only the modification time did
+            if not os.path.exists(values_filepath):
+                with open(tmp_filepaths[1], 'wb') as file:
+                    np.save(file, np.ascontiguousarray(collection.values))
+
+                os.replace(tmp_filepaths[1], values_filepath)
+
+            with open(tmp_filepaths[0], 'wb') as file:
+                np.savez(
+                    file,
+                    parser_version=np.int64(Parser.VERSION),
+                    source_size=np.int64(source_stat.st_size),
+                    source_mtime=np.int64(source_stat.st_mtime_ns),
+                    source_hash=np.str_(source_hash),
+                    timestamps=collection.timestamps,
+                )
+
+            os.replace(tmp_filepaths[0], cache_filepath)
+
+        except OSError as e:
+            print(f'OSError: {e}')
+
+            for tmp_filepath in tmp_filepaths:
+                if os.path.exists(tmp_filepath):
+                    os.remove(tmp_filepath)
+
+            return
+
+        # Remove values of previous sources. Processes that still map them keep their copy until they exit.
+        prefix = f'{collection.name}.cache.'
+
+        for filename in os.listdir(self.res_path):
+            filepath = f'{self.res_path}{filename}'
+
+            if filename.startswith(prefix) and filename.endswith('.npy') and filepath != values_filepath:
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def get_version(source_hash: str) -> str:
+        """
+        Returns the version of a collection parsed from the source with the given hash.
+
+        Args:
+            source_hash (str): The hash of the source CSV file.
+
+        Returns:
+            str: The version.
+        """
+        return f'{source_hash[:16]}.v{Parser.VERSION}'
+
+    @staticmethod
+    def get_source_hash(filepath: str) -> str:
+        """
+        Returns the SHA-256 hash of the given file.
+
+        Args:
+            filepath (str): The path to the file.
+
+        Returns:
+            str: The hex digest of the file.
+        """
+        sha256 = hashlib.sha256()
+
+        with open(filepath, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                sha256.update(chunk)
+
+        return sha256.hexdigest()
+
     def test_dataset(self, collection: Collection) -> bool:
         print('#' * 50)
         print('# \033[1mUnit Testing\033[0m')
@@ -1236,16 +2742,3 @@ class DataManager:
         print(f'#     expected: {test_result.expected_value}')
         print(f'#           is: {test_result.actual_value}')
         print('#')
-
-    @staticmethod
-    def count_rows(file: TextIOWrapper) -> int:
-        reader = csv.DictReader(file)
-
-        row_count = 0
-
-        for _ in reader:
-            row_count += 1
-
-        file.seek(0)
-
-        return row_count
@@ -16,6 +16,8 @@ import csv
 import numpy as np
 from numpy.typing import NDArray
 
+from progress import ProgressReporter, get_default_sink
+
 RES_PATH = './src/static/res/'
 
 
@@ -386,6 +388,8 @@ def merge_smard_files() -> None:
     print(f'# Writing tmp file for Production...')
     print('#' * 50)
 
+    progress = ProgressReporter(sink=get_default_sink(prefix='Writing row '))
+
     for row in production_reader:
         date_as_string = row['\ufeffDatum'] + ' ' + row['Anfang']
         unix_seconds = dt.datetime.strptime(date_as_string, '%d.%m.%Y %H:%M').timestamp()
@@ -431,12 +435,12 @@ def merge_smard_files() -> None:
         production_outfile.write(f'{pump_storage}')
 
         production_outfile.write('\n')
-        print(f'Writing row {i + 1}...', end='\r')
+        progress.update(i + 1)
         i += 1
 
     rows = i
 
-    print()
+    progress.finish()
     print('#' * 50)
     print(f'# Writing tmp file for Power...')
     print('#' * 50)
@@ -459,6 +463,7 @@ def merge_smard_files() -> None:
     power_outfile.write(';'.join(power_header) + '\n')
 
     i = 0
+    progress = ProgressReporter(sink=get_default_sink(prefix='Writing row '))
 
     for row in power_reader:
         date_as_string = row['\ufeffDatum'] + ' ' + row['Anfang']
@@ -502,10 +507,10 @@ def merge_smard_files() -> None:
         power_outfile.write(f'{nuclear}')
 
         power_outfile.write('\n')
-        print(f'Writing row {i + 1}...', end='\r')
+        progress.update(i + 1)
         i += 1
 
-    print()
+    progress.finish()
     print('#' * 50)
     print(f'# Writing tmp file for Consumption...')
     print('#' * 50)
@@ -520,6 +525,7 @@ def merge_smard_files() -> None:
     consumption_outfile.write(';'.join(consumption_header) + '\n')
 
     i = 0
+    progress = ProgressReporter(sink=get_default_sink(prefix='Writing row '))
 
     for row in consumption_reader:
         date_as_string = row['\ufeffDatum'] + ' ' + row['Anfang']
@@ -539,10 +545,10 @@ def merge_smard_files() -> None:
         consumption_outfile.write(f'{pump_storage}')
 
         consumption_outfile.write('\n')
-        print(f'Writing row {i + 1}...', end='\r')
+        progress.update(i + 1)
         i += 1
 
-    print()
+    progress.finish()
 
     production_file.close()
     production_outfile.close()
@@ -616,9 +622,10 @@ def merge_smard_files() -> None:
     # next(consumption_reader)
 
     i = 0
+    progress = ProgressReporter(sink=get_default_sink(prefix='Writing row '))
 
     while ((production_row := next(production_reader, None)) != None):
-        print(f'Writing row {i + 1}...', end='\r')
+        progress.update(i + 1)
 
         power_row = next(power_reader)
         consumption_row = next(consumption_reader)
@@ -629,7 +636,7 @@ def merge_smard_files() -> None:
         writer.writerow(row)
         i += 1
 
-    print()
+    progress.finish()
     print('#' * 50)
 
     production_file.close()
@@ -1231,15 +1238,10 @@ class DataManager:
 
         total_start_time = time()
 
+        progress = ProgressReporter(total=row_count, sink=get_default_sink(prefix='Parsing data: '))
+
         for row in reader:
             start_time = time()
-            print(f'Parsing data for {i + 1}/{row_count}...', end='\n')
-            print('[', end='')
-            print('\033[94m', end='')
-            print('#' * round(i / row_count * 50), end='')
-            print('\033[0m', end='')
-            print(' ' * (50 - round(i / row_count * 50)), end='')
-            print(']', end='')
 
             d: Data = collection.parse_func(row)
 
@@ -1256,16 +1258,11 @@ class DataManager:
             time_elapsed = (end_time - start_time) * 1_000_000
             load_times[i] = time_elapsed
 
-            print(f' {round(time_elapsed, 2)} µs       ', end='')
-            print('\033[1A', end='')
-            print('\033[0G', end='')
+            progress.update(i + 1, f'{round(time_elapsed, 2)} µs')
             i += 1
 
-        print('\033[1B', end='')
-        print('\033[23G', end='')
-        print(' DONE ', end='')
+        progress.finish('DONE')
 
-        print('\033[60G', end='\n')
         print('#' * 50)
         print(f'# \033[1mSummary\033[0m')
         print('#')
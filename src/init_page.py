@@ -4,6 +4,8 @@ import streamlit.components.v1 as components
 import datetime as dt
 import sys
 from data_manager.data_manager import Collections, DataManager
+from scenarios.cache import ResultCache
+from scenarios.jobs import JobQueue
 from dtypes import URLImage, View
 
 from navbar import Navbar
@@ -89,12 +91,17 @@ class PageManager:
         Navbar.render()
 
     @staticmethod
-    @st.cache_data(show_spinner="Parsing and caching data...")
-    def get_data():
+    @st.cache_resource(show_spinner="Parsing and caching data...")
+    def get_data() -> Collections:
         # Get the data
         # with st.spinner('Loading data...'):
         data_manager = DataManager()
         collections: Collections = data_manager.get_data()
+
+        # The collections are shared by reference between all sessions,
+        # so they are frozen. Callers that want to modify them use copy().
+        collections.freeze()
+
         return collections
 
         # data_0, data_1 = data_loader.main()
@@ -105,3 +112,16 @@ class PageManager:
         # else:
         # #     toast = st.success('Data loaded successfully!', icon="✅")
         #     return data_0, data_1
+
+    @staticmethod
+    @st.cache_resource
+    def get_result_cache() -> ResultCache:
+        # One cache for all sessions, so identical scenarios are only simulated once.
+        # Set RESULT_CACHE_PATH to keep results on disk across restarts.
+        return ResultCache(disk_path=os.getenv('RESULT_CACHE_PATH'))
+
+    @staticmethod
+    @st.cache_resource
+    def get_job_queue() -> JobQueue:
+        # One queue for all sessions, so running simulations survive reruns
+        return JobQueue()
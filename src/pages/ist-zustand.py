@@ -2,7 +2,6 @@ import streamlit as st
 import datetime as dt
 import pandas as pd
 import numpy as np
-from numpy.typing import NDArray
 import altair as alt
 from gpt import ask
 
@@ -11,7 +10,7 @@ import init_page
 from dtypes import View
 from data import Data
 
-from data_manager.data_manager import Collections, DataArray, Data
+from data_manager.data_manager import Collection, Collections, DataView, Data
 
 
 class IST_View:
@@ -571,26 +570,68 @@ class IST_View:
         # Get collections
         collections: Collections = self.page.get_data()
 
-        # Get range data
+        # Get collection
         if self.data_source_selection == "SMARD.de":
-            filtered_data: NDArray = collections.smard.get_range(self.start_date, self.end_date)
+            collection: Collection = collections.smard
         elif self.data_source_selection == "Frauenhofer":
             tz = 'Europe/Berlin'
             # Add tz to start and end date
             # self.start_date = self.start_date.replace(tzinfo=dt.timezone(dt.timedelta(hours=1)))
             # self.end_date = self.end_date.replace(tzinfo=dt.timezone(dt.timedelta(hours=1)))
-            filtered_data: NDArray = collections.energycharts.get_range(self.start_date, self.end_date)
+            collection: Collection = collections.energycharts
         elif self.data_source_selection == "Agora Energiewende":
             st.error("Daten von Agora Energiewende sind noch nicht verfügbar.")
             return
 
-        # Create a time range
-        energy_time_range = pd.date_range(
-            start=self.start_date.strftime("%Y-%m-%d %H:%M"),
-            end=self.end_date.strftime("%Y-%m-%d %H:%M"),
-            freq='15min',
-            tz='Europe/Berlin'
-        )
+        columns_mode = st.columns([2, 2, 2])
+
+        with columns_mode[0]:
+            mode = st.selectbox(
+                label='Absolut / Relativ',
+                options=["Absolut", "Relativ"],
+                index=0,
+                help="Absolut zeigt die Werte und relativ setzt diese im Vergleich zu der Gesamterzeugung pro Monat."
+            )
+
+        if self.selection_interval == self.intervals.get('total'):
+            with columns_mode[1]:
+                sum_mode = st.selectbox(
+                    label='Summe',
+                    options=["Monat", "Jahr"],
+                    index=0,
+                    help="Die Summe der Energieerzeugung pro Monat oder Jahr."
+                )
+
+        with columns_mode[2]:
+            show_legend = st.selectbox(
+                label='Legende anzeigen',
+                options=["True", "False"],
+                index=0,
+                help="Zeigt die Legende an."
+            )
+
+        # The rollup level and the date label of the interval.
+        # The day view shows the quarter hours themselves.
+        if self.selection_interval == self.intervals.get('total'):
+            if sum_mode == "Monat":
+                level, date_format = 'month', '%Y-%m'
+            elif sum_mode == "Jahr":
+                level, date_format = 'year', '%Y'
+        elif self.selection_interval == self.intervals.get('year'):
+            level, date_format = 'month', '%Y-%m'
+        elif self.selection_interval == self.intervals.get('month'):
+            level, date_format = 'day', '%Y-%m-%d'
+        elif self.selection_interval == self.intervals.get('day'):
+            level, date_format = None, '%Y-%m-%d %H:%M'
+
+        # Get range data, pre-aggregated to the level
+        if level is None:
+            filtered_data: DataView = collection.get_range(self.start_date, self.end_date)
+        else:
+            filtered_data: DataView = collection.get_rollup_range(level, self.start_date, self.end_date)
+
+        # Label every row with its date
+        energy_time_range = pd.to_datetime(filtered_data.timestamps, unit='s', utc=True).tz_convert('Europe/Berlin').strftime(date_format)
 
         dummy_data_obj = collections.smard.get(start=self.start_date)
 
@@ -607,10 +648,10 @@ class IST_View:
         # Convert from Wh to GWh or TWh
         # based on view resolution
         if self.selection_interval == self.intervals.get('day'):
-            filtered_data = np.copy(filtered_data) / 1_000_000_000
+            unit_divisor = 1_000_000_000
             y_axis_scale = "GWh"
         else:
-            filtered_data = np.copy(filtered_data) / 1_000_000_000_000
+            unit_divisor = 1_000_000_000_000
             y_axis_scale = "TWh"
 
         # Create a dataframe
@@ -630,20 +671,6 @@ class IST_View:
             'Date': energy_time_range,
         }
 
-        count_data: int = 0
-        count_none: int = 0
-
-        print('%' * 50)
-        for data in filtered_data:
-            if data is not None:
-                count_data += 1
-            else:
-                count_none += 1
-            print(f'Type: {type(data)}', end='\r')
-        print()
-        print('%' * 50)
-        print(f'Count Data: {count_data}')
-        print(f'Count None: {count_none}')
         print('%' * 50)
         print(f'Length of index range: {len(energy_time_range)}')
         print(f'Length of data:        {len(filtered_data)}')
@@ -659,73 +686,73 @@ class IST_View:
 
         if self.plot_selection == "Energieerzeugung":
             if 'Photovoltaik' in self.selected_energy_sources:
-                energy['Photovoltaik'] = [d.production.pv for d in filtered_data]
+                energy['Photovoltaik'] = filtered_data.get_column('production.pv') / unit_divisor
 
             if 'Wind Offshore' in self.selected_energy_sources:
-                energy['Wind Offshore'] = [d.production.wind_offshore for d in filtered_data]
+                energy['Wind Offshore'] = filtered_data.get_column('production.wind_offshore') / unit_divisor
 
             if 'Wind Onshore' in self.selected_energy_sources:
-                energy['Wind Onshore'] = [d.production.wind_onshore for d in filtered_data]
+                energy['Wind Onshore'] = filtered_data.get_column('production.wind_onshore') / unit_divisor
 
             if 'Hydro' in self.selected_energy_sources:
-                energy['Hydro'] = [d.production.hydro for d in filtered_data]
+                energy['Hydro'] = filtered_data.get_column('production.hydro') / unit_divisor
 
             if 'Biomasse' in self.selected_energy_sources:
-                energy['Biomasse'] = [d.production.biomass for d in filtered_data]
+                energy['Biomasse'] = filtered_data.get_column('production.biomass') / unit_divisor
 
             if 'Steinkohle' in self.selected_energy_sources:
-                energy['Steinkohle'] = [d.production.coal for d in filtered_data]
+                energy['Steinkohle'] = filtered_data.get_column('production.coal') / unit_divisor
 
             if 'Braunkohle' in self.selected_energy_sources:
-                energy['Braunkohle'] = [d.production.lignite for d in filtered_data]
+                energy['Braunkohle'] = filtered_data.get_column('production.lignite') / unit_divisor
 
             if 'Gas' in self.selected_energy_sources:
-                energy['Gas'] = [d.production.gas for d in filtered_data]
+                energy['Gas'] = filtered_data.get_column('production.gas') / unit_divisor
 
             if 'Andere Erneuerbare' in self.selected_energy_sources:
-                energy['Andere Erneuerbare'] = [d.production.other_renewables for d in filtered_data]
+                energy['Andere Erneuerbare'] = filtered_data.get_column('production.other_renewables') / unit_divisor
 
             if 'Andere Konventionelle' in self.selected_energy_sources:
-                energy['Andere Konventionelle'] = [d.production.other_conventionals for d in filtered_data]
+                energy['Andere Konventionelle'] = filtered_data.get_column('production.other_conventionals') / unit_divisor
 
             if 'Nuclear' in self.selected_energy_sources:
-                energy['Atomkraft'] = [d.production.nuclear for d in filtered_data]
+                energy['Atomkraft'] = filtered_data.get_column('production.nuclear') / unit_divisor
         elif self.plot_selection == "Installierte Leistung":
             if 'Photovoltaik' in self.selected_energy_sources:
-                energy['Photovoltaik'] = [d.power.pv for d in filtered_data]
+                energy['Photovoltaik'] = filtered_data.get_column('power.pv') / unit_divisor
 
             if 'Wind Offshore' in self.selected_energy_sources:
-                energy['Wind Offshore'] = [d.power.wind_offshore for d in filtered_data]
+                energy['Wind Offshore'] = filtered_data.get_column('power.wind_offshore') / unit_divisor
 
             if 'Wind Onshore' in self.selected_energy_sources:
-                energy['Wind Onshore'] = [d.power.wind_onshore for d in filtered_data]
+                energy['Wind Onshore'] = filtered_data.get_column('power.wind_onshore') / unit_divisor
 
             if 'Hydro' in self.selected_energy_sources:
-                energy['Hydro'] = [d.power.hydro for d in filtered_data]
+                energy['Hydro'] = filtered_data.get_column('power.hydro') / unit_divisor
 
             if 'Biomasse' in self.selected_energy_sources:
-                energy['Biomasse'] = [d.power.biomass for d in filtered_data]
+                energy['Biomasse'] = filtered_data.get_column('power.biomass') / unit_divisor
 
             if 'Steinkohle' in self.selected_energy_sources:
-                energy['Steinkohle'] = [d.power.coal for d in filtered_data]
+                energy['Steinkohle'] = filtered_data.get_column('power.coal') / unit_divisor
 
             if 'Braunkohle' in self.selected_energy_sources:
-                energy['Braunkohle'] = [d.power.lignite for d in filtered_data]
+                energy['Braunkohle'] = filtered_data.get_column('power.lignite') / unit_divisor
 
             if 'Gas' in self.selected_energy_sources:
-                energy['Gas'] = [d.power.gas for d in filtered_data]
+                energy['Gas'] = filtered_data.get_column('power.gas') / unit_divisor
 
             if 'Andere Erneuerbare' in self.selected_energy_sources:
-                energy['Andere Erneuerbare'] = [d.power.other_renewables for d in filtered_data]
+                energy['Andere Erneuerbare'] = filtered_data.get_column('power.other_renewables') / unit_divisor
 
             if 'Andere Konventionelle' in self.selected_energy_sources:
-                energy['Andere Konventionelle'] = [d.power.other_conventionals for d in filtered_data]
+                energy['Andere Konventionelle'] = filtered_data.get_column('power.other_conventionals') / unit_divisor
 
             if 'Nuclear' in self.selected_energy_sources:
-                energy['Atomkraft'] = [d.power.nuclear for d in filtered_data]
+                energy['Atomkraft'] = filtered_data.get_column('power.nuclear') / unit_divisor
         elif self.plot_selection == "Verbrauch":
-            consumption_load['Last'] = [d.consumption.load for d in filtered_data]
-            consumption_residual['Residual Last'] = [d.consumption.residual for d in filtered_data]
+            consumption_load['Last'] = filtered_data.get_column('consumption.load') / unit_divisor
+            consumption_residual['Residual Last'] = filtered_data.get_column('consumption.residual') / unit_divisor
 
         energy_df               = pd.DataFrame(energy)
         consumption_load_df     = pd.DataFrame(consumption_load)
@@ -733,70 +760,12 @@ class IST_View:
 
 
         # --------------------
-        consumption_load_2030['Last 2030'] = [d.consumption.load * 1.56 for d in filtered_data]
+        consumption_load_2030['Last 2030'] = filtered_data.get_column('consumption.load') * 1.56 / unit_divisor
         consumption_load_2030_df = pd.DataFrame(consumption_load_2030)
         # --------------------
 
-        columns_mode = st.columns([2, 2, 2])
-
-        with columns_mode[0]:
-            mode = st.selectbox(
-                label='Absolut / Relativ',
-                options=["Absolut", "Relativ"],
-                index=0,
-                help="Absolut zeigt die Werte und relativ setzt diese im Vergleich zu der Gesamterzeugung pro Monat."
-            )
-
-        if self.selection_interval == self.intervals.get('total'):
-            with columns_mode[1]:
-                sum_mode = st.selectbox(
-                    label='Summe',
-                    options=["Monat", "Jahr"],
-                    index=0,
-                    help="Die Summe der Energieerzeugung pro Monat oder Jahr."
-                )
-
-        with columns_mode[2]:
-            show_legend = st.selectbox(
-                label='Legende anzeigen',
-                options=["True", "False"],
-                index=0,
-                help="Zeigt die Legende an."
-            )
-
-        # Group and sum the data by month
-        energy_df['Date']               = pd.to_datetime(energy_df['Date'])
-        consumption_load_df['Date']     = pd.to_datetime(consumption_load_df['Date'])
-        consumption_residual_df['Date'] = pd.to_datetime(consumption_residual_df['Date'])
-        consumption_load_2030_df['Date'] = pd.to_datetime(consumption_load_2030_df['Date'])
-
-        if self.selection_interval == self.intervals.get('total'):
-            if sum_mode == "Monat":
-                energy_df['Date'] = energy_df['Date'].dt.strftime('%Y-%m')
-                consumption_load_df['Date'] = consumption_load_df['Date'].dt.strftime('%Y-%m')
-                consumption_residual_df['Date'] = consumption_residual_df['Date'].dt.strftime('%Y-%m')
-                consumption_load_2030_df['Date'] = consumption_load_2030_df['Date'].dt.strftime('%Y-%m')
-            elif sum_mode == "Jahr":
-                energy_df['Date'] = energy_df['Date'].dt.strftime('%Y')
-                consumption_load_df['Date'] = consumption_load_df['Date'].dt.strftime('%Y')
-                consumption_residual_df['Date'] = consumption_residual_df['Date'].dt.strftime('%Y')
-                consumption_load_2030_df['Date'] = consumption_load_2030_df['Date'].dt.strftime('%Y')
-        elif self.selection_interval == self.intervals.get('year'):
-            energy_df['Date'] = energy_df['Date'].dt.strftime('%Y-%m')
-            consumption_load_df['Date'] = consumption_load_df['Date'].dt.strftime('%Y-%m')
-            consumption_residual_df['Date'] = consumption_residual_df['Date'].dt.strftime('%Y-%m')
-            consumption_load_2030_df['Date'] = consumption_load_2030_df['Date'].dt.strftime('%Y-%m')
-        elif self.selection_interval == self.intervals.get('month'):
-            energy_df['Date'] = energy_df['Date'].dt.strftime('%Y-%m-%d')
-            consumption_load_df['Date'] = consumption_load_df['Date'].dt.strftime('%Y-%m-%d')
-            consumption_residual_df['Date'] = consumption_residual_df['Date'].dt.strftime('%Y-%m-%d')
-            consumption_load_2030_df['Date'] = consumption_load_2030_df['Date'].dt.strftime('%Y-%m-%d')
-        elif self.selection_interval == self.intervals.get('day'):
-            energy_df['Date'] = energy_df['Date'].dt.strftime('%Y-%m-%d %H:%M')
-            consumption_load_df['Date'] = consumption_load_df['Date'].dt.strftime('%Y-%m-%d %H:%M')
-            consumption_residual_df['Date'] = consumption_residual_df['Date'].dt.strftime('%Y-%m-%d %H:%M')
-            consumption_load_2030_df['Date'] = consumption_load_2030_df['Date'].dt.strftime('%Y-%m-%d %H:%M')
-
+        # The rows are already aggregated, only the quarter hours of the
+        # repeated hour at the end of daylight saving time share a label
         energy_df                = energy_df.groupby(['Date']).sum().reset_index()
         consumption_load_df      = consumption_load_df.groupby(['Date']).sum().reset_index()
         consumption_residual_df  = consumption_residual_df.groupby(['Date']).sum().reset_index()
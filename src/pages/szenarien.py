@@ -5,6 +5,7 @@ from dtypes import View, URLImage
 
 from scenarios.prototype_v0_1 import Prototype_v0_1
 from scenarios.prototype_v0_2 import Prototype_v0_2
+from scenarios.prototype_v0_2.profiles import BASE_LOAD_PROFILES
 
 class Szenarien_View:
     def __init__(self):
@@ -427,7 +428,8 @@ class Szenarien_View:
     def render_storage_view(self):
         st.markdown('#### 🔋 Speicher')
 
-        st.multiselect(
+        # The order of the selection doesn't matter, the technologies are dispatched by their priority
+        st.session_state.storage_technologies = st.multiselect(
             label="Auswahl der Speichertechnologien",
             options=[
                 "Batteriespeicher",
@@ -701,6 +703,19 @@ class Szenarien_View:
                 help="Das Referenzjahr wird als Basis für die Simulation verwendet."
             )
 
+            st.session_state.base_load_profile = st.selectbox(
+                label='Verlauf der fossilen Grundlast',
+                options=list(BASE_LOAD_PROFILES),
+                index=0,
+                help="Verteilt die fossile Grundlast über das Jahr. Die Jahressumme bleibt gleich."
+            )
+
+            st.session_state.all_reference_years = st.toggle(
+                label='Alle Referenzjahre vergleichen',
+                value=False,
+                help="Simuliert das Szenario mit dem Wetter aller Referenzjahre und zeigt das ungünstigste Jahr."
+            )
+
             st.markdown(
                 '''
                 ##### Jahr mit höchster Produktion: 2020
@@ -715,6 +730,10 @@ class Szenarien_View:
                 '''
             )
 
+        st.divider()
+
+        self.render_storage_view()
+
     # ---------------
     # ! Simulations
     # ---------------
@@ -0,0 +1,188 @@
+import os
+import sys
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TextIO
+
+
+class ProgressSink:
+    """
+    Displays the progress of a long loop. Subclasses implement update() and close().
+    """
+    def update(self, done: int, total: int | None, label: str) -> None:
+        pass
+
+    def close(self, done: int, total: int | None, label: str) -> None:
+        pass
+
+
+class SilentSink(ProgressSink):
+    """
+    Discards all updates, e.g. for batch and server runs.
+    """
+    pass
+
+
+@dataclass
+class TerminalSink(ProgressSink):
+    """
+    Overwrites the current terminal line with the progress.
+
+    Attributes:
+    -----------
+    prefix (str) : The text in front of the progress, e.g. '╠ Parsing data: '.
+    stream (TextIO) : The stream to write to.
+    """
+    prefix: str     = ''
+    stream: TextIO  = field(default_factory=lambda: sys.stdout)
+
+    def update(self, done: int, total: int | None, label: str) -> None:
+        self.stream.write(f'\r{self.prefix}{TerminalSink.format(done, total, label)}\033[K')
+        self.stream.flush()
+
+    def close(self, done: int, total: int | None, label: str) -> None:
+        self.update(done, total, label)
+        self.stream.write('\n')
+        self.stream.flush()
+
+    @staticmethod
+    def format(done: int, total: int | None, label: str) -> str:
+        if total is None:
+            text = f'{done}'
+        elif total > 0:
+            text = f'{done}/{total} ({done / total:.0%})'
+        else:
+            text = f'{done}/{total}'
+
+        return f'{text} {label}' if label else text
+
+
+@dataclass
+class StreamlitSink(ProgressSink):
+    """
+    Shows the progress in a Streamlit progress bar, or in a text element if the total is unknown.
+
+    Attributes:
+    -----------
+    text (str) : The text above the progress bar.
+    clear (bool) : Whether to remove the progress bar when done.
+    """
+    text: str   = ''
+    clear: bool = True
+    element: object = field(default=None, init=False, repr=False)
+
+    def update(self, done: int, total: int | None, label: str) -> None:
+        import streamlit as st
+
+        text = f'{self.text} {label}'.strip()
+
+        if total is None or total <= 0:
+            if self.element is None:
+                self.element = st.empty()
+
+            self.element.text(f'{text} {done}'.strip())
+            return
+
+        if self.element is None:
+            self.element = st.progress(0.0, text=text)
+
+        self.element.progress(min(done / total, 1.0), text=text)
+
+    def close(self, done: int, total: int | None, label: str) -> None:
+        if self.element is None:
+            return
+
+        if self.clear:
+            self.element.empty()
+        else:
+            self.update(done, total, label)
+
+
+def get_default_sink(prefix: str = '') -> ProgressSink:
+    """
+    Returns the sink for terminal progress as configured by the PROGRESS environment variable.
+    'silent' discards all updates, anything else writes to the terminal.
+
+    Args:
+        prefix (str, optional): The text in front of the progress. Defaults to ''.
+
+    Returns:
+        ProgressSink: The sink.
+    """
+    if os.getenv('PROGRESS', 'terminal').lower() == 'silent':
+        return SilentSink()
+
+    return TerminalSink(prefix=prefix)
+
+
+@dataclass
+class ProgressReporter:
+    """
+    Rate-limits the progress updates of a long loop, so a loop over 35,040 rows
+    sends a few dozen updates to the terminal or browser instead of one per row.
+
+    An update is passed to the sink if at least min_interval seconds passed since the last one
+    and, if the total is known, the progress advanced by at least min_step.
+    The first and the final update are always passed.
+
+    Example:
+        progress = ProgressReporter(total=n, sink=TerminalSink(prefix='Parsing: '))
+
+        for i in range(n):
+            ...
+            progress.update(i + 1)
+
+        progress.finish()
+
+    Attributes:
+    -----------
+    total (int | None) : The number of steps. None if unknown.
+    sink (ProgressSink) : Where updates are displayed. Defaults to the sink configured by PROGRESS.
+    min_interval (float) : The minimum number of seconds between updates, i.e. 0.1 for at most 10 Hz.
+    min_step (float) : The minimum advance in progress between updates, as a fraction of the total.
+    """
+    total: int | None       = None
+    sink: ProgressSink      = field(default_factory=get_default_sink)
+    min_interval: float     = 0.1
+    min_step: float         = 0.01
+    done: int               = field(default=0, init=False)
+    label: str              = field(default='', init=False)
+    last_time: float        = field(default=float('-inf'), init=False, repr=False)
+    last_done: int | None   = field(default=None, init=False, repr=False)
+
+    def update(self, done: int, label: str = '') -> None:
+        """
+        Records the progress and passes it to the sink if the rate limit allows it.
+
+        Args:
+            done (int): The number of finished steps.
+            label (str, optional): Describes the current step. Defaults to ''.
+        """
+        self.done = done
+        self.label = label
+
+        now = perf_counter()
+
+        if self.last_done is not None:
+            if now - self.last_time < self.min_interval:
+                return
+
+            if self.total and (done - self.last_done) < self.min_step * self.total:
+                return
+
+        self.last_time = now
+        self.last_done = done
+
+        self.sink.update(done, self.total, label)
+
+    def finish(self, label: str | None = None) -> None:
+        """
+        Passes the final progress to the sink and closes it.
+
+        Args:
+            label (str, optional): Describes the final state. Defaults to the last label.
+        """
+        if label is not None:
+            self.label = label
+
+        self.sink.close(self.done, self.total, self.label)
@@ -8,6 +8,8 @@ import altair as alt
 from vega_datasets import data as vega_data
 from streamlit_option_menu import option_menu
 
+from coverage_stats import Coverage
+from data_manager.data_manager import COLUMNS, FOSSILS, RENEWABLES, Collections
 from init_page import PageManager
 
 # Import data.py
@@ -129,19 +131,17 @@ def get_init_prompts():
 
 
 def calculate_net_balance(year: int, metric_prefix: str = 'tera', round_to: int = 2):
-    total_renewables = 0
-    total_fossil_fuels = 0
-    total_production = 0
-    total_consumption = 0
-
-    for month in range(0, 12):
-        for day in range(0, 31):
-            for hour in range(0, 24):
-                for quarter in range(0, 4):
-                    total_renewables += production_data[year-2020, month, day, hour, quarter].total_renewables()
-                    total_fossil_fuels += production_data[year-2020, month, day, hour, quarter].total_fossil_fuels()
-                    total_production += production_data[year-2020, month, day, hour, quarter].total_production()
-                    total_consumption += consumption_data[year-2020, month, day, hour, quarter].total_load
+    collections: Collections = PageManager.get_data()
+
+    # The yearly sums are read from the rollups of the collection
+    production_fields = [name for name in COLUMNS if name.startswith('production.')]
+    totals = collections.smard.resample('year', production_fields + ['consumption.load'])
+    totals = totals[totals.index.year == year].sum()
+
+    total_renewables = float(totals[[f'production.{f}' for f in RENEWABLES]].sum())
+    total_fossil_fuels = float(totals[[f'production.{f}' for f in FOSSILS]].sum())
+    total_production = float(totals[production_fields].sum())
+    total_consumption = float(totals['consumption.load'])
 
     prefixes = {
         'tera': 1_000_000_000_000,
@@ -535,30 +535,12 @@ def render_view_overview():
     time_interval_options = ['Gesamt (2020-2022)', 2020, 2021, 2022]
     selected_interval = st.selectbox('Ausgewählter Zeitraum', options=time_interval_options, key='selectbox_year')
 
-    data_power_from_renewables_hist = np.zeros(150, dtype=int)
-
-    for year in range(0, 3):
-        for month in range(0, 12):
-            for day in range(0, 31):
-                for hour in range(0, 24):
-                    for quarter in range(0, 4):
-                        if st.session_state.selectbox_year == time_interval_options[0]:
-                            year = year
-                        else:
-                            year = st.session_state.selectbox_year - 2020
-
-                        if production_data[year, month, day, hour, quarter].coal == 0:
-                            continue
-
-                        renewables_production = production_data[year, month, day, hour, quarter].total_renewables()
-                        total_load = consumption_data[year, month, day, hour, quarter].total_load
-
-                        percentage = renewables_production / total_load * 100
-
-                        # Clamp the percentage to 100 since it is possible to have surplus energy
-                        # percentage = min(percentage, 100)
+    if st.session_state.selectbox_year == time_interval_options[0]:
+        coverage = get_renewable_coverage(2030)
+    else:
+        coverage = get_renewable_coverage(st.session_state.selectbox_year - 2020)
 
-                        data_power_from_renewables_hist[int(percentage)] += 1
+    data_power_from_renewables_hist = coverage.get_histogram(upper_limit=149)
 
     df_power_from_renewables_hist = pd.DataFrame(
         {
@@ -1024,42 +1006,35 @@ def change_page(key):
     st.session_state.selection = st.session_state[key]
 
 
-def compute_renewable_distribution(
-        selectbox_year: int,
-        resolution: int = 1,
-        clamp_overshoot: bool = False,
-        upper_limit: int = 100) -> pd.DataFrame:
+def get_renewable_coverage(selectbox_year: int) -> Coverage:
+    """
+    Returns the coverage of the load by renewables per quarter hour.
 
-    slots: int = upper_limit // resolution + 1
-    data = np.zeros(slots, dtype=int)
+    Args:
+        selectbox_year (int): The index of the year, i.e. 0 for 2020, or 2030 for 2020 to 2022.
 
-    for year in range(0, 3):
-        for month in range(0, 12):
-            for day in range(0, 31):
-                for hour in range(0, 24):
-                    for quarter in range(0, 4):
-                        if selectbox_year == 2030:
-                            year = year
-                        else:
-                            year = selectbox_year
+    Returns:
+        Coverage: The coverage of all quarter hours of the years.
+    """
+    collections: Collections = PageManager.get_data()
 
-                        # Check for empty entries, i.e., invalid dates
-                        if production_data[year, month, day, hour, quarter].coal == 0:
-                            continue
-
-                        renewables_production = production_data[year, month, day, hour, quarter].total_renewables()
-                        total_load = consumption_data[year, month, day, hour, quarter].total_load
+    years = range(2020, 2023) if selectbox_year == 2030 else [2020 + selectbox_year]
+    views = [collections.smard.get_year(year) for year in years]
 
-                        percentage = renewables_production / total_load * 100
+    return Coverage(
+        production=np.concatenate([view.get_total_renewables() for view in views]),
+        consumption=np.concatenate([view.get_column('consumption.load') for view in views]),
+    )
 
-                        # Clamp the percentage to 100 since it is possible to have surplus energy
-                        if clamp_overshoot:
-                            percentage = min(percentage, upper_limit)
 
-                        # Map percentage to slot according to the resolution
-                        slot = int(percentage) // resolution
+def compute_renewable_distribution(
+        selectbox_year: int,
+        resolution: int = 1,
+        clamp_overshoot: bool = False,
+        upper_limit: int = 100) -> pd.DataFrame:
 
-                        data[slot] += 1
+    coverage = get_renewable_coverage(selectbox_year)
+    data = coverage.get_histogram(resolution, clamp_overshoot, upper_limit)
 
     df = pd.DataFrame(
         {
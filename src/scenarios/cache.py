@@ -0,0 +1,376 @@
+import os
+import glob
+import hashlib
+import json
+import mmap
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+
+@dataclass
+class CacheEntry:
+    """
+    An entry of the ResultCache.
+
+    Attributes:
+    -----------
+    value (Any) : The cached result.
+    size (int) : The estimated size of the result in bytes.
+    """
+    value: Any
+    size: int
+
+
+@dataclass
+class ResultCache:
+    """
+    A cache for scenario results, keyed by a stable hash of the scenario parameters and the dataset version.
+
+    The in-memory layer evicts the least recently used entries once max_entries or max_bytes is exceeded.
+    The optional on-disk layer keeps pickled results in disk_path, so they survive a restart of the app.
+    The cache is shared between sessions and thread-safe.
+    Concurrent requests for the same key are computed only once,
+    the other callers wait for that computation and share its result.
+
+    Attributes:
+    -----------
+    max_entries (int) : The maximum number of results in memory.
+    max_bytes (int) : The maximum estimated size of all results in memory.
+    disk_path (str | None) : The directory of the on-disk layer. None disables it.
+    max_disk_entries (int) : The maximum number of results on disk.
+    hits (int) : The number of lookups served from memory.
+    disk_hits (int) : The number of lookups served from disk.
+    misses (int) : The number of lookups that had to compute the result.
+    shared (int) : The number of lookups that waited for a computation of another caller.
+
+    Methods:
+    --------
+    get_key(params: Any, version: str | None) -> str | None
+        Returns the cache key of the given parameters and dataset version.
+    get(key: str) -> Any | None
+        Returns the cached result or None.
+    put(key: str, value: Any) -> None
+        Stores a result.
+    get_or_compute(key: str | None, func: Callable[[], Any]) -> Any
+        Returns the cached result or computes and stores it.
+    get_stats() -> dict
+        Returns the counters and the current size.
+    clear() -> None
+        Removes all results from memory and disk and resets the counters.
+    """
+    max_entries: int        = 32
+    max_bytes: int          = 512 * 1024 * 1024
+    disk_path: str | None   = None
+    max_disk_entries: int   = 256
+    hits: int               = field(default=0, init=False)
+    disk_hits: int          = field(default=0, init=False)
+    misses: int             = field(default=0, init=False)
+    shared: int             = field(default=0, init=False)
+    entries: OrderedDict    = field(default_factory=OrderedDict, init=False, repr=False)
+    pending: dict           = field(default_factory=dict, init=False, repr=False)
+    size: int               = field(default=0, init=False)
+    lock: threading.Lock    = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.disk_path is not None:
+            os.makedirs(self.disk_path, exist_ok=True)
+
+    @staticmethod
+    def get_key(params: Any, version: str | None) -> str | None:
+        """
+        Returns the cache key of the given parameters and dataset version.
+        Parameters of different scenario types never share a key.
+
+        Args:
+            params (Any): The scenario parameters. Must be a dataclass.
+            version (str | None): The version of the base dataset.
+
+        Returns:
+            str | None: The key or None if the dataset version is unknown, in which case nothing is cached.
+        """
+        if version is None:
+            return None
+
+        payload = json.dumps(
+            [f'{type(params).__module__}.{type(params).__qualname__}', asdict(params), version],
+            sort_keys=True,
+            default=repr,
+        )
+
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Returns the cached result.
+        A result found on disk is moved into memory.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any | None: The result or None if it is not cached.
+        """
+        with self.lock:
+            entry: CacheEntry | None = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+
+        value = self.read_disk(key)
+
+        if value is None:
+            return None
+
+        with self.lock:
+            self.disk_hits += 1
+            self.put_memory(key, value)
+
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Stores a result in memory and, if enabled, on disk.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The result.
+        """
+        with self.lock:
+            self.put_memory(key, value)
+
+        self.write_disk(key, value)
+
+    def get_or_compute(self, key: str | None, func: Callable[[], Any]) -> Any:
+        """
+        Returns the cached result or computes and stores it.
+        If the same key is already being computed, waits for that computation instead of starting another one.
+
+        Args:
+            key (str | None): The cache key. None computes the result without caching it.
+            func (Callable[[], Any]): Computes the result.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            Exception: Whatever func raised, also in the callers that waited for it.
+        """
+        if key is None:
+            with self.lock:
+                self.misses += 1
+
+            return func()
+
+        value = self.get(key)
+
+        if value is not None:
+            return value
+
+        leader = False
+
+        with self.lock:
+            # The computation may have finished since the lookup above
+            entry: CacheEntry | None = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+
+            future: Future | None = self.pending.get(key)
+
+            if future is not None:
+                self.shared += 1
+            else:
+                future = Future()
+                self.pending[key] = future
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = func()
+        except BaseException as e:
+            with self.lock:
+                del self.pending[key]
+
+            future.set_exception(e)
+            raise
+
+        self.put(key, value)
+
+        with self.lock:
+            del self.pending[key]
+
+        future.set_result(value)
+
+        return value
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'shared': self.shared,
+                'entries': len(self.entries),
+                'bytes': self.size,
+            }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.shared = 0
+
+        if self.disk_path is not None:
+            for filepath in glob.glob(os.path.join(self.disk_path, '*.pkl')):
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+
+    def put_memory(self, key: str, value: Any) -> None:
+        # Must be called with the lock held
+        old = self.entries.pop(key, None)
+
+        if old is not None:
+            self.size -= old.size
+
+        entry = CacheEntry(value, ResultCache.get_size(value))
+
+        # A result that exceeds the whole budget is not kept in memory
+        if entry.size > self.max_bytes:
+            return
+
+        self.entries[key] = entry
+        self.size += entry.size
+
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.size
+
+    def get_disk_filepath(self, key: str) -> str:
+        return os.path.join(self.disk_path, f'{key}.pkl')
+
+    def read_disk(self, key: str) -> Any | None:
+        if self.disk_path is None:
+            return None
+
+        filepath = self.get_disk_filepath(key)
+
+        try:
+            with open(filepath, 'rb') as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Unreadable, e.g. written by an older version of the code
+            print(f'Discarding cached result {filepath}: {e}')
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+            return None
+
+        # Keep recently used results when evicting by modification time
+        try:
+            os.utime(filepath)
+        except OSError:
+            pass
+
+        return value
+
+    def write_disk(self, key: str, value: Any) -> None:
+        if self.disk_path is None:
+            return
+
+        filepath = self.get_disk_filepath(key)
+        tmp_filepath = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        try:
+            with open(tmp_filepath, 'wb') as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp_filepath, filepath)
+        except Exception as e:
+            print(f'Could not write cached result {filepath}: {e}')
+            try:
+                os.remove(tmp_filepath)
+            except OSError:
+                pass
+            return
+
+        filepaths = glob.glob(os.path.join(self.disk_path, '*.pkl'))
+
+        if len(filepaths) <= self.max_disk_entries:
+            return
+
+        filepaths.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+
+        for old in filepaths[:len(filepaths) - self.max_disk_entries]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    @staticmethod
+    def get_size(value: Any) -> int:
+        """
+        Returns the estimated size of a result in bytes.
+        Every array buffer is counted once, views into the shared base dataset are free.
+
+        Args:
+            value (Any): The result.
+
+        Returns:
+            int: The size in bytes.
+        """
+        size = 0
+        seen: set[int] = set()
+        roots: set[int] = set()
+        stack = [value]
+
+        while stack:
+            obj = stack.pop()
+
+            if id(obj) in seen:
+                continue
+
+            seen.add(id(obj))
+
+            if isinstance(obj, np.ndarray):
+                root = obj
+
+                while isinstance(root.base, np.ndarray):
+                    root = root.base
+
+                # Memory-mapped files and views into the frozen base dataset are shared
+                shared = isinstance(root.base, mmap.mmap) or (root is not obj and root.flags.owndata and not root.flags.writeable)
+
+                if not shared and id(root) not in roots:
+                    roots.add(id(root))
+                    size += root.nbytes
+            elif is_dataclass(obj) and not isinstance(obj, type):
+                stack.extend(getattr(obj, f.name) for f in fields(obj))
+            elif isinstance(obj, dict):
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple)):
+                stack.extend(obj)
+            else:
+                size += 64
+
+        return size
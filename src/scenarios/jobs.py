@@ -0,0 +1,179 @@
+import time
+import uuid
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+@dataclass
+class Job:
+    """
+    A simulation running in the background.
+
+    Attributes:
+    -----------
+    id (str) : The job id.
+    key (Any) : Identifies what the job computes, e.g. the scenario parameters.
+    status (str) : One of 'queued', 'running', 'done', 'failed' and 'cancelled'.
+    progress (str) : The last reported step, e.g. 'copying', 'iterating 12/200' or 'done'.
+    result (Any) : The result once the job is done.
+    error (BaseException | None) : The exception if the job failed.
+    created (float) : The submission time.
+    finished (float | None) : The time the job finished, failed or was cancelled.
+    """
+    id: str
+    key: Any                        = None
+    status: str                     = 'queued'
+    progress: str                   = 'queued'
+    result: Any                     = None
+    error: BaseException | None     = None
+    created: float                  = field(default_factory=time.time)
+    finished: float | None          = None
+    cancel_event: threading.Event   = field(default_factory=threading.Event, repr=False)
+    future: Future | None           = field(default=None, repr=False)
+
+    def is_finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+
+@dataclass
+class JobQueue:
+    """
+    Runs simulations on a thread pool, so the Streamlit script thread stays free
+    and a running simulation survives reruns of the page.
+    The page submits a job, keeps its id in the session state and polls it on every rerun.
+
+    Jobs are cancelled cooperatively: the progress callback raises JobCancelledException
+    at the next step after cancel() was called.
+    Finished jobs are removed ttl seconds after they finished.
+
+    Attributes:
+    -----------
+    max_workers (int) : The number of simulations running at the same time.
+    ttl (float) : The number of seconds a finished job and its result are kept.
+
+    Methods:
+    --------
+    submit(func: Callable[[Callable[[str], None]], Any], key: Any = None) -> str
+        Submits a job and returns its id. A live job with the same key is reused.
+    get(job_id: str | None) -> Job | None
+        Returns the job or None if it does not exist or expired.
+    cancel(job_id: str) -> bool
+        Requests the cancellation of a job.
+    purge() -> None
+        Removes expired jobs.
+    """
+    max_workers: int            = 2
+    ttl: float                  = 600
+    jobs: dict                  = field(default_factory=dict, init=False, repr=False)
+    lock: threading.Lock        = field(default_factory=threading.Lock, init=False, repr=False)
+    executor: ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='simulation')
+
+    def submit(self, func: Callable[[Callable[[str], None]], Any], key: Any = None) -> str:
+        """
+        Submits a job.
+        If a job with the same key is still queued or running and was not cancelled, its id is returned instead,
+        so identical simulations do not occupy several workers.
+
+        Args:
+            func (Callable[[Callable[[str], None]], Any]): Computes the result. It is called with the progress callback.
+            key (Any, optional): Identifies what the job computes. None is never shared. Defaults to None.
+
+        Returns:
+            str: The job id.
+        """
+        self.purge()
+
+        job = Job(id=uuid.uuid4().hex, key=key)
+
+        with self.lock:
+            if key is not None:
+                for existing in self.jobs.values():
+                    if existing.key == key and not existing.is_finished() and not existing.cancel_event.is_set():
+                        return existing.id
+
+            self.jobs[job.id] = job
+
+        job.future = self.executor.submit(JobQueue.run_job, job, func)
+
+        return job.id
+
+    def get(self, job_id: str | None) -> Job | None:
+        if job_id is None:
+            return None
+
+        self.purge()
+
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Requests the cancellation of a job.
+        A queued job never starts, a running job stops at its next progress step.
+
+        Args:
+            job_id (str): The job id.
+
+        Returns:
+            bool: Whether the job was still pending.
+        """
+        job = self.get(job_id)
+
+        if job is None or job.is_finished():
+            return False
+
+        job.cancel_event.set()
+
+        return True
+
+    def purge(self) -> None:
+        now = time.time()
+
+        with self.lock:
+            expired = [job_id for job_id, job in self.jobs.items() if job.finished is not None and now - job.finished > self.ttl]
+
+            for job_id in expired:
+                del self.jobs[job_id]
+
+    @staticmethod
+    def run_job(job: Job, func: Callable[[Callable[[str], None]], Any]) -> None:
+        def progress(step: str) -> None:
+            if job.cancel_event.is_set():
+                raise JobCancelledException()
+
+            job.progress = step
+
+        job.status = 'running'
+
+        while True:
+            try:
+                progress('starting')
+                job.result = func(progress)
+                job.progress = 'done'
+                job.status = 'done'
+            except JobCancelledException:
+                # A shared computation that another job cancelled is started again
+                if not job.cancel_event.is_set():
+                    continue
+
+                job.progress = 'cancelled'
+                job.status = 'cancelled'
+            except Exception as e:
+                job.error = e
+                job.progress = 'failed'
+                job.status = 'failed'
+
+            break
+
+        job.finished = time.time()
+
+
+class JobCancelledException(Exception):
+    def __init__(self, message: str = 'Job was cancelled.'):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,233 @@
+import datetime as dt
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
+
+from coverage_stats import Coverage
+from dtypes import Unit
+
+from data_manager.data_manager import Collections, Data, DataView
+
+
+@dataclass(frozen=True)
+class ScenarioParameters:
+    """
+    The parameters of a Prototype v0.1 scenario.
+
+    Attributes:
+    -----------
+    reference_year (int) : The year whose weather and load profile is scaled to 2030.
+    load (float) : The total consumption of 2030 in TWh.
+    power_target_pv (float) : The installed PV power in W.
+    power_target_windoff (float) : The installed offshore wind power in W.
+    power_target_windon (float) : The installed onshore wind power in W.
+    power_target_biomass (float) : The installed biomass power in W.
+    power_target_hydro (float) : The installed hydro power in W.
+    base_load (float) : The yearly fossil base load in Wh, spread evenly over the year.
+    """
+    reference_year: int
+    load: float
+    power_target_pv: float      = Unit.GW(215)
+    power_target_windoff: float = Unit.GW(30)
+    power_target_windon: float  = Unit.GW(115)
+    power_target_biomass: float = Unit.MW(8_332)
+    power_target_hydro: float   = Unit.MW(4_253)
+    base_load: float            = Unit.TWh(70)
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """
+    The result of a Prototype v0.1 scenario. All energies are in Wh and all series are per quarter hour.
+
+    Attributes:
+    -----------
+    params (ScenarioParameters) : The parameters of the scenario.
+    reference (Data) : The last entry of the reference year, which holds its installed power.
+    total_consumption_reference (float) : The consumption of the reference year.
+    consumption_factor (float) : The factor from the reference consumption to the 2030 consumption.
+    possible_output_pv (float) : The PV output of the reference year at full power.
+    possible_output_windoff (float) : The offshore wind output of the reference year at full power.
+    possible_output_windon (float) : The onshore wind output of the reference year at full power.
+    ratio_pv (float) : The actual PV output of the reference year relative to the possible output.
+    ratio_windoff (float) : The actual offshore wind output of the reference year relative to the possible output.
+    ratio_windon (float) : The actual onshore wind output of the reference year relative to the possible output.
+    factor_pv (float) : The factor from the reference PV power to the target power.
+    factor_windoff (float) : The factor from the reference offshore wind power to the target power.
+    factor_windon (float) : The factor from the reference onshore wind power to the target power.
+    factor_biomass (float) : The factor from the reference biomass power to the target power.
+    factor_hydro (float) : The factor from the reference hydro power to the target power.
+    consumption (NDArray) : The consumption of 2030.
+    production_pv (NDArray) : The PV production of 2030.
+    production_windoff (NDArray) : The offshore wind production of 2030.
+    production_windon (NDArray) : The onshore wind production of 2030.
+    production_biomass (NDArray) : The biomass production of 2030.
+    production_hydro (NDArray) : The hydro production of 2030.
+    production_base_load (NDArray) : The fossil base load of 2030.
+    production_renewables (NDArray) : The renewable production of 2030.
+    net_balance (NDArray) : The production including the base load minus the consumption.
+    surplus (int) : The number of quarter hours in which renewables cover the consumption.
+    surplus_80 (int) : The number of quarter hours in which renewables cover 80 % of the consumption.
+    surplus_90 (int) : The number of quarter hours in which renewables cover 90 % of the consumption.
+    gcp (int) : The greatest coverage percentage including the base load.
+    gcp_dist (NDArray) : The number of quarter hours per coverage percentage from 0 to gcp.
+    """
+    params: ScenarioParameters
+    reference: Data
+    total_consumption_reference: float
+    consumption_factor: float
+    possible_output_pv: float
+    possible_output_windoff: float
+    possible_output_windon: float
+    ratio_pv: float
+    ratio_windoff: float
+    ratio_windon: float
+    factor_pv: float
+    factor_windoff: float
+    factor_windon: float
+    factor_biomass: float
+    factor_hydro: float
+    consumption: NDArray
+    production_pv: NDArray
+    production_windoff: NDArray
+    production_windon: NDArray
+    production_biomass: NDArray
+    production_hydro: NDArray
+    production_base_load: NDArray
+    production_renewables: NDArray
+    net_balance: NDArray
+    surplus: int
+    surplus_80: int
+    surplus_90: int
+    gcp: int
+    gcp_dist: NDArray
+
+    @property
+    def total_consumption(self) -> float:
+        return self.consumption.sum()
+
+    @property
+    def total_production_renewables(self) -> float:
+        return self.production_renewables.sum()
+
+
+class Engine:
+    """
+    The headless simulation of Prototype v0.1.
+    It only reads the base dataset and never depends on Streamlit.
+    """
+    @staticmethod
+    def get_date_range(reference_year: int) -> pd.DatetimeIndex:
+        return pd.date_range(
+            start=dt.datetime(reference_year, 1, 1, 0, 0).strftime("%Y-%m-%d %H:%M"),
+            end=dt.datetime(reference_year, 12, 31, 23, 59).strftime("%Y-%m-%d %H:%M"),
+            freq='15min',
+            tz='Europe/Berlin'
+        )
+
+    @staticmethod
+    def run(data: Collections, params: ScenarioParameters) -> ScenarioResult:
+        """
+        Runs the scenario.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (ScenarioParameters): The parameters.
+
+        Returns:
+            ScenarioResult: The result.
+        """
+        data_reference_year: DataView = data.smard.get_year(params.reference_year)
+        reference: Data = data_reference_year[-1]
+
+        total_consumption_reference_year = data_reference_year.get_column('consumption.load').sum()
+        total_consumption_2030 = Unit.TWh(params.load)
+
+        consumption_factor = total_consumption_2030 / total_consumption_reference_year
+
+        data_2030 = data_reference_year.get_column('consumption.load') * consumption_factor
+
+        # ---------------
+        # ! Computing ratios
+        # ---------------
+        total_production_pv_reference = data_reference_year.get_column('production.pv').sum()
+        total_production_wind_offshore_reference = data_reference_year.get_column('production.wind_offshore').sum()
+        total_production_wind_onshore_reference = data_reference_year.get_column('production.wind_onshore').sum()
+
+        power_pv_reference = reference.power.pv * 365 * 24
+        power_wind_offshore_reference = reference.power.wind_offshore * 365 * 24
+        power_wind_onshore_reference = reference.power.wind_onshore * 365 * 24
+
+        ratio_pv_reference = total_production_pv_reference / power_pv_reference
+        ratio_wind_offshore_reference = total_production_wind_offshore_reference / power_wind_offshore_reference
+        ratio_wind_onshore_reference = total_production_wind_onshore_reference / power_wind_onshore_reference
+
+        pv_factor            = (params.power_target_pv / reference.power.pv)
+        wind_offshore_factor = (params.power_target_windoff / reference.power.wind_offshore)
+        wind_onshore_factor  = (params.power_target_windon / reference.power.wind_onshore)
+        biomass_factor       = (params.power_target_biomass / reference.power.biomass)
+        hydro_factor         = (params.power_target_hydro / reference.power.hydro)
+
+        # ---------------
+        # ! Compute 2030 production
+        # ---------------
+        production_pv_2030 = data_reference_year.get_column('production.pv') * pv_factor
+        production_wind_offshore_2030 = data_reference_year.get_column('production.wind_offshore') * wind_offshore_factor
+        production_wind_onshore_2030 = data_reference_year.get_column('production.wind_onshore') * wind_onshore_factor
+        production_biomass_2030 = data_reference_year.get_column('production.biomass') * biomass_factor
+        production_hydro_2030 = data_reference_year.get_column('production.hydro') * hydro_factor
+        production_base_load_2030 = np.full(data_reference_year.size, params.base_load / data_reference_year.size)
+
+        production_renewables_2030 = (
+            production_pv_2030 +
+            production_wind_offshore_2030 +
+            production_wind_onshore_2030 +
+            production_biomass_2030 +
+            production_hydro_2030
+        )
+
+        # Count entries with surplus
+        coverage_renewables = Coverage(production_renewables_2030, data_2030)
+        surplus_80, surplus_90, surplus = (int(count) for count in coverage_renewables.count_covered((0.8, 0.9, 1.0)))
+
+        # Count intervals with n percent coverage
+        production_2030 = production_renewables_2030 + production_base_load_2030
+
+        _gcp_dist = Coverage(production_2030, data_2030).get_histogram(rounding='round')
+        _gcp: int = _gcp_dist.size - 1
+
+        net_balance = production_2030 - data_2030
+
+        return ScenarioResult(
+            params=params,
+            reference=reference,
+            total_consumption_reference=total_consumption_reference_year,
+            consumption_factor=consumption_factor,
+            possible_output_pv=power_pv_reference,
+            possible_output_windoff=power_wind_offshore_reference,
+            possible_output_windon=power_wind_onshore_reference,
+            ratio_pv=ratio_pv_reference,
+            ratio_windoff=ratio_wind_offshore_reference,
+            ratio_windon=ratio_wind_onshore_reference,
+            factor_pv=pv_factor,
+            factor_windoff=wind_offshore_factor,
+            factor_windon=wind_onshore_factor,
+            factor_biomass=biomass_factor,
+            factor_hydro=hydro_factor,
+            consumption=data_2030,
+            production_pv=production_pv_2030,
+            production_windoff=production_wind_offshore_2030,
+            production_windon=production_wind_onshore_2030,
+            production_biomass=production_biomass_2030,
+            production_hydro=production_hydro_2030,
+            production_base_load=production_base_load_2030,
+            production_renewables=production_renewables_2030,
+            net_balance=net_balance,
+            surplus=surplus,
+            surplus_80=surplus_80,
+            surplus_90=surplus_90,
+            gcp=_gcp,
+            gcp_dist=_gcp_dist,
+        )
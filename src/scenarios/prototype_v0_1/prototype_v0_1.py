@@ -1,99 +1,85 @@
-import datetime as dt
 import streamlit as st
 import altair as alt
 import numpy as np
 import pandas as pd
-from dtypes import URLImage, View
+from dtypes import URLImage, Unit, View
 
-from data_manager.data_manager import DataArray
+from data_manager.data_manager import DataView
+
+from scenarios.cache import ResultCache
+
+from .engine import Engine, ScenarioParameters, ScenarioResult
 
 
 class Prototype_v0_1:
-    def __init__(self, view):
+    """
+    Renders Prototype v0.1. The simulation itself runs headless in Engine.
+
+    Attributes:
+    -----------
+    view (Szenarien_View) : The view to render into.
+    params (ScenarioParameters | None) : The parameters. None if they could not be parsed.
+    """
+    def __init__(self, view, params: ScenarioParameters | None = None):
         self.view = view
+        self.params = params
+
+        if self.params is None:
+            self.params = Prototype_v0_1.get_params()
+
+    @staticmethod
+    def get_params() -> ScenarioParameters | None:
+        """
+        Reads the parameters from the session state.
+
+        Returns:
+            ScenarioParameters | None: The parameters or None if they could not be parsed.
+        """
+        try:
+            return ScenarioParameters(
+                reference_year=st.session_state.reference_year,
+                load=st.session_state.total_consumption_2030,
+            )
+        except:
+            st.error('Could not parse parameters.')
+            return None
 
     def simulate(self):
         # ---------------
         # ! Simulate
         # ---------------
+        if self.params is None:
+            return
 
         data = self.view.page.get_data()
 
+        with st.spinner('Simulating...'):
+            # Identical parameters on the same dataset are only simulated once
+            cache: ResultCache = self.view.page.get_result_cache()
+            key = ResultCache.get_key(self.params, data.get_version())
+            result: ScenarioResult = cache.get_or_compute(key, lambda: Engine.run(data, self.params))
 
-        simulation_progress_widget = st.progress(
-            value=0.0,
-            text="Simulating..."
-        )
-
-        data_reference_year: DataArray = data.smard.get_year(st.session_state.reference_year)
-
-        total_consumption_reference_year = 0
-
-        for d in data_reference_year:
-            total_consumption_reference_year += d.consumption.load
-
-        total_consumption_2030 = st.session_state.total_consumption_2030 * 1_000_000_000_000
-
-        simulation_progress_widget.progress(0.2)
-
-        consumption_factor = total_consumption_2030 / total_consumption_reference_year
-
-        st.write(f'Total consumption {st.session_state.reference_year}: {total_consumption_reference_year}')
-        st.write(f'Total consumption 2030: {total_consumption_2030}')
-        st.write(f'Consumption factor: {consumption_factor}')
-
-        data_2030 = [d.consumption.load * consumption_factor for d in data_reference_year]
-
-        simulation_progress_widget.progress(0.5)
-
-        # Factor for PV
-        total_production_pv_reference = 0
-        total_production_wind_offshore_reference = 0
-        total_production_wind_onshore_reference = 0
-
-        for d in data_reference_year:
-            total_production_pv_reference += d.production.pv
-            total_production_wind_offshore_reference += d.production.wind_offshore
-            total_production_wind_onshore_reference += d.production.wind_onshore
-
-        simulation_progress_widget.progress(0.7)
-
-        power_pv_reference = data_reference_year[-1].power.pv * 365 * 24
-        power_wind_offshore_reference = data_reference_year[-1].power.wind_offshore * 365 * 24
-        power_wind_onshore_reference = data_reference_year[-1].power.wind_onshore * 365 * 24
-
-        simulation_progress_widget.progress(1.0)
-
-        # ---------------
-        # ! Computing ratios
-        # ---------------
-
-        ratio_pv_reference = total_production_pv_reference / power_pv_reference
-        ratio_wind_offshore_reference = total_production_wind_offshore_reference / power_wind_offshore_reference
-        ratio_wind_onshore_reference = total_production_wind_onshore_reference / power_wind_onshore_reference
+        self.render(result)
 
-        target_pv_power            = 215_000_000_000
-        target_wind_offshore_power = 30_000_000_000
-        target_wind_onshore_power  = 115_000_000_000
-        target_biomass_power       = 8_332_000_000
-        target_hydro_power         = 4_253_000_000
+    def render(self, result: ScenarioResult):
+        data = self.view.page.get_data()
+        params = result.params
+        reference = result.reference
 
-        pv_factor            = (target_pv_power / data_reference_year[-1].power.pv)
-        wind_offshore_factor = (target_wind_offshore_power / data_reference_year[-1].power.wind_offshore)
-        wind_onshore_factor  = (target_wind_onshore_power / data_reference_year[-1].power.wind_onshore)
-        biomass_factor       = (target_biomass_power / data_reference_year[-1].power.biomass)
-        hydro_factor         = (target_hydro_power / data_reference_year[-1].power.hydro)
+        st.write(f'Total consumption {params.reference_year}: {result.total_consumption_reference}')
+        st.write(f'Total consumption 2030: {Unit.TWh(params.load)}')
+        st.write(f'Consumption factor: {result.consumption_factor}')
 
         st.divider()
-        st.write(f'Installed PV Reference:           {(data_reference_year[-1].power.pv / 1_000_000_000):.2f} GW -> {(target_pv_power / 1_000_000_000):.2f} GW : {pv_factor:.2f}x')
-        st.write(f'Possible PV Output Reference:           {(power_pv_reference / 1_000_000_000_000):.0f} TWh -> {(power_pv_reference / 1_000_000_000_000_000 * pv_factor):.2f} PWh')
-        st.write(f'Installed Wind Offshore Reference:           {(data_reference_year[-1].power.wind_offshore / 1_000_000_000):.2f} GW -> {(target_wind_offshore_power / 1_000_000_000):.2f} GW : {wind_offshore_factor:.2f}x')
-        st.write(f'Possible Wind Offshore Output Reference:           {(power_wind_offshore_reference / 1_000_000_000_000):.0f} TWh -> {(power_wind_offshore_reference / 1_000_000_000_000_000 * wind_offshore_factor):.2f} PWh')
-        st.write(f'Installed Wind Onshore Reference:           {(data_reference_year[-1].power.wind_onshore / 1_000_000_000):.2f} GW -> {(target_wind_onshore_power / 1_000_000_000):.2f} GW : {wind_onshore_factor:.2f}x')
-        st.write(f'Possible Wind Onshore Output Reference:           {(power_wind_onshore_reference / 1_000_000_000_000):.0f} TWh -> {(power_wind_onshore_reference / 1_000_000_000_000_000 * wind_onshore_factor):.2f} PWh')
-        st.write(f'Ratio PV:            {(ratio_pv_reference * 100):5.2f}%')
-        st.write(f'Ratio Wind Offshore: {(ratio_wind_offshore_reference * 100):5.2f}%')
-        st.write(f'Ratio Wind Onshore:  {(ratio_wind_onshore_reference * 100):5.2f}%')
+        st.write(f'Installed PV Reference:           {(reference.power.pv / 1_000_000_000):.2f} GW -> {(params.power_target_pv / 1_000_000_000):.2f} GW : {result.factor_pv:.2f}x')
+        st.write(f'Possible PV Output Reference:           {(result.possible_output_pv / 1_000_000_000_000):.0f} TWh -> {(result.possible_output_pv / 1_000_000_000_000_000 * result.factor_pv):.2f} PWh')
+        st.write(f'Installed Wind Offshore Reference:           {(reference.power.wind_offshore / 1_000_000_000):.2f} GW -> {(params.power_target_windoff / 1_000_000_000):.2f} GW : {result.factor_windoff:.2f}x')
+        st.write(f'Possible Wind Offshore Output Reference:           {(result.possible_output_windoff / 1_000_000_000_000):.0f} TWh -> {(result.possible_output_windoff / 1_000_000_000_000_000 * result.factor_windoff):.2f} PWh')
+        st.write(f'Installed Wind Onshore Reference:           {(reference.power.wind_onshore / 1_000_000_000):.2f} GW -> {(params.power_target_windon / 1_000_000_000):.2f} GW : {result.factor_windon:.2f}x')
+        st.write(f'Possible Wind Onshore Output Reference:           {(result.possible_output_windon / 1_000_000_000_000):.0f} TWh -> {(result.possible_output_windon / 1_000_000_000_000_000 * result.factor_windon):.2f} PWh')
+        st.write(f'Ratio PV:            {(result.ratio_pv * 100):5.2f}%')
+        st.write(f'Ratio Wind Offshore: {(result.ratio_windoff * 100):5.2f}%')
+        st.write(f'Ratio Wind Onshore:  {(result.ratio_windon * 100):5.2f}%')
         st.divider()
 
         st.subheader('Value prompt')
@@ -145,52 +131,40 @@ class Prototype_v0_1:
                 selected_data = data.smard.get_month(selected_year, selected_month)
             elif category == 'Day':
                 selected_data = data.smard.get_day(selected_year, selected_month, selected_day)
-            st.write(f'{value_field} {category} {selected_year}: {sum(getattr(d.production, value_field) for d in selected_data) / 1_000_000_000_000:.2f} TWh')
+            st.write(f'{value_field} {category} {selected_year}: {selected_data.get_column(f"production.{value_field}").sum() / 1_000_000_000_000:.2f} TWh')
 
-        # ---------------
-        # ! Compute 2030 production
-        # ---------------
+        data_reference_year: DataView = data.smard.get_year(params.reference_year)
 
-        production_pv_2030 = [d.production.pv * pv_factor for d in data_reference_year]
-        production_wind_offshore_2030 = [d.production.wind_offshore * wind_offshore_factor for d in data_reference_year]
-        production_wind_onshore_2030 = [d.production.wind_onshore * wind_onshore_factor for d in data_reference_year]
-        production_biomass_2030 = [d.production.biomass * biomass_factor for d in data_reference_year]
-        production_hydro_2030 = [d.production.hydro * hydro_factor for d in data_reference_year]
-        production_base_load_2030 = [70 * 1_000_000_000_000 / data_reference_year.size for d in data_reference_year]
-
-        production_renewables_2030 = [
-            production_pv_2030[i] +
-            production_wind_offshore_2030[i] +
-            production_wind_onshore_2030[i] +
-            production_biomass_2030[i] +
-            production_hydro_2030[i]
-            for i in range(len(data_reference_year))
-        ]
-
-        sum_pv_reference = sum([d.production.pv for d in data_reference_year]) / 1_000_000_000_000
-        sum_pv_2030 = sum(production_pv_2030) / 1_000_000_000_000
+        data_2030 = result.consumption
+
+        production_pv_2030 = result.production_pv
+        production_wind_offshore_2030 = result.production_windoff
+        production_wind_onshore_2030 = result.production_windon
+        production_biomass_2030 = result.production_biomass
+        production_hydro_2030 = result.production_hydro
+        production_base_load_2030 = result.production_base_load
+
+        production_renewables_2030 = result.production_renewables
+
+        sum_pv_reference = data_reference_year.get_column('production.pv').sum() / 1_000_000_000_000
+        sum_pv_2030 = production_pv_2030.sum() / 1_000_000_000_000
 
         with st.echo():
             sum_pv_reference
             sum_pv_2030
 
         st.dataframe({
-            f'Load {st.session_state.reference_year}': [d.consumption.load for d in data_reference_year],
+            f'Load {params.reference_year}': data_reference_year.get_column('consumption.load'),
             'Load 2030': data_2030,
-            f'PV {st.session_state.reference_year}': [d.production.pv for d in data_reference_year],
-            'PV 2030': [d.production.pv * ratio_pv_reference for d in data_reference_year],
-            f'Wind Offshore {st.session_state.reference_year}': [d.production.wind_offshore for d in data_reference_year],
-            'Wind Offshore 2030': [d.production.wind_offshore * ratio_wind_offshore_reference for d in data_reference_year],
-            f'Wind Onshore {st.session_state.reference_year}': [d.production.wind_onshore for d in data_reference_year],
-            'Wind Onshore 2030': [d.production.wind_onshore * ratio_wind_onshore_reference for d in data_reference_year],
+            f'PV {params.reference_year}': data_reference_year.get_column('production.pv'),
+            'PV 2030': data_reference_year.get_column('production.pv') * result.ratio_pv,
+            f'Wind Offshore {params.reference_year}': data_reference_year.get_column('production.wind_offshore'),
+            'Wind Offshore 2030': data_reference_year.get_column('production.wind_offshore') * result.ratio_windoff,
+            f'Wind Onshore {params.reference_year}': data_reference_year.get_column('production.wind_onshore'),
+            'Wind Onshore 2030': data_reference_year.get_column('production.wind_onshore') * result.ratio_windon,
         })
 
-        x_range = pd.date_range(
-            start=dt.datetime(st.session_state.reference_year, 1, 1, 0, 0).strftime("%Y-%m-%d %H:%M"),
-            end=dt.datetime(st.session_state.reference_year, 12, 31, 23, 59).strftime("%Y-%m-%d %H:%M"),
-            freq='15min',
-            tz='Europe/Berlin'
-        )
+        x_range = Engine.get_date_range(params.reference_year)
 
         plot_data_0 = pd.DataFrame({
             'Date': x_range,
@@ -264,23 +238,12 @@ class Prototype_v0_1:
             use_container_width=True,
         )
 
-        # Count entries with surplus
-        surplus = 0
-        surplus_80 = 0
-        surplus_90 = 0
-
-        for i in range(len(data_2030)):
-            if data_2030[i] * 0.8 <= production_renewables_2030[i]:
-                surplus_80 += 1
+        surplus = result.surplus
+        surplus_80 = result.surplus_80
+        surplus_90 = result.surplus_90
 
-            if data_2030[i] * 0.9 <= production_renewables_2030[i]:
-                surplus_90 += 1
-
-            if data_2030[i] <= production_renewables_2030[i]:
-                surplus += 1
-
-        total_consumption_2030 = sum(data_2030)
-        total_production_renewables_2030 = sum(production_renewables_2030)
+        total_consumption_2030 = result.total_consumption
+        total_production_renewables_2030 = result.total_production_renewables
 
         st.write(f'Total consumption 2030: {total_consumption_2030 / 1_000_000_000_000} TWh')
         st.write(f'Total production 2030: {total_production_renewables_2030 / 1_000_000_000_000} TWh')
@@ -299,36 +262,8 @@ class Prototype_v0_1:
         st.write(f'Surplus: {surplus} / {len(data_2030)} -> {surplus / len(data_2030) * 100:.2f}%')
 
 
-        # Count intervals with n percent coverage
-        _gcp: int = 0
-
-        for i in range(len(production_renewables_2030)):
-            p: float = production_renewables_2030[i] + production_base_load_2030[i]
-            c: float = data_2030[i]
-            try:
-                r: int   = round((p / c) * 100)
-            except ZeroDivisionError:
-                r: int   = 0
-                # Convert beginning of selected year to datetime
-                ts = dt.datetime(st.session_state.reference_year, 1, 1, 0, 0).timestamp()
-                ts += i * 15 * 60
-                print(f'ZeroDivisionError at {ts}, {p}, {c}, {r}')
-
-            _gcp = r if r >= _gcp else _gcp
-
-        # Array storing distribution
-        _gcp_dist = np.zeros(_gcp + 1, dtype=int)
-
-        for i in range(len(production_renewables_2030)):
-            p: float = production_renewables_2030[i] + production_base_load_2030[i]
-            c: float = data_2030[i]
-            try:
-                r: int   = round((p / c) * 100)
-            except ZeroDivisionError:
-                r: int   = 0
-                print(f'ZeroDivisionError at {i}, {p}, {c}, {r}')
-
-            _gcp_dist[r] += 1
+        _gcp: int = result.gcp
+        _gcp_dist = result.gcp_dist
 
         # Parse to pd.DataFrame
         _gcp_dist_df = pd.DataFrame({
@@ -361,14 +296,7 @@ class Prototype_v0_1:
         st.write(f'GCP: {_gcp}')
         st.write(f'Count: {_gcp_dist[_gcp]}')
 
-        net_balance = np.zeros(len(data_2030))
-
-        for i in range(len(net_balance)):
-            p: float = production_renewables_2030[i] + production_base_load_2030[i]
-            c: float = data_2030[i]
-            d: float = p - c
-
-            net_balance[i] = d
+        net_balance = result.net_balance
 
         cummulative_net_balance = np.copy(net_balance)
 
@@ -0,0 +1,234 @@
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
+
+from data_manager.data_manager import Collections
+
+from .engine import Engine, MagicStorage, ScenarioParameters, StorageBatchDispatch
+
+
+@dataclass(frozen=True)
+class BatchParameters:
+    """
+    The parameters of a Prototype v0.2 scenario for several reference years.
+
+    Attributes:
+    -----------
+    scenario (ScenarioParameters) : The parameters of the scenario. The reference year is ignored.
+    years (tuple[int, ...]) : The reference years. Empty for all years with complete data.
+    """
+    scenario: ScenarioParameters
+    years: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """
+    The result of a Prototype v0.2 scenario for several reference years at once.
+    Every array has one entry, or one row, per reference year. All energies are in Wh.
+
+    Attributes:
+    -----------
+    params (BatchParameters) : The parameters.
+    years (NDArray) : The reference years.
+    success (NDArray) : Whether a gas base load was found that satisfies the storage.
+    iterations (NDArray) : The number of storage years the solver evaluated.
+    gas_factor (NDArray) : The gas scale factor found by the solver.
+    residual (NDArray) : The margin of the tightest success criterion.
+    lowest_point (NDArray) : The lowest energy in the storage in Wh.
+    storage_balance (NDArray) : The hydrogen in the storage after each step in kg.
+    total_production (NDArray) : The renewable production of the target year.
+    total_consumption (NDArray) : The consumption of the target year.
+    total_gas (NDArray) : The required gas base load coverage.
+    longest_deficit (NDArray) : The longest stretch in which renewables don't cover the consumption in hours.
+    """
+    params: BatchParameters
+    years: NDArray
+    success: NDArray
+    iterations: NDArray
+    gas_factor: NDArray
+    residual: NDArray
+    lowest_point: NDArray
+    storage_balance: NDArray
+    total_production: NDArray
+    total_consumption: NDArray
+    total_gas: NDArray
+    longest_deficit: NDArray
+
+    def get_kpis(self) -> pd.DataFrame:
+        """
+        Returns the key figures per reference year, with the same names as ScenarioResult.get_kpis().
+
+        Returns:
+            pd.DataFrame: One row per reference year.
+        """
+        storage_balance = self.storage_balance.astype(int)
+        differences = np.diff(storage_balance, axis=1)
+
+        return pd.DataFrame({
+            'reference_year':          self.years,
+            'success':                 self.success,
+            'iterations':              self.iterations,
+            'gas_factor':              self.gas_factor,
+            'required_base_load':      self.total_gas,
+            'remaining_storage':       storage_balance[:, -1] * MagicStorage.H_TO_W,
+            'lowest_point':            self.lowest_point,
+            'residual':                self.residual,
+            'largest_charge_power':    differences.max(axis=1) * MagicStorage.W_TO_H * 4,
+            'largest_discharge_power': differences.min(axis=1) * MagicStorage.H_TO_W * 4,
+            'total_hydrogen_required': np.trapz(storage_balance, axis=1),
+            'renewable_share':         self.total_production / self.total_consumption,
+            'longest_deficit':         self.longest_deficit,
+        })
+
+    def get_worst_year(self) -> int:
+        """
+        Returns the reference year that needs the most gas. Years without a solution are the worst.
+
+        Returns:
+            int: The reference year.
+        """
+        required = np.where(self.success, self.total_gas, np.inf)
+
+        return int(self.years[np.argmax(required)])
+
+
+class Batch:
+    """
+    Runs a Prototype v0.2 scenario for every reference year at once.
+
+    The scenarios of all years are stacked into one (years x quarter hours) array,
+    and the BaseLoadSolver bisection runs on all rows together with MagicStorage.dispatch_batch(),
+    so all years cost about as much as the slowest single year.
+    """
+    @staticmethod
+    def get_reference_years(data: Collections) -> list[int]:
+        """
+        Returns the reference years with a complete year of data.
+
+        Args:
+            data (Collections): The base dataset.
+
+        Returns:
+            list[int]: The years.
+        """
+        size = Engine.get_date_range().size
+        first = pd.Timestamp(int(data.smard.timestamps.min()), unit='s', tz='Europe/Berlin').year
+        last = pd.Timestamp(int(data.smard.timestamps.max()), unit='s', tz='Europe/Berlin').year
+
+        return [year for year in range(first, last + 1) if data.smard.get_year(year).size >= size]
+
+    @staticmethod
+    def run(data: Collections, params: BatchParameters, progress: Callable[[str], None] | None = None) -> BatchResult:
+        """
+        Runs the scenario for the given reference years.
+        The solver always uses bisection, since stepping all years by 1 % would take as long as the slowest year.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (BatchParameters): The parameters.
+            progress (Callable[[str], None], optional): Called with the current step, like in Engine.run().
+
+        Returns:
+            BatchResult: The result.
+        """
+        if progress is not None:
+            progress('copying')
+
+        years = list(params.years) or Batch.get_reference_years(data)
+        scenario_params = params.scenario
+
+        scenarios = [Engine.create_scenario(data, replace(scenario_params, reference_year=year)) for year in years]
+
+        production = np.stack([scenario.get_total('production') for scenario in scenarios])
+        consumption = np.stack([scenario.get_column('consumption.load') for scenario in scenarios])
+        production_gas = np.stack([Engine.get_production_gas(scenario, scenario_params.base_load_profile) for scenario in scenarios])
+
+        max_iterations = 200
+        count = len(years)
+
+        def evaluate(factor: NDArray) -> tuple[StorageBatchDispatch, NDArray]:
+            # Like BaseLoadSolver.evaluate() for every row
+            net_balance = (production + production_gas * factor[:, np.newaxis] - consumption).astype(int)
+            dispatch = MagicStorage.dispatch_batch(net_balance, initial_energy=scenario_params.initial_balance)
+
+            remaining_storage = np.trunc(dispatch.final) * MagicStorage.H_TO_W
+            lowest_point = dispatch.minimum * MagicStorage.H_TO_W
+
+            residual = np.minimum(remaining_storage - scenario_params.get_target_balance(), lowest_point - scenario_params.reserve_balance)
+            residual = np.where(dispatch.is_empty(), -np.inf, residual)
+
+            return dispatch, residual
+
+        def report(iterations: int) -> None:
+            if progress is not None:
+                progress(f'iterating {iterations}/{max_iterations}')
+
+        # Bracket the factor of every year: low always fails, high always succeeds
+        iterations = np.ones(count, dtype=int)
+        report(1)
+        _, residual = evaluate(np.ones(count))
+
+        success = residual > 0
+        low = np.where(success, 0.0, 1.0)
+        high = np.where(success, 1.0, 2.0)
+
+        bracketing = ~success
+
+        while bracketing.any() and iterations.max() < max_iterations:
+            iterations[bracketing] += 1
+            report(int(iterations.max()))
+            _, residual = evaluate(high)
+
+            succeeded = bracketing & (residual > 0)
+            failed = bracketing & ~succeeded
+
+            low, high = np.where(failed, high, low), np.where(failed, high * 2, high)
+            bracketing = failed
+
+        success = ~bracketing
+
+        # Halve the brackets until they are narrow enough
+        converging = success & ((high - low) > scenario_params.solver_tolerance * high)
+
+        while converging.any() and iterations.max() < max_iterations:
+            iterations[converging] += 1
+            report(int(iterations.max()))
+
+            middle = (low + high) / 2
+            _, residual = evaluate(np.where(converging, middle, high))
+
+            succeeded = converging & (residual > 0)
+            failed = converging & ~succeeded
+
+            high = np.where(succeeded, middle, high)
+            low = np.where(failed, middle, low)
+
+            converging = success & ((high - low) > scenario_params.solver_tolerance * high)
+
+        # The storage of the smallest successful factor of every year
+        dispatch, residual = evaluate(high)
+
+        # The longest stretch of quarter hours in which renewables don't cover the consumption
+        deficit = production < consumption
+        steps = np.arange(deficit.shape[1])
+        last_covered = np.maximum.accumulate(np.where(deficit, -1, steps), axis=1)
+        longest_deficit = (steps - last_covered).max(axis=1) / 4
+
+        return BatchResult(
+            params=params,
+            years=np.asarray(years),
+            success=success,
+            iterations=iterations,
+            gas_factor=high,
+            residual=residual,
+            lowest_point=dispatch.minimum * MagicStorage.H_TO_W,
+            storage_balance=dispatch.trajectory,
+            total_production=production.sum(axis=1),
+            total_consumption=consumption.sum(axis=1),
+            total_gas=production_gas.sum(axis=1) * high,
+            longest_deficit=longest_deficit,
+        )
@@ -0,0 +1,707 @@
+import datetime as dt
+from dataclasses import dataclass, replace
+from threading import Event, Thread
+from pytz import timezone
+from typing import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
+
+from dtypes import Unit
+
+from data_manager.data_manager import COLUMNS, Collections, Data, DataView, Projection, ScenarioOverlay
+
+from .profiles import BASE_LOAD_PROFILES, CalendarIndex
+from .storage import StorageMix, StorageMixDispatch
+
+
+@dataclass(frozen=True)
+class ScenarioParameters:
+    """
+    The parameters of a Prototype v0.2 scenario.
+
+    Attributes:
+    -----------
+    reference_year (int) : The year whose weather and load profile is mapped onto the target year.
+    load (float) : The total consumption of the target year in TWh.
+    power_target_pv (float) : The installed PV power in W.
+    power_target_windoff (float) : The installed offshore wind power in W.
+    power_target_windon (float) : The installed onshore wind power in W.
+    power_target_biomass (float) : The installed biomass power in W.
+    power_target_hydro (float) : The installed hydro power in W.
+    initial_balance (float) : The energy in the storage at the start in Wh.
+    reserve_balance (float) : The energy the storage must never fall below in Wh.
+    target_balance (float | None) : The energy the storage must end above in Wh. None for the initial balance.
+    base_load_profile (str) : The name of the BASE_LOAD_PROFILES that shapes the gas base load over the year.
+    solver (str) : The method of the BaseLoadSolver, i.e. 'bisection' or 'stepwise'.
+    solver_tolerance (float) : The relative tolerance of the BaseLoadSolver.
+    storages (tuple[str, ...]) : The names of the STORAGE_TECHNOLOGIES to dispatch, e.g. to compare storage mixes.
+    """
+    reference_year: int
+    load: float
+    power_target_pv: float       = Unit.GW(215)
+    power_target_windoff: float  = Unit.GW(30)
+    power_target_windon: float   = Unit.GW(115)
+    power_target_biomass: float  = Unit.MW(8_332)
+    power_target_hydro: float    = Unit.MW(4_253)
+    initial_balance: float       = Unit.TWh(10)
+    reserve_balance: float       = Unit.TWh(1)
+    target_balance: float | None = None
+    base_load_profile: str       = 'Winter/Sommer'
+    solver: str                  = 'bisection'
+    solver_tolerance: float      = 1e-4
+    storages: tuple[str, ...]    = ()
+
+    def get_target_balance(self) -> float:
+        return self.initial_balance if self.target_balance is None else self.target_balance
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """
+    The result of a Prototype v0.2 scenario. All energies are in Wh.
+
+    Attributes:
+    -----------
+    params (ScenarioParameters) : The parameters of the scenario.
+    success (bool) : Whether a gas base load was found that satisfies the storage.
+    iterations (int) : The number of storage years the solver evaluated.
+    gas_factor (float) : The gas scale factor found by the solver.
+    residual (float) : The margin of the tightest success criterion in Wh.
+    scenario (ScenarioOverlay) : The scenario of the target year including the gas base load.
+    storage_balance (NDArray) : The hydrogen in the storage after each step in kg.
+    total_production (float) : The renewable production of the target year.
+    total_consumption (float) : The consumption of the target year.
+    deficit (float) : The difference between consumption and renewable production.
+    total_gas (float) : The required gas base load coverage.
+    remaining_storage (float) : The energy in the storage at the end of the year.
+    lowest_point (float) : The lowest energy in the storage.
+    largest_charge (float) : The largest charge within one quarter hour.
+    largest_discharge (float) : The largest discharge within one quarter hour. Negative.
+    total_hydrogen_required (float) : The integral of the storage balance in kg.
+    storage_mix (StorageMixDispatch | None) : The dispatch of the selected storage technologies. None if none were selected.
+    """
+    params: ScenarioParameters
+    success: bool
+    iterations: int
+    gas_factor: float
+    residual: float
+    scenario: ScenarioOverlay
+    storage_balance: NDArray
+    total_production: float
+    total_consumption: float
+    deficit: float
+    total_gas: float
+    remaining_storage: float
+    lowest_point: float
+    largest_charge: float
+    largest_discharge: float
+    total_hydrogen_required: float
+    storage_mix: StorageMixDispatch | None = None
+
+    @property
+    def largest_charge_power(self) -> float:
+        return self.largest_charge * 4
+
+    @property
+    def largest_discharge_power(self) -> float:
+        return self.largest_discharge * 4
+
+    def get_kpis(self) -> dict[str, float]:
+        """
+        Returns the scalar key figures of the result, e.g. for a results table.
+
+        Returns:
+            dict[str, float]: The key figures.
+        """
+        kpis = {
+            'success':                 self.success,
+            'iterations':              self.iterations,
+            'gas_factor':              self.gas_factor,
+            'required_base_load':      self.total_gas,
+            'remaining_storage':       self.remaining_storage,
+            'lowest_point':            self.lowest_point,
+            'largest_charge_power':    self.largest_charge_power,
+            'largest_discharge_power': self.largest_discharge_power,
+            'total_hydrogen_required': self.total_hydrogen_required,
+        }
+
+        if self.storage_mix is not None:
+            kpis.update(self.storage_mix.get_kpis())
+
+        return kpis
+
+
+class Engine:
+    """
+    The headless simulation of Prototype v0.2.
+    It only reads the base dataset and never depends on Streamlit, so it can run in batch and in worker processes.
+    """
+    TARGET_YEAR: int = 2030
+
+    @staticmethod
+    def get_date_range() -> pd.DatetimeIndex:
+        return pd.date_range(
+            start=dt.datetime(Engine.TARGET_YEAR, 1, 1, 0, 0),
+            end=dt.datetime(Engine.TARGET_YEAR, 12, 31, 23, 45),
+            freq='15min',
+            tz='Europe/Berlin'
+        )
+
+    @staticmethod
+    def create_scenario(data: Collections, params: ScenarioParameters) -> ScenarioOverlay:
+        """
+        Creates the target year as an overlay over the reference year, which is mapped onto the target year by wall-clock time.
+        Leap days and daylight saving time changes are aligned by the cached Projection of the reference year.
+        Renewable production is scaled to the target power and the load to the target consumption.
+        Columns that are not listed are zero, the installed power is carried over.
+
+        Args:
+            data (Collections): The base dataset.
+            params (ScenarioParameters): The parameters.
+
+        Returns:
+            ScenarioOverlay: The target year without gas.
+        """
+        # Get power data of reference year
+        _d: Data = data.smard.get_last_of_year(params.reference_year)
+
+        _data_year: DataView = data.smard.get_year(params.reference_year)
+        load_current: float  = _data_year.get_column('consumption.load').sum()
+
+        # Calculate power factors
+        power_factor_pv      = params.power_target_pv      / _d.power.pv
+        power_factor_windoff = params.power_target_windoff / _d.power.wind_offshore
+        power_factor_windon  = params.power_target_windon  / _d.power.wind_onshore
+        power_factor_biomass = params.power_target_biomass / _d.power.biomass
+        power_factor_hydro   = params.power_target_hydro   / _d.power.hydro
+
+        load_factor          = Unit.TWh(params.load)       / load_current
+
+        projection = Projection.create(_data_year.timestamps, Engine.TARGET_YEAR, 'Europe/Berlin')
+
+        return ScenarioOverlay(
+            base=_data_year,
+            timestamps=projection.timestamps,
+            tz=timezone('Europe/Berlin'),
+            scales={
+                **{name: 1.0 for name in COLUMNS if name.startswith('power.')},
+                'production.pv':            power_factor_pv,
+                'production.wind_offshore': power_factor_windoff,
+                'production.wind_onshore':  power_factor_windon,
+                'production.biomass':       power_factor_biomass,
+                'production.hydro':         power_factor_hydro,
+                'power.pv':                 0.0,
+                'power.wind_offshore':      0.0,
+                'power.wind_onshore':       0.0,
+                'power.biomass':            0.0,
+                'power.hydro':              0.0,
+                'consumption.load':         load_factor,
+            },
+            additions={
+                'power.pv':            power_factor_pv,
+                'power.wind_offshore': power_factor_windoff,
+                'power.wind_onshore':  power_factor_windon,
+                'power.biomass':       power_factor_biomass,
+                'power.hydro':         power_factor_hydro,
+            },
+            default_scale=0.0,
+            index=projection.index,
+        )
+
+    @staticmethod
+    def get_production_gas(scenario: ScenarioOverlay, profile: str = 'Winter/Sommer') -> NDArray:
+        """
+        Returns the gas base load at factor 1, i.e. the yearly deficit spread over the year with a seasonal profile.
+        The profile is normalized, so the yearly total is the deficit for every profile.
+
+        Args:
+            scenario (ScenarioOverlay): The scenario without gas.
+            profile (str, optional): The name of the BASE_LOAD_PROFILES. Defaults to 'Winter/Sommer'.
+
+        Returns:
+            NDArray: The gas base load per step in Wh.
+
+        Raises:
+            KeyError: If the profile does not exist.
+        """
+        total_production = scenario.get_total('production').sum()
+        total_consumption = scenario.get_column('consumption.load').sum()
+        deficit = abs(total_consumption - total_production)
+
+        index = CalendarIndex.create(scenario.timestamps, 'Europe/Berlin')
+
+        return (deficit / scenario.size) * BASE_LOAD_PROFILES[profile].get_factors(index)
+
+    @staticmethod
+    def run(data: Collections, params: ScenarioParameters, progress: Callable[[str], None] | None = None) -> ScenarioResult:
+        """
+        Runs the scenario.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (ScenarioParameters): The parameters.
+            progress (Callable[[str], None], optional): Called with the current step, i.e. 'copying' and 'iterating n/max'.
+                                                        It may raise to abort the run.
+
+        Returns:
+            ScenarioResult: The result.
+        """
+        if progress is not None:
+            progress('copying')
+
+        scenario = Engine.create_scenario(data, params)
+
+        # ----------------------------------------
+        # Calculate the deficit
+        # ----------------------------------------
+        total_production = scenario.get_total('production').sum()
+        total_consumption = scenario.get_column('consumption.load').sum()
+        deficit = abs(total_consumption - total_production)
+
+        production_gas = Engine.get_production_gas(scenario, params.base_load_profile)
+
+        # ----------------------------------------
+        # Find the gas base load
+        # ----------------------------------------
+        solver = BaseLoadSolver(
+            scenario=scenario,
+            production_gas=production_gas,
+            initial_balance=params.initial_balance,
+            reserve_balance=params.reserve_balance,
+            target_balance=params.get_target_balance(),
+            method=params.solver,
+            tolerance=params.solver_tolerance,
+            progress=progress,
+        )
+
+        solution = solver.solve()
+
+        scenario = scenario.with_addition('production.gas', production_gas * solution.factor)
+
+        # ----------------------------------------
+        # Calculate the key figures
+        # ----------------------------------------
+        storage_balance: NDArray = solution.dispatch.trajectory.astype(int)
+
+        differences = np.diff(storage_balance)
+
+        # ----------------------------------------
+        # Dispatch the selected storage technologies
+        # ----------------------------------------
+        storage_mix = None
+
+        if params.storages:
+            # The same net balance the hydrogen storage sees, including the gas base load
+            net_balance = scenario.get_total('production') - scenario.get_column('consumption.load')
+            storage_mix = StorageMix.create(params.storages).dispatch(net_balance)
+
+        return ScenarioResult(
+            params=params,
+            success=solution.success,
+            iterations=solution.iterations,
+            gas_factor=solution.factor,
+            residual=solution.residual,
+            scenario=scenario,
+            storage_balance=storage_balance,
+            total_production=total_production,
+            total_consumption=total_consumption,
+            deficit=deficit,
+            total_gas=scenario.get_column('production.gas').sum(),
+            remaining_storage=storage_balance[-1] * MagicStorage.H_TO_W,
+            lowest_point=solution.dispatch.minimum * MagicStorage.H_TO_W,
+            largest_charge=np.max(differences) * MagicStorage.W_TO_H,
+            largest_discharge=np.min(differences) * MagicStorage.H_TO_W,
+            total_hydrogen_required=np.trapz(storage_balance),
+            storage_mix=storage_mix,
+        )
+
+
+class MagicStorage:
+    energy: float = 0.0
+    hydrogen: float = 0.0
+    thread = None
+
+    W_TO_H = 39_000
+    H_TO_W = 33_000
+
+    STORAGE_CAP: int = Unit.kt(400)
+
+    def __init__(self, initial_energy: float = 0.0):
+        # self.energy = initial_energy
+        self.charge(initial_energy)
+
+    def start_electrolysis(self):
+        self.thread = self.Electrolysis(self)
+        self.thread.start()
+
+        # print(f'Converting initial energy of {self.energy} W.')
+        # print(f'We have {self.hydrogen} kg of hydrogen now and {self.energy} W left.')
+        # print(f'Start simulation.')
+
+    class Electrolysis(Thread):
+
+        def __init__(self, storage):
+            self.storage = storage
+
+            name = 'Electrolysis'
+
+            super().__init__(name=name, daemon=True)
+            self._stop_event = Event()
+
+        def run(self):
+            print(f"{self.name} is powering up...")
+
+            while not self._stop_event.is_set():
+                # print(f'Storage Energy: {self.storage.energy} W - Hydrogen: {self.storage.hydrogen}')
+                if self.storage.energy >= self.storage.W_TO_H:
+
+                    # Convert all possible energy into hydrogen
+                    # and put it into the storage
+                    possible = self.storage.energy / self.storage.W_TO_H
+                    self.storage.energy -= possible * self.storage.W_TO_H
+                    self.storage.hydrogen += possible
+
+
+                    # self.storage.energy -= self.storage.W_TO_H * 1_000
+                    # self.storage.hydrogen += 1_000
+
+            print(f"{self.name} is stopped.")
+
+        def stop(self):
+            print(f"{self.name} is stopping...")
+            self._stop_event.set()
+
+
+    def stop_electrolysis(self):
+        self.thread.stop()
+        self.thread.join()
+
+    def charge(self, energy: float):
+        hydrogen = energy / self.W_TO_H
+
+        self.hydrogen += hydrogen
+
+        self.hydrogen = min(self.hydrogen, self.STORAGE_CAP)
+
+    # def _electrolysis(self):
+    #     # Wait until 39_000 of energy is available
+    #     # and turn this into 1 kilogram of hydrogen
+    #     print('Electrolysis started.')
+    #     while True:
+    #         if self.energy > self.W_TO_H:
+    #             self.energy -= self.W_TO_H
+    #             self.hydrogen += 1
+
+    def discharge(self, energy: float) -> float:
+
+        required_hydrogen = energy / self.H_TO_W
+        # print(f'Discharging... {round(energy / 1_000_000_000, 2)} GW - Requiring {round(required_hydrogen / 1_000_000, 2)} kt of hydrogen.')
+
+        # Debug from J. Erdmann
+        if required_hydrogen > self.hydrogen:
+            raise StorageEmptyException()
+        else:
+            # print(f'Storage now has {round(self.hydrogen / 1_000_000, 2)} kt of hydrogen.')
+            return self.combust(required_hydrogen)
+
+    def combust(self, hydrogen: float) -> float:
+        self.hydrogen -= hydrogen
+        return hydrogen * self.H_TO_W
+
+    @classmethod
+    def dispatch(cls, net_balance: NDArray, initial_energy: float = 0.0) -> 'StorageDispatch':
+        """
+        Charges and discharges the storage for a whole net balance series at once.
+        This is the vectorized equivalent of calling charge() for every surplus
+        and discharge() for every deficit until the storage is empty.
+
+        The state of charge is a cumulative sum of the hydrogen deltas that saturates at STORAGE_CAP:
+        x_t = S_t + min(x_0, STORAGE_CAP - max(S_1, ..., S_t))
+
+        Args:
+            net_balance (NDArray): The energy surplus (> 0) or deficit (< 0) per step in Wh.
+            initial_energy (float, optional): The energy charged before the first step. Defaults to 0.0.
+
+        Returns:
+            StorageDispatch: The storage trajectory and its key figures.
+        """
+        batch = cls.dispatch_batch(np.asarray(net_balance, dtype=np.float64)[np.newaxis], initial_energy)
+
+        return StorageDispatch(
+            trajectory=batch.trajectory[0],
+            first_empty=int(batch.first_empty[0]),
+            minimum=float(batch.minimum[0]),
+            final=float(batch.final[0]),
+        )
+
+    @classmethod
+    def dispatch_batch(cls, net_balance: NDArray, initial_energy: float = 0.0) -> 'StorageBatchDispatch':
+        """
+        Charges and discharges one storage per row of a 2D net balance, e.g. one per reference year, at once.
+        Every row behaves exactly like dispatch().
+
+        Args:
+            net_balance (NDArray): The energy surplus (> 0) or deficit (< 0) per row and step in Wh.
+            initial_energy (float, optional): The energy charged before the first step. Defaults to 0.0.
+
+        Returns:
+            StorageBatchDispatch: The storage trajectories and their key figures.
+        """
+        net_balance = np.atleast_2d(np.asarray(net_balance, dtype=np.float64))
+        rows, steps = net_balance.shape
+
+        initial_hydrogen = min(initial_energy / cls.W_TO_H, cls.STORAGE_CAP)
+
+        # Charging and discharging convert with different factors
+        hydrogen_delta = np.where(net_balance > 0, net_balance / cls.W_TO_H, net_balance / cls.H_TO_W)
+
+        cumulative_delta = np.cumsum(hydrogen_delta, axis=1)
+        headroom = cls.STORAGE_CAP - np.maximum.accumulate(cumulative_delta, axis=1)
+
+        trajectory = cumulative_delta + np.minimum(initial_hydrogen, headroom)
+
+        # The storage can't deliver more than it holds, so it is empty from the first negative state on
+        is_empty = trajectory < 0
+        any_empty = is_empty.any(axis=1)
+        first_empty = np.where(any_empty, np.argmax(is_empty, axis=1), -1)
+
+        after_empty = any_empty[:, np.newaxis] & (np.arange(steps)[np.newaxis, :] >= first_empty[:, np.newaxis])
+        trajectory[after_empty] = 0.0
+
+        # Rows that are empty from the first step on keep the initial level as their minimum
+        minimum = np.where(after_empty, np.inf, trajectory).min(axis=1, initial=np.inf)
+        minimum = np.where(np.isfinite(minimum), minimum, initial_hydrogen)
+
+        final = trajectory[:, -1] if steps > 0 else np.full(rows, initial_hydrogen)
+
+        return StorageBatchDispatch(
+            trajectory=trajectory,
+            first_empty=first_empty,
+            minimum=minimum,
+            final=final,
+        )
+
+
+@dataclass(frozen=True)
+class StorageDispatch:
+    """
+    The result of MagicStorage.dispatch(). All values are in kg of hydrogen.
+
+    Attributes:
+    -----------
+    trajectory (NDArray) : The hydrogen in the storage after each step. Zero from first_empty on.
+    first_empty (int) : The index of the first step the storage could not cover, or -1.
+    minimum (float) : The lowest hydrogen level before the storage ran empty.
+    final (float) : The hydrogen level after the last step.
+    """
+    trajectory: NDArray
+    first_empty: int
+    minimum: float
+    final: float
+
+    def is_empty(self) -> bool:
+        return self.first_empty != -1
+
+
+@dataclass(frozen=True)
+class StorageBatchDispatch:
+    """
+    The result of MagicStorage.dispatch_batch(). All values are in kg of hydrogen and have one entry per row.
+
+    Attributes:
+    -----------
+    trajectory (NDArray) : The hydrogen in the storage after each step. Zero from first_empty on.
+    first_empty (NDArray) : The index of the first step the storage could not cover, or -1.
+    minimum (NDArray) : The lowest hydrogen level before the storage ran empty.
+    final (NDArray) : The hydrogen level after the last step.
+    """
+    trajectory: NDArray
+    first_empty: NDArray
+    minimum: NDArray
+    final: NDArray
+
+    def is_empty(self) -> NDArray:
+        return self.first_empty != -1
+
+
+@dataclass(frozen=True)
+class BaseLoadSolution:
+    """
+    The result of BaseLoadSolver.solve().
+
+    Attributes:
+    -----------
+    factor (float) : The gas scale factor found.
+    iterations (int) : The number of storage years that were evaluated.
+    residual (float) : The margin of the tightest success criterion at the factor in Wh. Negative if not successful.
+    success (bool) : Whether the factor satisfies all success criteria.
+    dispatch (StorageDispatch) : The storage dispatch at the factor.
+    """
+    factor: float
+    iterations: int
+    residual: float
+    success: bool
+    dispatch: StorageDispatch
+
+
+@dataclass
+class BaseLoadSolver:
+    """
+    Finds the smallest scale factor of the gas base load for which the storage
+    never runs empty, ends above the initial balance and never falls below the reserve.
+
+    More gas only ever adds energy to the storage, so success is monotone in the factor.
+    The 'bisection' method brackets the factor and halves the bracket until its relative width is below the tolerance.
+    The 'stepwise' method multiplies the factor by 1.01 until it succeeds, like the original simulation.
+
+    Attributes:
+    -----------
+    scenario (ScenarioOverlay) : The scenario without gas.
+    production_gas (NDArray) : The gas base load at factor 1.
+    initial_balance (float) : The energy in the storage at the start in Wh.
+    reserve_balance (float) : The energy the storage must never fall below in Wh.
+    target_balance (float | None) : The energy the storage must end above in Wh. None for the initial balance.
+    method (str) : The method, i.e. 'bisection' or 'stepwise'.
+    tolerance (float) : The relative width of the final bracket.
+    max_iterations (int) : The maximum number of storage years to evaluate.
+    progress (Callable[[str], None] | None) : Called with 'iterating n/max' before every storage year.
+    """
+    scenario: ScenarioOverlay
+    production_gas: NDArray
+    initial_balance: float
+    reserve_balance: float
+    target_balance: float | None = None
+    method: str         = 'bisection'
+    tolerance: float    = 1e-4
+    max_iterations: int = 200
+    progress: Callable[[str], None] | None = None
+
+    def report(self, iterations: int) -> None:
+        if self.progress is not None:
+            self.progress(f'iterating {iterations}/{self.max_iterations}')
+
+    def evaluate(self, factor: float) -> tuple[StorageDispatch, float]:
+        """
+        Runs the storage for one year with the given gas scale factor.
+
+        Args:
+            factor (float): The gas scale factor.
+
+        Returns:
+            tuple[StorageDispatch, float]: The dispatch and the residual in Wh.
+                                           The residual is the margin of the tightest success criterion
+                                           and is negative if any criterion fails.
+        """
+        scenario = self.scenario.with_addition('production.gas', self.production_gas * factor)
+        net_balance = (scenario.get_total('production') - scenario.get_column('consumption.load')).astype(int)
+
+        dispatch = MagicStorage.dispatch(net_balance, initial_energy=self.initial_balance)
+
+        if dispatch.is_empty():
+            return dispatch, -np.inf
+
+        # The storage has to end above the target balance and stay above the reserve
+        remaining_storage = int(dispatch.final) * MagicStorage.H_TO_W
+        lowest_point = dispatch.minimum * MagicStorage.H_TO_W
+
+        # Both criteria are strict, so a residual of 0 fails
+        target_balance = self.initial_balance if self.target_balance is None else self.target_balance
+
+        residual = min(remaining_storage - target_balance, lowest_point - self.reserve_balance)
+
+        return dispatch, residual
+
+    def solve(self) -> BaseLoadSolution:
+        """
+        Finds the gas scale factor with the configured method.
+
+        Returns:
+            BaseLoadSolution: The solution.
+
+        Raises:
+            ValueError: If the method is unknown.
+        """
+        if self.method == 'bisection':
+            return self.solve_bisection()
+        elif self.method == 'stepwise':
+            return self.solve_stepwise()
+
+        raise ValueError(f'Unknown solver method: {self.method}')
+
+    def solve_stepwise(self) -> BaseLoadSolution:
+        """
+        Multiplies the factor by 1.01 until all success criteria are met.
+
+        Returns:
+            BaseLoadSolution: The solution.
+        """
+        factor = 1.0
+        iterations = 0
+
+        while True:
+            iterations += 1
+            self.report(iterations)
+            dispatch, residual = self.evaluate(factor)
+
+            if residual > 0 or iterations >= self.max_iterations:
+                return BaseLoadSolution(factor, iterations, residual, residual > 0, dispatch)
+
+            factor *= 1.01
+
+    def solve_bisection(self) -> BaseLoadSolution:
+        """
+        Brackets the factor by doubling and then bisects the bracket
+        until its relative width is below the tolerance.
+
+        Returns:
+            BaseLoadSolution: The solution with the smallest successful factor found.
+        """
+        iterations = 1
+        self.report(iterations)
+        dispatch, residual = self.evaluate(1.0)
+
+        # Bracket the factor: low always fails, high always succeeds
+        if residual > 0:
+            low, high = 0.0, 1.0
+        else:
+            low, high = 1.0, 2.0
+
+            while iterations < self.max_iterations:
+                iterations += 1
+                self.report(iterations)
+                dispatch, residual = self.evaluate(high)
+
+                if residual > 0:
+                    break
+
+                low, high = high, high * 2
+
+            else:
+                # low is the last factor that was evaluated
+                return BaseLoadSolution(low, iterations, residual, False, dispatch)
+
+        best = BaseLoadSolution(high, iterations, residual, True, dispatch)
+
+        # Halve the bracket until it is narrow enough
+        while (high - low) > self.tolerance * high and iterations < self.max_iterations:
+            iterations += 1
+            self.report(iterations)
+            middle = (low + high) / 2
+            dispatch, residual = self.evaluate(middle)
+
+            if residual > 0:
+                high = middle
+                best = BaseLoadSolution(middle, iterations, residual, True, dispatch)
+            else:
+                low = middle
+
+        return replace(best, iterations=iterations)
+
+
+class StorageEmptyException(Exception):
+    def __init__(self, message: str = 'Storage is empty.', energy: float = 0.0):
+        self.message = message
+        self.energy = energy
+        super().__init__(self.message)
@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from threading import Lock
+from typing import ClassVar
+
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class CalendarIndex:
+    """
+    The calendar fields of every row of a time series, computed once and shared by all profiles.
+    Indices are cached per timestamps and timezone, see create().
+
+    Attributes:
+    -----------
+    month (NDArray) : The month from 0 (January) to 11 (December).
+    hour (NDArray) : The hour of the day from 0 to 23.
+    month_fraction (NDArray) : How far the row is into its month, from 0 to below 1.
+    """
+    month: NDArray
+    hour: NDArray
+    month_fraction: NDArray
+
+    CACHE: ClassVar[dict[tuple, 'CalendarIndex']] = {}
+    LOCK: ClassVar[Lock] = Lock()
+
+    @property
+    def size(self) -> int:
+        return self.month.size
+
+    @staticmethod
+    def create(timestamps: NDArray[np.int64], tz: str = 'Europe/Berlin') -> 'CalendarIndex':
+        """
+        Returns the calendar index of the given timestamps.
+
+        Args:
+            timestamps (NDArray[np.int64]): The unix start timestamps, e.g. of a ScenarioOverlay.
+            tz (str, optional): The timezone of the calendar. Defaults to 'Europe/Berlin'.
+
+        Returns:
+            CalendarIndex: The index. Its arrays are read-only, since they are shared.
+        """
+        key = (timestamps.size, *timestamps[:1].tolist(), *timestamps[-1:].tolist(), tz)
+
+        with CalendarIndex.LOCK:
+            index = CalendarIndex.CACHE.get(key)
+
+        if index is not None:
+            return index
+
+        datetimes = pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(tz)
+
+        month = datetimes.month.to_numpy() - 1
+        day = datetimes.day.to_numpy() - 1
+        hour = datetimes.hour.to_numpy()
+        minute = datetimes.minute.to_numpy()
+
+        days_in_month = datetimes.days_in_month.to_numpy()
+
+        month_fraction = (day * 24 * 60 + hour * 60 + minute) / (days_in_month * 24 * 60)
+
+        for array in (month, hour, month_fraction):
+            array.flags.writeable = False
+
+        index = CalendarIndex(month, hour, month_fraction)
+
+        with CalendarIndex.LOCK:
+            CalendarIndex.CACHE[key] = index
+
+        return index
+
+
+class LoadProfile:
+    """
+    A declarative shape of a load over the year. Subclasses implement get_weights().
+    """
+    def get_weights(self, index: CalendarIndex) -> NDArray:
+        """
+        Returns the relative weight of every row. Only the ratios matter.
+
+        Args:
+            index (CalendarIndex): The calendar of the rows.
+
+        Returns:
+            NDArray: The weight per row. Never negative.
+        """
+        raise NotImplementedError()
+
+    def get_factors(self, index: CalendarIndex) -> NDArray:
+        """
+        Returns the weights normalized to a mean of 1, so a load spread evenly keeps its total when multiplied by them.
+
+        Args:
+            index (CalendarIndex): The calendar of the rows.
+
+        Returns:
+            NDArray: The factor per row.
+
+        Raises:
+            ValueError: If all weights are 0.
+        """
+        weights = np.broadcast_to(np.asarray(self.get_weights(index), dtype=float), (index.size,))
+        mean = weights.mean()
+
+        if mean <= 0:
+            raise ValueError('The profile has no positive weights.')
+
+        return weights / mean
+
+
+@dataclass(frozen=True)
+class FlatProfile(LoadProfile):
+    """
+    The same load in every row.
+    """
+    def get_weights(self, index: CalendarIndex) -> NDArray:
+        return np.ones(index.size)
+
+
+@dataclass(frozen=True)
+class TwoSeasonProfile(LoadProfile):
+    """
+    A winter and a summer level with linear ramps between them.
+
+    Attributes:
+    -----------
+    winter (float) : The weight in winter.
+    summer (float) : The weight in summer.
+    ramp_down_month (int) : The month in which the weight ramps from winter to summer, from 1 to 12.
+    ramp_up_month (int) : The month in which the weight ramps from summer to winter, from 1 to 12.
+    """
+    winter: float           = 1.0
+    summer: float           = 0.5
+    ramp_down_month: int    = 3
+    ramp_up_month: int      = 10
+
+    def get_weights(self, index: CalendarIndex) -> NDArray:
+        month = index.month + 1
+        is_summer = (month > self.ramp_down_month) & (month < self.ramp_up_month)
+
+        weights = np.where(is_summer, self.summer, self.winter)
+        weights = np.where(month == self.ramp_down_month, self.winter + (self.summer - self.winter) * index.month_fraction, weights)
+        weights = np.where(month == self.ramp_up_month, self.summer + (self.winter - self.summer) * index.month_fraction, weights)
+
+        return weights
+
+
+@dataclass(frozen=True)
+class MonthlyProfile(LoadProfile):
+    """
+    A weight per month.
+
+    Attributes:
+    -----------
+    weights (tuple[float, ...]) : The 12 weights from January to December.
+    """
+    weights: tuple[float, ...]
+
+    def get_weights(self, index: CalendarIndex) -> NDArray:
+        if len(self.weights) != 12:
+            raise ValueError(f'A monthly profile needs 12 weights, not {len(self.weights)}.')
+
+        return np.asarray(self.weights, dtype=float)[index.month]
+
+
+@dataclass(frozen=True)
+class HourlyProfile(LoadProfile):
+    """
+    A weight per hour of the day.
+
+    Attributes:
+    -----------
+    weights (tuple[float, ...]) : The 24 weights from 0:00 to 23:00.
+    """
+    weights: tuple[float, ...]
+
+    def get_weights(self, index: CalendarIndex) -> NDArray:
+        if len(self.weights) != 24:
+            raise ValueError(f'An hourly profile needs 24 weights, not {len(self.weights)}.')
+
+        return np.asarray(self.weights, dtype=float)[index.hour]
+
+
+@dataclass(frozen=True)
+class ProductProfile(LoadProfile):
+    """
+    The product of several profiles, e.g. a seasonal shape with a daily shape.
+
+    Attributes:
+    -----------
+    profiles (tuple[LoadProfile, ...]) : The profiles.
+    """
+    profiles: tuple[LoadProfile, ...]
+
+    def get_weights(self, index: CalendarIndex) -> NDArray:
+        weights = np.ones(index.size)
+
+        for profile in self.profiles:
+            weights = weights * profile.get_weights(index)
+
+        return weights
+
+
+# The shapes of the gas base load of the profile selection.
+# 'Winter/Sommer' keeps the shape of the original ramp: a winter level of 1.7 and a summer level of 0.5,
+# ramping down in March and up in October.
+BASE_LOAD_PROFILES: dict[str, LoadProfile] = {
+    'Winter/Sommer': TwoSeasonProfile(winter=1.7, summer=0.5, ramp_down_month=3, ramp_up_month=10),
+    'Konstant': FlatProfile(),
+    'Winter/Sommer, tagsüber halbiert': ProductProfile((
+        TwoSeasonProfile(winter=1.7, summer=0.5, ramp_down_month=3, ramp_up_month=10),
+        HourlyProfile((1.0,) * 9 + (0.5,) * 8 + (1.0,) * 7),
+    )),
+}
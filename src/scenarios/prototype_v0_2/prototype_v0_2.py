@@ -1,9 +1,7 @@
 import calendar
 import os
 import datetime as dt
-from threading import Event, Thread
 from pytz import timezone
-from time import sleep
 
 import numpy as np
 from numpy.typing import NDArray
@@ -11,171 +9,137 @@ import pandas as pd
 import streamlit as st
 import altair as alt
 
-from dtypes import URLImage, Unit, View
+from dtypes import URLImage, View
 
-from data_manager.data_manager import Collections, Collection, Data, DataArray
+from data_manager.data_manager import Collections, DataView
+
+from scenarios.cache import ResultCache
+from scenarios.jobs import Job, JobQueue
+
+from .batch import Batch, BatchParameters, BatchResult
+from .engine import Engine, MagicStorage, ScenarioParameters, ScenarioResult
+from .sizing import StorageSizer
 
 
 class Prototype_v0_2:
-    def __init__(self, view):
+    """
+    Renders Prototype v0.2. The simulation itself runs headless in Engine.
+
+    Attributes:
+    -----------
+    view (Szenarien_View) : The view to render into.
+    params (ScenarioParameters | None) : The parameters. None if they could not be parsed.
+    """
+    def __init__(self, view, params: ScenarioParameters | None = None):
         self.view = view
-        self.params = {}
+        self.params = params
+
+        if self.params is None:
+            self.params = Prototype_v0_2.get_params()
 
+    @staticmethod
+    def get_params() -> ScenarioParameters | None:
+        """
+        Reads the parameters from the session state.
+
+        Returns:
+            ScenarioParameters | None: The parameters or None if they could not be parsed.
+        """
         try:
-            self.params['reference_year'] = st.session_state.reference_year
-            self.params['load'] = st.session_state.total_consumption_2030
+            return ScenarioParameters(
+                reference_year=st.session_state.reference_year,
+                load=st.session_state.total_consumption_2030,
+                base_load_profile=st.session_state.get('base_load_profile', 'Winter/Sommer'),
+                solver=st.session_state.get('solver', 'bisection'),
+                solver_tolerance=st.session_state.get('solver_tolerance', 1e-4),
+                storages=tuple(st.session_state.get('storage_technologies', ())),
+            )
         except:
             st.error('Could not parse parameters.')
-            return
+            return None
 
     def simulate(self):
+        if self.params is None:
+            return
+
         # Get data
         data: Collections = self.view.page.get_data()
+        params = self.params
 
+        # All reference years are simulated at once in batch mode
+        if st.session_state.get('all_reference_years', False):
+            job_params = BatchParameters(params)
+            run = lambda progress: Batch.run(data, job_params, progress)
+            render = self.render_batch
+        else:
+            job_params = params
+            run = lambda progress: Engine.run(data, params, progress)
+            render = self.render
+
+        # The simulation runs in the background and is polled by render_job()
+        queue: JobQueue = self.view.page.get_job_queue()
+        job: Job | None = queue.get(st.session_state.get('prototype_v0_2_job'))
+        job_key = (job_params, data.get_version())
+
+        if job is None or job.key != job_key:
+            # The parameters changed, so the old simulation only occupies a worker
+            if job is not None:
+                queue.cancel(job.id)
+
+            # Identical parameters on the same dataset are only simulated once
+            cache: ResultCache = self.view.page.get_result_cache()
+            key = ResultCache.get_key(job_params, data.get_version())
+
+            job_id = queue.submit(lambda progress: cache.get_or_compute(key, lambda: run(progress)), key=job_key)
+            st.session_state.prototype_v0_2_job = job_id
+            job = queue.get(job_id)
+
+        if job.status == 'done':
+            render(job.result)
+            return
 
-        # Initialize constants
-        POWER_TARGET_PV     : int = Unit.GW(215)
-        POWER_TARGET_WINDOFF: int = Unit.GW(30)
-        POWER_TARGET_WINDON : int = Unit.GW(115)
-        POWER_TARGET_BIOMASS: int = Unit.MW(8_332)
-        POWER_TARGET_HYDRO  : int = Unit.MW(4_253)
-
-        LOAD_TARGET         : int = Unit.TWh(self.params['load'])
-
-
-        # Get power data of reference year
-        _d: Data = data.smard.get_last_of_year(self.params['reference_year'])
-
-        POWER_CURRENT_PV     : int = _d.power.pv
-        POWER_CURRENT_WINDOFF: int = _d.power.wind_offshore
-        POWER_CURRENT_WINDON : int = _d.power.wind_onshore
-        POWER_CURRENT_BIOMASS: int = _d.power.biomass
-        POWER_CURRENT_HYDRO  : int = _d.power.hydro
-
-        _data_year: DataArray      = data.smard.get_year(self.params['reference_year'])
-        LOAD_CURRENT         : int = sum([d.consumption.load for d in _data_year])
-
-        print(f'LOAD_CURRENT: {LOAD_CURRENT}')
-
-
-        # Calculate power factors
-        POWER_FACTOR_PV     : float = POWER_TARGET_PV      / POWER_CURRENT_PV
-        POWER_FACTOR_WINDOFF: float = POWER_TARGET_WINDOFF / POWER_CURRENT_WINDOFF
-        POWER_FACTOR_WINDON : float = POWER_TARGET_WINDON  / POWER_CURRENT_WINDON
-        POWER_FACTOR_BIOMASS: float = POWER_TARGET_BIOMASS / POWER_CURRENT_BIOMASS
-        POWER_FACTOR_HYDRO  : float = POWER_TARGET_HYDRO   / POWER_CURRENT_HYDRO
-
-        LOAD_FACTOR         : float = LOAD_TARGET          / LOAD_CURRENT
-
-        INITIAL_BALANCE: int = Unit.TWh(10)
-        RESERVE_BALANCE: int = Unit.TWh(1)
-
-
-        # Debug
-        # st.debug(f'POWER_FACTOR_PV     : {POWER_FACTOR_PV}')
-        # st.debug(f'POWER_FACTOR_WINDOFF: {POWER_FACTOR_WINDOFF}')
-        # st.debug(f'POWER_FACTOR_WINDON : {POWER_FACTOR_WINDON}')
-        # st.debug(f'POWER_FACTOR_BIOMASS: {POWER_FACTOR_BIOMASS}')
-        # st.debug(f'POWER_FACTOR_HYDRO  : {POWER_FACTOR_HYDRO}')
-        # st.debug(f'LOAD_FACTOR         : {LOAD_FACTOR}')
-
-
-        # st.debug('Prototype_v0_2 works!')
-
-
-        # ----------------------------------------
-        # Create a Collection for the year 2030
-        # ----------------------------------------
-
-        # First, we use a pandas date_range
-        date_range = pd.date_range(
-            start=dt.datetime(2030, 1, 1, 0, 0),
-            end=dt.datetime(2030, 12, 31, 23, 45),
-            freq='15min',
-            tz='Europe/Berlin'
-        )
-
-        # Create a collection for the year 2030
-        collection_2030 = Collection()
-        collection_2030.set_name('2030')
+        if job.is_finished():
+            if job.status == 'cancelled':
+                st.warning('Simulation abgebrochen.')
+            else:
+                st.error(f'Simulation fehlgeschlagen: {job.error}')
 
-        # Create the data array for the year 2030
-        _data = np.empty(len(date_range), dtype=Data)
+            if st.button('Erneut simulieren'):
+                del st.session_state.prototype_v0_2_job
+                st.rerun()
 
-        for i, d in enumerate(date_range):
-            _data[i] = Data(
-                start=d.to_pydatetime(),
-            )
+            return
 
-        # Set the data array to the collection
-        collection_2030.set(_data)
+        self.render_job(job.id)
 
+    @st.fragment(run_every=0.5)
+    def render_job(self, job_id: str):
+        # Only this fragment is polled, the rest of the page is rerun once the job finished
+        queue: JobQueue = self.view.page.get_job_queue()
+        job: Job | None = queue.get(job_id)
 
-        # ----------------------------------------
-        # Compute values for the year 2030
-        # ----------------------------------------
+        if job is None or job.is_finished():
+            st.rerun()
 
-        def _create_generator(data: DataArray):
-            for d in data:
-                yield d
+        st.warning(f'Simulating... {job.progress}')
 
-        reference_data: DataArray = data.smard.get_year(self.params['reference_year'])
+        if st.button('Abbrechen'):
+            queue.cancel(job.id)
 
-        reference_data = _create_generator(reference_data)
+    def render(self, result: ScenarioResult):
+        params = result.params
 
         # Check for leap year
-        ref_is_leap = calendar.isleap(self.params['reference_year'])
+        ref_is_leap = calendar.isleap(params.reference_year)
 
         if ref_is_leap:
             st.warning('Detected leap year. Skipping 29th of February.')
 
-        # Start copying values
-        copying_progress = st.progress(
-            value=0,
-            text='Copying values...'
-        )
+        date_range = Engine.get_date_range()
 
-        # Copy values
-        for i, d in enumerate(collection_2030):
-            _data = next(reference_data)
-
-            if ref_is_leap:
-                while d.start.month == 2 and d.start.day == 29:
-                    _data = next(reference_data)
-
-            d.production                = Data.Production()
-            d.production.pv             = _data.production.pv
-            d.production.pv            *= POWER_FACTOR_PV
-            d.production.wind_offshore  = _data.production.wind_offshore
-            d.production.wind_offshore *= POWER_FACTOR_WINDOFF
-            d.production.wind_onshore   = _data.production.wind_onshore
-            d.production.wind_onshore  *= POWER_FACTOR_WINDON
-            d.production.biomass        = _data.production.biomass
-            d.production.biomass       *= POWER_FACTOR_BIOMASS
-            d.production.hydro          = _data.production.hydro
-            d.production.hydro         *= POWER_FACTOR_HYDRO
-            # d.production.gas            = BASE_LOAD_COVERAGE / collection_2030.get_length()
-
-            d.power                     = _data.power
-            d.power.pv                  = POWER_FACTOR_PV
-            d.power.wind_offshore       = POWER_FACTOR_WINDOFF
-            d.power.wind_onshore        = POWER_FACTOR_WINDON
-            d.power.biomass             = POWER_FACTOR_BIOMASS
-            d.power.hydro               = POWER_FACTOR_HYDRO
-
-            d.consumption               = Data.Consumption()
-            d.consumption.load          = _data.consumption.load * LOAD_FACTOR
-
-            copying_progress.progress(i / collection_2030.get_length())
-
-        copying_progress.progress(1.0)
-
-        # ----------------------------------------
-        # Calculate the deficit
-        # ----------------------------------------
-        total_production = sum(d.production.total for d in collection_2030)
-        total_consumption = sum(d.consumption.load for d in collection_2030)
-        deficit = abs(total_consumption - total_production)
+        total_production = result.total_production
+        total_consumption = result.total_consumption
+        deficit = result.deficit
 
         st.debug(f'Total Energy Production: {round(total_production / 1_000_000_000_000, 2)} TWh')
         st.debug(f'Total Energy Consumption: {round(total_consumption / 1_000_000_000_000, 2)} TWh')
@@ -184,209 +148,27 @@ class Prototype_v0_2:
         renewable_share = total_production / total_consumption
         st.debug(f'Renewable Share: {round(renewable_share * 100, 2)} %')
 
-        for i, d in enumerate(collection_2030):
-            _gas = deficit / collection_2030.get_length()
-            collection_2030.data[i].production.gas = _gas
-
-        # ----------------------------------------
-        # Apply ramp factor
-        # ----------------------------------------
-        _summer_factor = 0.5
-        SUMMER_FACTOR = _summer_factor
-        WINTER_FACTOR = 1.0
-
-        x_W = lambda S, W, x_S: (1 - ((S/(S+W)) * x_S)) / (W/(S+W))
-
-        WINTER_FACTOR = x_W(7, 5, SUMMER_FACTOR)
-
-        st.debug(f'Summer Factor: {SUMMER_FACTOR}')
-        st.debug(f'Winter Factor: {WINTER_FACTOR}')
-
-        ramp_factor = np.ones(collection_2030.get_length(), dtype=float)
-
-        # Winter End Fade Start
-        w_e_0 = dt.datetime(2030, 3, 1, 0, 0)
-        w_e_0 = timezone('Europe/Berlin').localize(w_e_0)
-        # Winter End Fade End
-        w_e_1 = dt.datetime(2030, 3, 31, 23, 45)
-        w_e_1 = timezone('Europe/Berlin').localize(w_e_1)
-        # Winter Beginning Fade Start
-        w_b_0 = dt.datetime(2030, 10, 1, 0, 0)
-        w_b_0 = timezone('Europe/Berlin').localize(w_b_0)
-        # Winter Beginning Fade End
-        w_b_1 = dt.datetime(2030, 10, 31, 23, 45)
-        w_b_1 = timezone('Europe/Berlin').localize(w_b_1)
-
-        # Winter 1. Jan - 28. Feb
-        winter_0 = w_e_0 - timezone('Europe/Berlin').localize(dt.datetime(2030, 1, 1))
-        winter_0 = winter_0.total_seconds() / (60 * 15)
-        ramp_factor[:int(winter_0)] = WINTER_FACTOR
-
-        # Ramping down 1. Mar - 31. Mar
-        td_ramp_down = w_e_1 - w_e_0
-        td_ramp_down = td_ramp_down.total_seconds() / (60 * 15)
-        td_ramp_down = round(td_ramp_down)
-        ramp_down = np.linspace(WINTER_FACTOR, SUMMER_FACTOR, td_ramp_down)
-
-        ramp_factor[int(winter_0):int(winter_0 + td_ramp_down)] = ramp_down
+        iterations = result.iterations
 
-        # Summer 1. Apr - 30. Sep
-        summer = w_b_0 - w_e_1
-        summer = summer.total_seconds() / (60 * 15)
-        summer = round(summer)
-
-        ramp_factor[int(winter_0 + td_ramp_down):int(winter_0 + td_ramp_down + summer)] = SUMMER_FACTOR
-
-        # Ramping up 1. Oct - 31. Oct
-        td_ramp_up = w_b_1 - w_b_0
-        td_ramp_up = td_ramp_up.total_seconds() / (60 * 15)
-        td_ramp_up = round(td_ramp_up)
-        ramp_up = np.linspace(SUMMER_FACTOR, WINTER_FACTOR, td_ramp_up)
-
-        ramp_factor[int(winter_0 + td_ramp_down + summer):int(winter_0 + td_ramp_down + summer + td_ramp_up)] = ramp_up
-
-        # Winter 1. Nov - 31. Dec
-        winter_1: dt.timedelta = timezone('Europe/Berlin').localize(dt.datetime(2030, 12, 31, 23, 45)) - w_b_1
-        winter_1: float = winter_1.total_seconds() / (60 * 15)
-        winter_1: int = round(winter_1)
-
-        ramp_factor[int(winter_0 + td_ramp_down + summer + td_ramp_up):] = WINTER_FACTOR
-
-        for i in range(collection_2030.get_length()):
-            collection_2030.data[i].production.gas *= ramp_factor[i]
-
-        recalculated_sum = sum(d.production.gas for d in collection_2030)
-        st.debug(f'Recalculated Sum: {round(recalculated_sum / 1_000_000_000_000, 2)} TWh')
-
-        st.success('Done!')
-
-        # # Create a start and end date
-        # # ! tzinfo does not work correctly with pytz
-        # start = dt.datetime(2030, 3, 31,  0,  0)
-        # end   = dt.datetime(2030, 3, 31, 23, 45)
-
-        # # Localize to Europe/Berlin
-        # start = timezone('Europe/Berlin').localize(start)
-        # end   = timezone('Europe/Berlin').localize(end)
-
-        # # Get the data for the given date range
-        # _test = collection_2030.get_range(start, end)
-
-
-
-
-        # ----------------------------------------
-        # Calculate the balance
-        # ----------------------------------------
-        net_balance: NDArray   = np.zeros(collection_2030.get_length(), dtype=int)
-
-        # Start iterations
-        st.warning('Starting iterations...')
-        iterations = 0
-        initial_balance = INITIAL_BALANCE
-
-        simulation_stop = False
-
-        total_balance = None
-        lowest_point = np.iinfo(np.int64).max
-
-        storage_balance: NDArray   = np.zeros(collection_2030.get_length(), dtype=int)
-
-        simulation_successfull = False
-
-        with st.spinner('Simulating...'):
-            while not simulation_stop:
-                iterations += 1
-
-                print(f'----------------------------------------')
-                print(f'iteration: {iterations}')
-                print(f'----------------------------------------')
-
-                lowest_point = np.iinfo(np.int64).max
-
-                # ----------------------------------------
-                # Setup storage
-                # ----------------------------------------
-                storage = MagicStorage(initial_energy=INITIAL_BALANCE)
-                # storage.start_electrolysis()
-
-                # ----------------------------------------
-                # Calculate the net balance
-                # ----------------------------------------
-                net_balance: NDArray   = np.zeros(collection_2030.get_length(), dtype=int)
-                balance_is_negative = False
-
-                # ----------------------------------------
-                # Iterate over the year 2030
-                # ----------------------------------------
-                for i, d in enumerate(collection_2030):
-                    d: Data = d
-                    net_balance[i] = d.production.total - d.consumption.load
-
-                    # ----------------------------------------
-                    # Charge or discharge the storage
-                    # ----------------------------------------
-                    if net_balance[i] > 0:
-                        # Putting energy into a temporary battery
-                        storage.charge(net_balance[i])
-                    elif net_balance[i] < 0:
-                        # Taking energy from a hydrogen gas turbine
-                        try:
-                            storage.discharge(abs(net_balance[i]))
-                        except StorageEmptyException as e:
-                            print('Storage is empty. Stopping iteration.')
-                            balance_is_negative = True
-                            break
-
-                    storage_balance[i] = storage.hydrogen
-                    lowest_point = min(lowest_point, storage.hydrogen * storage.H_TO_W)
-
-                # ----------------------------------------
-                # Calculate the total balance (cumulative)
-                # ----------------------------------------
-                total_balance: NDArray = net_balance.cumsum()
-
-                total_balance += initial_balance
-
-                # ----------------------------------------
-                # Iterate over the year 2030
-                # and stop if the balance is negative
-                # ----------------------------------------
-
-                # for i in range(total_balance.size):
-                #     lowest_point = min(lowest_point, total_balance[i])
-
-                #     if total_balance[i] < RESERVE_BALANCE:
-                #         balance_is_negative = True
-                #         break
-
-                remaining_storage = storage_balance[-1] * storage.H_TO_W
-                storage_less_than_initial = remaining_storage <= INITIAL_BALANCE
-                reverse_storage_less = lowest_point <= RESERVE_BALANCE
-
-                if balance_is_negative or storage_less_than_initial or reverse_storage_less:
-                    for i in range(collection_2030.get_length()):
-                        collection_2030.data[i].production.gas *= 1.01
-                else:
-                    simulation_stop = True
-                    simulation_successfull = True
-
-                if iterations > 200:
-                    simulation_stop = True
-
-                # storage.stop_electrolysis()
-                # del storage
-
-        if not simulation_successfull:
+        if not result.success:
             st.warning('Maximum number of iterations reached.')
             st.error('Simulation failed!')
             return
 
         st.success(f'Simulation succeeded after {iterations} iterations.')
+        st.debug(f'Gas Factor: {result.gas_factor} - Residual: {round(result.residual / 1_000_000_000_000, 4)} TWh')
+
+        initial_balance = params.initial_balance
+        scenario_2030 = result.scenario
+        storage_balance: NDArray = result.storage_balance
+        lowest_point = result.lowest_point
+
+        # Materialize the scenario once for the charts and range queries below
+        collection_2030 = scenario_2030.to_collection('2030')
         st.subheader('Results')
         st.code(f'Initial Storage Energy = {round(initial_balance / 1_000_000_000_000, 2)} TWh')
 
-        total_gas = sum(d.production.gas for d in collection_2030)
+        total_gas = result.total_gas
         _base_load_coverage = round(total_gas / 1_000_000_000_000, 2)
         _per_quarter = round(_base_load_coverage * 1_000 / collection_2030.get_length(), 2)
         st.code(f'Required Base Load Coverage = {_base_load_coverage} TWh - {_per_quarter} GWh/quarter')
@@ -395,7 +177,7 @@ class Prototype_v0_2:
         st.code(f'Base Load Overproduction = {round(base_load_overshoot * 100, 2)} %')
         st.code(f'Base Load Share (Consumption) = {round(total_gas / total_consumption * 100, 2)} %')
 
-        remaining_storage = storage_balance[-1] * storage.H_TO_W
+        remaining_storage = result.remaining_storage
         st.code(f'Remaining Storage Energy = {round(remaining_storage / 1_000_000_000_000, 2)} TWh')
 
         st.code(f'Lowest Point = {round(lowest_point / 1_000_000_000_000, 2)} TWh')
@@ -404,20 +186,16 @@ class Prototype_v0_2:
         # Calculate storage power
         # ----------------------------------------
 
-        # Get the largest deficit
-        differences = np.diff(storage_balance)
-
-        # Find the maximum difference
-        largest_charge = np.max(differences) * storage.W_TO_H
-        largest_discharge = np.min(differences) * storage.H_TO_W
+        largest_charge = result.largest_charge
+        largest_discharge = result.largest_discharge
 
-        largest_charge_power = largest_charge * 4
-        largest_discharge_power = largest_discharge * 4
+        largest_charge_power = result.largest_charge_power
+        largest_discharge_power = result.largest_discharge_power
 
         st.code(f'Largest Charge = {round(largest_charge / 1_000_000_000, 2)} GWh - {round(largest_charge_power / 1_000_000_000, 2)} GW')
         st.code(f'Largest Discharge = {round(largest_discharge / 1_000_000_000, 2)} GWh - {round(largest_discharge_power / 1_000_000_000, 2)} GW')
 
-        total_hydrogen_required = np.trapz(storage_balance)
+        total_hydrogen_required = result.total_hydrogen_required
         st.code(f'Total Hydrogen Required = {round(total_hydrogen_required / 1_000_000_000_000, 2)} Gt')
 
 
@@ -425,14 +203,14 @@ class Prototype_v0_2:
         # Create a chart
         # ----------------------------------------
 
-        production_base_load     = [d.production.gas for d in collection_2030]
-        production_pv            = [d.production.pv for d in collection_2030]
-        production_wind_offshore = [d.production.wind_offshore for d in collection_2030]
-        production_wind_onshore  = [d.production.wind_onshore for d in collection_2030]
-        production_biomass       = [d.production.biomass for d in collection_2030]
-        production_hydro         = [d.production.hydro for d in collection_2030]
+        production_base_load     = collection_2030.get_column('production.gas')
+        production_pv            = collection_2030.get_column('production.pv')
+        production_wind_offshore = collection_2030.get_column('production.wind_offshore')
+        production_wind_onshore  = collection_2030.get_column('production.wind_onshore')
+        production_biomass       = collection_2030.get_column('production.biomass')
+        production_hydro         = collection_2030.get_column('production.hydro')
 
-        consumption              = [d.consumption.load for d in collection_2030]
+        consumption              = collection_2030.get_column('consumption.load')
 
 
         plot_production_df = pd.DataFrame({
@@ -594,6 +372,20 @@ class Prototype_v0_2:
             use_container_width=True,
         )
 
+        # ----------------------------------------
+        # Storage mix
+        # ----------------------------------------
+
+        if result.storage_mix is not None:
+            self.render_storage_mix(result, date_range)
+
+        # ----------------------------------------
+        # Storage sizing
+        # ----------------------------------------
+
+        if st.button('Speicher dimensionieren', help='Berechnet die minimale Größe des Wasserstoffspeichers.'):
+            self.render_sizing(result)
+
         # ----------------------------------------
         # Plot selectable day
         # ----------------------------------------
@@ -611,31 +403,29 @@ class Prototype_v0_2:
 
         container_plot_day_cols = container_plot_day.columns(2, gap='medium')
 
-        selected_date = dt.datetime(selected_date.year, selected_date.month, selected_date.day, 0, 0)
+        # Localize both midnights, so days with a DST change have 92 or 100 quarter hours
+        start_date = dt.datetime(selected_date.year, selected_date.month, selected_date.day, 0, 0)
+        end_date   = start_date + dt.timedelta(days=1)
 
-        selected_date = timezone('Europe/Berlin').localize(selected_date)
+        selected_date = timezone('Europe/Berlin').localize(start_date)
+        end_date      = timezone('Europe/Berlin').localize(end_date)
 
-        selected_data: DataArray = collection_2030.get_range(selected_date, selected_date + dt.timedelta(days=1) - dt.timedelta(minutes=15))
+        selected_data: DataView = collection_2030.get_range(selected_date, end_date, inclusive=False)
 
         # We now want to use the previously generated data and plot the same chart again
         # but with a different resolution. The year plots above are on a day resolution
         # and we want to plot the data on a 15 minute resolution.
 
-        production_base_load     = [d.production.gas for d in selected_data]
-        production_pv            = [d.production.pv for d in selected_data]
-        production_wind_offshore = [d.production.wind_offshore for d in selected_data]
-        production_wind_onshore  = [d.production.wind_onshore for d in selected_data]
-        production_biomass       = [d.production.biomass for d in selected_data]
-        production_hydro         = [d.production.hydro for d in selected_data]
+        production_base_load     = selected_data.get_column('production.gas')
+        production_pv            = selected_data.get_column('production.pv')
+        production_wind_offshore = selected_data.get_column('production.wind_offshore')
+        production_wind_onshore  = selected_data.get_column('production.wind_onshore')
+        production_biomass       = selected_data.get_column('production.biomass')
+        production_hydro         = selected_data.get_column('production.hydro')
 
-        consumption              = [d.consumption.load for d in selected_data]
+        consumption              = selected_data.get_column('consumption.load')
 
-        date_range_day = pd.date_range(
-            start=dt.datetime(selected_date.year, selected_date.month, selected_date.day, 0, 0),
-            end=dt.datetime(selected_date.year, selected_date.month, selected_date.day, 23, 45),
-            freq='15min',
-            tz='Europe/Berlin'
-        )
+        date_range_day = pd.to_datetime(selected_data.timestamps, unit='s', utc=True).tz_convert('Europe/Berlin')
 
         st.debug(f'Data: {selected_data.size}')
         st.debug(f'Range: {len(date_range_day)}')
@@ -727,12 +517,10 @@ class Prototype_v0_2:
         # Now the plot for the storage
 
         # Get start index of storage array
-        start_index = (selected_data[0].start - timezone('Europe/Berlin').localize(dt.datetime(2030, 1, 1, 0, 0))).total_seconds() / (60 * 15)
-        start_index = round(start_index)
+        start_index = (selected_data.timestamps[0] - collection_2030.timestamps[0]) // (60 * 15)
 
         # Get end index of storage array
-        end_index = (selected_data[-1].start - timezone('Europe/Berlin').localize(dt.datetime(2030, 1, 1, 0, 0))).total_seconds() / (60 * 15)
-        end_index = round(end_index)
+        end_index = (selected_data.timestamps[-1] - collection_2030.timestamps[0]) // (60 * 15)
 
         st.debug(f'Storage: {np.copy(storage_balance)[start_index:end_index+1].size}')
 
@@ -815,31 +603,32 @@ class Prototype_v0_2:
         container_plot_day_cols = container_plot_day.columns(2, gap='medium')
 
         start_date = dt.datetime(selected_date.year, selected_date.month, 1, 0, 0)
-        end_date   = dt.datetime(selected_date.year, selected_date.month + 1, 1, 0, 0)
+        end_date   = dt.datetime(selected_date.year + selected_date.month // 12, selected_date.month % 12 + 1, 1, 0, 0)
 
         start_date = timezone('Europe/Berlin').localize(start_date)
         end_date   = timezone('Europe/Berlin').localize(end_date)
 
-        selected_data: DataArray = collection_2030.get_range(start_date, end_date)
+        selected_data: DataView = collection_2030.get_range(start_date, end_date, inclusive=False)
 
         # We now want to use the previously generated data and plot the same chart again
         # but with a different resolution. The year plots above are on a day resolution
         # and we want to plot the data on a 15 minute resolution.
 
-        production_base_load     = [d.production.gas for d in selected_data]
-        production_pv            = [d.production.pv for d in selected_data]
-        production_wind_offshore = [d.production.wind_offshore for d in selected_data]
-        production_wind_onshore  = [d.production.wind_onshore for d in selected_data]
-        production_biomass       = [d.production.biomass for d in selected_data]
-        production_hydro         = [d.production.hydro for d in selected_data]
+        production_base_load     = selected_data.get_column('production.gas')
+        production_pv            = selected_data.get_column('production.pv')
+        production_wind_offshore = selected_data.get_column('production.wind_offshore')
+        production_wind_onshore  = selected_data.get_column('production.wind_onshore')
+        production_biomass       = selected_data.get_column('production.biomass')
+        production_hydro         = selected_data.get_column('production.hydro')
 
-        consumption              = [d.consumption.load for d in selected_data]
+        consumption              = selected_data.get_column('consumption.load')
 
         date_range_day = pd.date_range(
             start=dt.datetime(start_date.year, start_date.month, 1, 0, 0),
             end=dt.datetime(end_date.year, end_date.month, 1, 0, 0),
             freq='15min',
-            tz='Europe/Berlin'
+            tz='Europe/Berlin',
+            inclusive='left'
         )
 
         st.debug(f'Data: {selected_data.size}')
@@ -932,12 +721,10 @@ class Prototype_v0_2:
         # Now the plot for the storage
 
         # Get start index of storage array
-        start_index = (selected_data[0].start - timezone('Europe/Berlin').localize(dt.datetime(2030, 1, 1, 0, 0))).total_seconds() / (60 * 15)
-        start_index = round(start_index)
+        start_index = (selected_data.timestamps[0] - collection_2030.timestamps[0]) // (60 * 15)
 
         # Get end index of storage array
-        end_index = (selected_data[-1].start - timezone('Europe/Berlin').localize(dt.datetime(2030, 1, 1, 0, 0))).total_seconds() / (60 * 15)
-        end_index = round(end_index)
+        end_index = (selected_data.timestamps[-1] - collection_2030.timestamps[0]) // (60 * 15)
 
         st.debug(f'Storage: {np.copy(storage_balance)[start_index:end_index+1].size}')
 
@@ -988,102 +775,143 @@ class Prototype_v0_2:
             use_container_width=True,
         )
 
+    def render_storage_mix(self, result: ScenarioResult, date_range: pd.DatetimeIndex):
+        storage_mix = result.storage_mix
 
-class MagicStorage:
-    energy: float = 0.0
-    hydrogen: float = 0.0
-    thread = None
-
-    W_TO_H = 39_000
-    H_TO_W = 33_000
-
-    STORAGE_CAP: int = Unit.kt(400)
-
-    def __init__(self, initial_energy: float = 0.0):
-        # self.energy = initial_energy
-        self.charge(initial_energy)
+        st.subheader('Speicher')
 
-    def start_electrolysis(self):
-        self.thread = self.Electrolysis(self)
-        self.thread.start()
-
-        # print(f'Converting initial energy of {self.energy} W.')
-        # print(f'We have {self.hydrogen} kg of hydrogen now and {self.energy} W left.')
-        # print(f'Start simulation.')
-
-    class Electrolysis(Thread):
-
-        def __init__(self, storage):
-            self.storage = storage
-
-            name = 'Electrolysis'
-
-            super().__init__(name=name, daemon=True)
-            self._stop_event = Event()
+        for dispatch in storage_mix.dispatches:
+            technology = dispatch.technology
+            st.code(
+                f'{technology.name}: '
+                f'{round(technology.capacity / 1_000_000_000, 2)} GWh - '
+                f'{round(technology.round_trip_efficiency * 100)} % - '
+                f'Discharged = {round(dispatch.discharged / 1_000_000_000_000, 2)} TWh - '
+                f'Losses = {round(dispatch.losses / 1_000_000_000_000, 2)} TWh - '
+                f'Full Cycles = {round(dispatch.full_cycles, 1)}'
+            )
 
-        def run(self):
-            print(f"{self.name} is powering up...")
+        st.code(f'Unserved Energy = {round(storage_mix.unserved / 1_000_000_000_000, 2)} TWh')
+        st.code(f'Curtailed Energy = {round(storage_mix.curtailed / 1_000_000_000_000, 2)} TWh')
 
-            while not self._stop_event.is_set():
-                # print(f'Storage Energy: {self.storage.energy} W - Hydrogen: {self.storage.hydrogen}')
-                if self.storage.energy >= self.storage.W_TO_H:
+        plot_storage_df = pd.DataFrame({
+            'Date': date_range,
+            **{d.technology.name: d.level / d.technology.capacity * 100 for d in storage_mix.dispatches},
+        })
 
-                    # Convert all possible energy into hydrogen
-                    # and put it into the storage
-                    possible = self.storage.energy / self.storage.W_TO_H
-                    self.storage.energy -= possible * self.storage.W_TO_H
-                    self.storage.hydrogen += possible
+        plot_storage_df['Date'] = pd.to_datetime(plot_storage_df['Date'])
+        plot_storage_df['Date'] = plot_storage_df['Date'].dt.strftime('%Y-%m-%d')
+        plot_storage_df = plot_storage_df.groupby(['Date']).mean().reset_index()
 
+        plot_storage_df = pd.melt(plot_storage_df, id_vars=["Date"], var_name="Storage", value_name="Level")
 
-                    # self.storage.energy -= self.storage.W_TO_H * 1_000
-                    # self.storage.hydrogen += 1_000
+        st.altair_chart(
+            altair_chart=alt.Chart(
+                data=plot_storage_df
+            ).mark_line().encode(
+                x=alt.X(
+                    'Date:O',
+                    axis=alt.Axis(title='Datum [M]')
+                ),
+                y=alt.Y(
+                    'Level:Q',
+                    axis=alt.Axis(title='Füllstand [%]'),
+                    scale=alt.Scale(domain=[0, 100])
+                ),
+                color=alt.Color(
+                    'Storage:N',
+                    legend=alt.Legend(title='Speicher'),
+                ),
+            ).properties(
+                title='Füllstand der Speicher (Tagesmittel)'
+            ),
+            use_container_width=True,
+        )
 
-            print(f"{self.name} is stopped.")
+    def render_batch(self, result: BatchResult):
+        if not result.success.any():
+            st.error('Simulation failed for all reference years!')
+            return
 
-        def stop(self):
-            print(f"{self.name} is stopping...")
-            self._stop_event.set()
+        worst_year = result.get_worst_year()
 
+        st.success(f'Simulated {result.years.size} reference years after {result.iterations.max()} iterations.')
+        st.subheader('Results per Reference Year')
+        st.code(f'Worst Reference Year = {worst_year}')
 
-    def stop_electrolysis(self):
-        self.thread.stop()
-        self.thread.join()
+        kpis = result.get_kpis()
 
-    def charge(self, energy: float):
-        hydrogen = energy / self.W_TO_H
+        plot_kpis_df = pd.DataFrame({
+            'Referenzjahr': kpis['reference_year'].astype(str),
+            'Fossile Grundlast [TWh]': kpis['required_base_load'] / 1_000_000_000_000,
+            'Erneuerbarer Anteil [%]': kpis['renewable_share'] * 100,
+            'Längste Unterdeckung [h]': kpis['longest_deficit'],
+            'Niedrigster Speicherstand [TWh]': kpis['lowest_point'] / 1_000_000_000_000,
+            'Erfolgreich': kpis['success'],
+        })
 
-        self.hydrogen += hydrogen
+        st.dataframe(plot_kpis_df, hide_index=True, use_container_width=True)
 
-        self.hydrogen = min(self.hydrogen, self.STORAGE_CAP)
+        st.altair_chart(
+            altair_chart=alt.Chart(
+                data=plot_kpis_df
+            ).mark_bar().encode(
+                x=alt.X(
+                    'Referenzjahr:O',
+                    axis=alt.Axis(title='Referenzjahr')
+                ),
+                y=alt.Y(
+                    'Fossile Grundlast [TWh]:Q',
+                    axis=alt.Axis(title='Fossile Grundlast [TWh]')
+                ),
+                color=alt.condition(
+                    alt.datum['Referenzjahr'] == str(worst_year),
+                    alt.value('#FF0000'),
+                    alt.value('#6D5F6D'),
+                ),
+            ).properties(
+                title='Benötigte fossile Grundlast je Referenzjahr'
+            ),
+            use_container_width=True,
+        )
 
-    # def _electrolysis(self):
-    #     # Wait until 39_000 of energy is available
-    #     # and turn this into 1 kilogram of hydrogen
-    #     print('Electrolysis started.')
-    #     while True:
-    #         if self.energy > self.W_TO_H:
-    #             self.energy -= self.W_TO_H
-    #             self.hydrogen += 1
+    def render_sizing(self, result: ScenarioResult):
+        data: Collections = self.view.page.get_data()
 
-    def discharge(self, energy: float) -> float:
+        with st.spinner('Sizing storage...'):
+            sizer = StorageSizer.create(data, result.params)
+            size = sizer.get_minimal_capacity(result.gas_factor)
+            front = sizer.get_pareto_front()
 
-        required_hydrogen = energy / self.H_TO_W
-        # print(f'Discharging... {round(energy / 1_000_000_000, 2)} GW - Requiring {round(required_hydrogen / 1_000_000, 2)} kt of hydrogen.')
+        st.subheader('Speicherdimensionierung')
 
-        # Debug from J. Erdmann
-        if required_hydrogen > self.hydrogen:
-            raise StorageEmptyException()
-        else:
-            # print(f'Storage now has {round(self.hydrogen / 1_000_000, 2)} kt of hydrogen.')
-            return self.combust(required_hydrogen)
+        st.code(f'Minimal Storage Capacity = {round(size.capacity / 1_000_000_000_000, 2)} TWh - {round(size.capacity_hydrogen / 1_000_000)} kt')
+        st.code(f'Minimal Discharge Power = {round(size.discharge_power / 1_000_000_000, 2)} GW')
+        st.code(f'Current Storage Capacity = {round(MagicStorage.STORAGE_CAP / 1_000_000)} kt')
 
-    def combust(self, hydrogen: float) -> float:
-        self.hydrogen -= hydrogen
-        return hydrogen * self.H_TO_W
+        if front.empty:
+            st.warning('No storage size satisfies the scenario.')
+            return
 
+        plot_front_df = pd.DataFrame({
+            'Base Load': front['base_load'] / 1_000_000_000_000,
+            'Capacity': front['capacity_hydrogen'] / 1_000_000,
+        })
 
-class StorageEmptyException(Exception):
-    def __init__(self, message: str = 'Storage is empty.', energy: float = 0.0):
-        self.message = message
-        self.energy = energy
-        super().__init__(self.message)
+        st.altair_chart(
+            altair_chart=alt.Chart(
+                data=plot_front_df
+            ).mark_line(point=True).encode(
+                x=alt.X(
+                    'Base Load:Q',
+                    axis=alt.Axis(title='Fossile Grundlast [TWh]')
+                ),
+                y=alt.Y(
+                    'Capacity:Q',
+                    axis=alt.Axis(title='Speicherkapazität [kt]')
+                ),
+            ).properties(
+                title='Speicherkapazität gegen fossile Grundlast'
+            ),
+            use_container_width=True,
+        )
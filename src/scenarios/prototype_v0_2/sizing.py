@@ -0,0 +1,319 @@
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
+
+from data_manager.data_manager import Collections, ScenarioOverlay
+
+from .engine import Engine, MagicStorage, ScenarioParameters
+from .storage import StorageTechnology
+
+
+@dataclass(frozen=True)
+class StorageSize:
+    """
+    The result of a storage sizing.
+
+    Attributes:
+    -----------
+    gas_factor (float) : The gas scale factor the storage was sized for.
+    base_load (float) : The yearly gas base load in Wh.
+    capacity (float) : The minimal capacity in Wh. Infinite if no capacity suffices.
+    charge_power (float) : The charge power the capacity was sized with in W.
+    discharge_power (float) : The minimal discharge power in W.
+    feasible (bool) : Whether any storage of the technology satisfies the success criteria.
+    evaluations (int) : The number of storage years evaluated.
+    """
+    gas_factor: float
+    base_load: float
+    capacity: float
+    charge_power: float
+    discharge_power: float
+    feasible: bool
+    evaluations: int
+
+    @property
+    def capacity_hydrogen(self) -> float:
+        """
+        The capacity in kg of hydrogen, like MagicStorage.STORAGE_CAP.
+        """
+        return self.capacity / MagicStorage.H_TO_W
+
+
+@dataclass
+class StorageSizer:
+    """
+    Finds the smallest storage that satisfies the success criteria of Prototype v0.2:
+    the storage never falls to the reserve balance and ends the year above the target balance.
+    Like MagicStorage, the initial balance is stored by electrolysis and clipped to the capacity.
+
+    Every storage year is evaluated at array speed with StorageTechnology.clipped_cumsum.
+    A larger capacity, a larger charge power and more gas only ever add energy to the storage,
+    so success is monotone in each of them and they are found by bisection.
+    The discharge power has to cover the largest deficit of the year, so it is computed directly.
+
+    Attributes:
+    -----------
+    scenario (ScenarioOverlay) : The scenario without gas.
+    production_gas (NDArray) : The gas base load at factor 1.
+    initial_balance (float) : The energy charged into the storage before the start in Wh.
+    target_balance (float) : The energy the storage has to end above in Wh.
+    reserve_balance (float) : The energy the storage must never fall below in Wh.
+    charge_efficiency (float) : The share of the drawn energy that ends up in the storage. Defaults to MagicStorage.
+    discharge_efficiency (float) : The share of the stored energy that is fed into the grid. Defaults to MagicStorage.
+    tolerance (float) : The relative width of the final bisection bracket.
+    step_hours (float) : The length of a step in hours, to convert between power and energy.
+
+    Methods:
+    --------
+    create(data: Collections, params: ScenarioParameters) -> StorageSizer
+        Returns the sizer of a scenario.
+    is_feasible(gas_factor: float, capacity: float, charge_power: float) -> bool
+        Returns whether the storage satisfies the success criteria for one year.
+    get_minimal_discharge_power(gas_factor: float) -> float
+        Returns the discharge power that covers the largest deficit.
+    get_minimal_capacity(gas_factor: float, charge_power: float = np.inf) -> StorageSize
+        Returns the minimal capacity for the given gas factor and charge power.
+    get_minimal_charge_power(gas_factor: float, capacity: float) -> StorageSize
+        Returns the minimal charge power for the given gas factor and capacity.
+    get_minimal_gas_factor(capacity: float = np.inf, charge_power: float = np.inf, max_gas_factor: float = 64.0) -> float
+        Returns the minimal gas factor for the given storage.
+    get_pareto_front(points: int = 20, max_gas_factor: float = 4.0, charge_power: float = np.inf) -> pd.DataFrame
+        Returns the minimal capacity against the gas base load.
+    """
+    scenario: ScenarioOverlay
+    production_gas: NDArray
+    initial_balance: float
+    target_balance: float
+    reserve_balance: float
+    charge_efficiency: float    = MagicStorage.H_TO_W / MagicStorage.W_TO_H
+    discharge_efficiency: float = 1.0
+    tolerance: float            = 1e-3
+    step_hours: float           = 0.25
+
+    def __post_init__(self):
+        # The net balance without gas is the same for every evaluation
+        self.net_balance: NDArray = self.scenario.get_total('production') - self.scenario.get_column('consumption.load')
+        self.evaluations: int = 0
+
+    @staticmethod
+    def create(data: Collections, params: ScenarioParameters) -> 'StorageSizer':
+        """
+        Returns the sizer of a scenario.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (ScenarioParameters): The parameters.
+
+        Returns:
+            StorageSizer: The sizer.
+        """
+        scenario = Engine.create_scenario(data, params)
+
+        return StorageSizer(
+            scenario=scenario,
+            production_gas=Engine.get_production_gas(scenario, params.base_load_profile),
+            initial_balance=params.initial_balance,
+            target_balance=params.get_target_balance(),
+            reserve_balance=params.reserve_balance,
+        )
+
+    def get_net_balance(self, gas_factor: float) -> NDArray:
+        return self.net_balance + self.production_gas * gas_factor
+
+    def get_technology(self, capacity: float, charge_power: float, discharge_power: float) -> StorageTechnology:
+        return StorageTechnology(
+            name='Sizing',
+            capacity=capacity,
+            charge_power=charge_power,
+            discharge_power=discharge_power,
+            charge_efficiency=self.charge_efficiency,
+            discharge_efficiency=self.discharge_efficiency,
+        )
+
+    def is_feasible(self, gas_factor: float, capacity: float, charge_power: float = np.inf) -> bool:
+        """
+        Returns whether the storage satisfies the success criteria for one year.
+        The discharge power is unlimited, see get_minimal_discharge_power().
+
+        Args:
+            gas_factor (float): The gas scale factor.
+            capacity (float): The capacity in Wh.
+            charge_power (float, optional): The charge power in W. Defaults to unlimited.
+
+        Returns:
+            bool: Whether the storage never falls to the reserve and ends above the target balance.
+        """
+        self.evaluations += 1
+
+        # Like MagicStorage.dispatch(), the initial balance is charged as hydrogen and clipped to the capacity
+        initial_level = min(self.initial_balance / MagicStorage.W_TO_H, capacity / MagicStorage.H_TO_W) * MagicStorage.H_TO_W
+
+        technology = self.get_technology(capacity, charge_power, np.inf)
+        delta = technology.get_delta(self.get_net_balance(gas_factor), self.step_hours)
+        level = StorageTechnology.clipped_cumsum(delta, initial_level, 0.0, capacity)
+
+        return bool(level.min() > self.reserve_balance and level[-1] > self.target_balance)
+
+    def get_minimal_discharge_power(self, gas_factor: float) -> float:
+        """
+        Returns the discharge power that covers the largest deficit.
+
+        Args:
+            gas_factor (float): The gas scale factor.
+
+        Returns:
+            float: The discharge power in W.
+        """
+        largest_deficit = max(-self.get_net_balance(gas_factor).min(), 0.0)
+
+        return largest_deficit / self.step_hours
+
+    def get_size(self, gas_factor: float, capacity: float, charge_power: float, feasible: bool, evaluations: int) -> StorageSize:
+        return StorageSize(
+            gas_factor=gas_factor,
+            base_load=self.production_gas.sum() * gas_factor,
+            capacity=capacity,
+            charge_power=charge_power,
+            discharge_power=self.get_minimal_discharge_power(gas_factor),
+            feasible=feasible,
+            evaluations=self.evaluations - evaluations,
+        )
+
+    def get_minimal_capacity(self, gas_factor: float, charge_power: float = np.inf) -> StorageSize:
+        """
+        Returns the minimal capacity for the given gas factor and charge power.
+
+        Args:
+            gas_factor (float): The gas scale factor.
+            charge_power (float, optional): The charge power in W. Defaults to unlimited.
+
+        Returns:
+            StorageSize: The size. Not feasible if even an unlimited capacity fails.
+        """
+        evaluations = self.evaluations
+
+        if not self.is_feasible(gas_factor, np.inf, charge_power):
+            return self.get_size(gas_factor, np.inf, charge_power, False, evaluations)
+
+        # Bracket the capacity: an empty storage always fails, high always succeeds
+        low = 0.0
+        high = 2 * max(self.initial_balance, 1.0)
+
+        while not self.is_feasible(gas_factor, high, charge_power):
+            low, high = high, high * 2
+
+        # Halve the bracket until it is narrow enough
+        while (high - low) > self.tolerance * high:
+            middle = (low + high) / 2
+
+            if self.is_feasible(gas_factor, middle, charge_power):
+                high = middle
+            else:
+                low = middle
+
+        return self.get_size(gas_factor, high, charge_power, True, evaluations)
+
+    def get_minimal_charge_power(self, gas_factor: float, capacity: float) -> StorageSize:
+        """
+        Returns the minimal charge power for the given gas factor and capacity.
+
+        Args:
+            gas_factor (float): The gas scale factor.
+            capacity (float): The capacity in Wh.
+
+        Returns:
+            StorageSize: The size. Not feasible if even an unlimited charge power fails.
+        """
+        evaluations = self.evaluations
+
+        # No more power than the largest surplus can be used
+        high = max(self.get_net_balance(gas_factor).max(), 0.0) / self.step_hours
+
+        if not self.is_feasible(gas_factor, capacity, high):
+            return self.get_size(gas_factor, capacity, np.inf, False, evaluations)
+
+        # The relative bracket width never narrows towards a feasible 0
+        if self.is_feasible(gas_factor, capacity, 0.0):
+            return self.get_size(gas_factor, capacity, 0.0, True, evaluations)
+
+        low = 0.0
+
+        while (high - low) > self.tolerance * high:
+            middle = (low + high) / 2
+
+            if self.is_feasible(gas_factor, capacity, middle):
+                high = middle
+            else:
+                low = middle
+
+        return self.get_size(gas_factor, capacity, high, True, evaluations)
+
+    def get_minimal_gas_factor(self, capacity: float = np.inf, charge_power: float = np.inf, max_gas_factor: float = 64.0) -> float:
+        """
+        Returns the minimal gas factor for the given storage.
+
+        Args:
+            capacity (float, optional): The capacity in Wh. Defaults to unlimited.
+            charge_power (float, optional): The charge power in W. Defaults to unlimited.
+            max_gas_factor (float, optional): The largest gas factor tried. Defaults to 64.
+
+        Returns:
+            float: The gas factor. Infinite if even max_gas_factor fails.
+        """
+        high = 1.0
+
+        while not self.is_feasible(high, capacity, charge_power):
+            if high >= max_gas_factor:
+                return np.inf
+
+            high *= 2
+
+        # The relative bracket width never narrows towards a feasible 0
+        if self.is_feasible(0.0, capacity, charge_power):
+            return 0.0
+
+        low = 0.0
+
+        while (high - low) > self.tolerance * high:
+            middle = (low + high) / 2
+
+            if self.is_feasible(middle, capacity, charge_power):
+                high = middle
+            else:
+                low = middle
+
+        return high
+
+    def get_pareto_front(self, points: int = 20, max_gas_factor: float = 4.0, charge_power: float = np.inf) -> pd.DataFrame:
+        """
+        Returns the minimal capacity against the gas base load,
+        from the smallest gas factor any storage can work with up to max_gas_factor.
+        Only sizes for which neither less gas nor less capacity suffices are kept.
+
+        Args:
+            points (int, optional): The number of gas factors. Defaults to 20.
+            max_gas_factor (float, optional): The largest gas factor. Defaults to 4.
+            charge_power (float, optional): The charge power in W. Defaults to unlimited.
+
+        Returns:
+            pd.DataFrame: One row per gas factor with the columns of StorageSize.
+        """
+        min_gas_factor = self.get_minimal_gas_factor(charge_power=charge_power, max_gas_factor=max_gas_factor)
+
+        if not np.isfinite(min_gas_factor):
+            return pd.DataFrame(columns=['gas_factor', 'base_load', 'capacity', 'capacity_hydrogen', 'charge_power', 'discharge_power', 'feasible', 'evaluations'])
+
+        rows = []
+
+        for gas_factor in np.linspace(min_gas_factor, max(max_gas_factor, min_gas_factor), points):
+            size = self.get_minimal_capacity(gas_factor, charge_power)
+            rows.append({**asdict(size), 'capacity_hydrogen': size.capacity_hydrogen})
+
+        front = pd.DataFrame(rows)
+
+        # More gas for the same capacity is dominated
+        previous = front['capacity'].cummin().shift(fill_value=np.inf)
+
+        return front[front['capacity'] < previous].reset_index(drop=True)
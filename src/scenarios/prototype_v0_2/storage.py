@@ -0,0 +1,311 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from dtypes import Unit
+
+
+@dataclass(frozen=True)
+class StorageTechnology:
+    """
+    A storage technology with a limited capacity, limited charge and discharge power and conversion losses.
+
+    Attributes:
+    -----------
+    name (str) : The name, as shown in the storage selection.
+    capacity (float) : The usable energy content in Wh.
+    charge_power (float) : The maximum power drawn from the grid in W.
+    discharge_power (float) : The maximum power fed into the grid in W.
+    charge_efficiency (float) : The share of the drawn energy that ends up in the storage.
+    discharge_efficiency (float) : The share of the stored energy that is fed into the grid.
+    initial_level (float) : The energy content at the start as a share of the capacity.
+    priority (int) : The dispatch order. Lower priorities are charged and discharged first.
+
+    Methods:
+    --------
+    dispatch(net_balance: NDArray, step_hours: float = 0.25) -> TechnologyDispatch
+        Charges the surplus and discharges the deficit of a whole net balance series at once.
+    get_delta(net_balance: NDArray, step_hours: float = 0.25) -> NDArray
+        Returns the change of the level per step if the storage neither runs full nor empty.
+    clipped_cumsum(delta: NDArray, initial: float, low: float, high: float) -> NDArray
+        Returns the running sum of delta that is clipped to [low, high] after every step.
+    """
+    name: str
+    capacity: float
+    charge_power: float
+    discharge_power: float
+    charge_efficiency: float
+    discharge_efficiency: float
+    initial_level: float    = 0.5
+    priority: int           = 0
+
+    @property
+    def round_trip_efficiency(self) -> float:
+        return self.charge_efficiency * self.discharge_efficiency
+
+    def dispatch(self, net_balance: NDArray, step_hours: float = 0.25) -> 'TechnologyDispatch':
+        """
+        Charges the surplus and discharges the deficit of a whole net balance series at once.
+
+        The flow of every step is limited by the power of the storage before the level is known,
+        so the level is a running sum of the flows, clipped to [0, capacity] after every step.
+
+        Args:
+            net_balance (NDArray): The production minus the consumption per step in Wh.
+            step_hours (float, optional): The length of a step in hours. Defaults to 0.25.
+
+        Returns:
+            TechnologyDispatch: The level and the flow per step.
+        """
+        delta = self.get_delta(net_balance, step_hours)
+
+        level = StorageTechnology.clipped_cumsum(delta, self.initial_level * self.capacity, 0.0, self.capacity)
+
+        # The flow from the grid's point of view, i.e. positive while charging
+        change = np.diff(level, prepend=self.initial_level * self.capacity)
+        flow = np.where(change > 0, change / self.charge_efficiency, change * self.discharge_efficiency)
+
+        return TechnologyDispatch(self, level, flow)
+
+    def get_delta(self, net_balance: NDArray, step_hours: float = 0.25) -> NDArray:
+        """
+        Returns the change of the level per step if the storage neither runs full nor empty.
+
+        Args:
+            net_balance (NDArray): The production minus the consumption per step in Wh.
+            step_hours (float, optional): The length of a step in hours. Defaults to 0.25.
+
+        Returns:
+            NDArray: The change of the level per step in Wh.
+        """
+        net_balance = np.asarray(net_balance, dtype=float)
+
+        charge = np.minimum(np.maximum(net_balance, 0.0), self.charge_power * step_hours) * self.charge_efficiency
+        discharge = np.minimum(np.maximum(-net_balance, 0.0), self.discharge_power * step_hours) / self.discharge_efficiency
+
+        return charge - discharge
+
+    @staticmethod
+    def clipped_cumsum(delta: NDArray, initial: float, low: float, high: float) -> NDArray:
+        """
+        Returns the running sum of delta that is clipped to [low, high] after every step,
+        i.e. x[t] = min(max(x[t - 1] + delta[t], low), high) with x[-1] = initial.
+
+        Every step is a function clip(x + a, lo, hi) and the composition of two such functions is one again:
+        applying (a1, lo1, hi1) and then (a2, lo2, hi2) equals (a1 + a2, clip(lo1 + a2, lo2, hi2), clip(hi1 + a2, lo2, hi2)).
+        So all prefixes are composed with a parallel prefix scan in log2(n) array passes.
+
+        Args:
+            delta (NDArray): The change per step.
+            initial (float): The value before the first step.
+            low (float): The lower bound.
+            high (float): The upper bound.
+
+        Returns:
+            NDArray: The value after each step.
+        """
+        a = np.asarray(delta, dtype=float).copy()
+        lo = np.full(a.size, float(low))
+        hi = np.full(a.size, float(high))
+
+        shift = 1
+
+        while shift < a.size:
+            # Compose every step with the prefix ending shift steps before it
+            a_prev, lo_prev, hi_prev = a[:-shift], lo[:-shift], hi[:-shift]
+            a_next, lo_next, hi_next = a[shift:], lo[shift:], hi[shift:]
+
+            composed_lo = np.clip(lo_prev + a_next, lo_next, hi_next)
+            composed_hi = np.clip(hi_prev + a_next, lo_next, hi_next)
+            composed_a = a_prev + a_next
+
+            a[shift:], lo[shift:], hi[shift:] = composed_a, composed_lo, composed_hi
+            shift *= 2
+
+        return np.clip(initial + a, lo, hi)
+
+
+@dataclass(frozen=True)
+class TechnologyDispatch:
+    """
+    The dispatch of one storage technology.
+
+    Attributes:
+    -----------
+    technology (StorageTechnology) : The storage technology.
+    level (NDArray) : The energy content after each step in Wh.
+    flow (NDArray) : The energy drawn from the grid per step in Wh. Negative while discharging.
+    """
+    technology: StorageTechnology
+    level: NDArray
+    flow: NDArray
+
+    @property
+    def charged(self) -> float:
+        return self.flow[self.flow > 0].sum()
+
+    @property
+    def discharged(self) -> float:
+        return -self.flow[self.flow < 0].sum()
+
+    @property
+    def losses(self) -> float:
+        return self.charged - self.discharged - (self.level[-1] - self.technology.initial_level * self.technology.capacity)
+
+    @property
+    def full_cycles(self) -> float:
+        if self.technology.capacity <= 0:
+            return 0.0
+
+        return (self.discharged / self.technology.discharge_efficiency) / self.technology.capacity
+
+
+@dataclass(frozen=True)
+class StorageMixDispatch:
+    """
+    The dispatch of several storage technologies.
+
+    Attributes:
+    -----------
+    dispatches (tuple[TechnologyDispatch, ...]) : The dispatch per technology in priority order.
+    residual (NDArray) : The net balance per step that no storage could absorb or cover in Wh.
+    """
+    dispatches: tuple[TechnologyDispatch, ...]
+    residual: NDArray
+
+    @property
+    def unserved(self) -> float:
+        return -self.residual[self.residual < 0].sum()
+
+    @property
+    def curtailed(self) -> float:
+        return self.residual[self.residual > 0].sum()
+
+    def get_kpis(self) -> dict[str, float]:
+        """
+        Returns the scalar key figures of the dispatch.
+
+        Returns:
+            dict[str, float]: The key figures.
+        """
+        kpis = {
+            'storage_unserved':  self.unserved,
+            'storage_curtailed': self.curtailed,
+        }
+
+        for dispatch in self.dispatches:
+            kpis[f'storage_discharged[{dispatch.technology.name}]'] = dispatch.discharged
+            kpis[f'storage_full_cycles[{dispatch.technology.name}]'] = dispatch.full_cycles
+
+        return kpis
+
+
+@dataclass(frozen=True)
+class StorageMix:
+    """
+    Several storage technologies dispatched one after the other by priority,
+    e.g. a battery for the short-term and hydrogen for the long-term balance.
+    Every technology only sees the net balance the technologies before it left over.
+
+    Attributes:
+    -----------
+    technologies (tuple[StorageTechnology, ...]) : The storage technologies.
+
+    Methods:
+    --------
+    create(names: tuple[str, ...]) -> StorageMix
+        Returns the mix of the given STORAGE_TECHNOLOGIES.
+    dispatch(net_balance: NDArray, step_hours: float = 0.25) -> StorageMixDispatch
+        Dispatches all technologies in priority order.
+    """
+    technologies: tuple[StorageTechnology, ...]
+
+    @staticmethod
+    def create(names: tuple[str, ...]) -> 'StorageMix':
+        """
+        Returns the mix of the given STORAGE_TECHNOLOGIES.
+
+        Args:
+            names (tuple[str, ...]): The names of the technologies.
+
+        Returns:
+            StorageMix: The mix.
+
+        Raises:
+            KeyError: If a technology does not exist.
+        """
+        return StorageMix(tuple(STORAGE_TECHNOLOGIES[name] for name in names))
+
+    def dispatch(self, net_balance: NDArray, step_hours: float = 0.25) -> StorageMixDispatch:
+        """
+        Dispatches all technologies in priority order.
+
+        Args:
+            net_balance (NDArray): The production minus the consumption per step in Wh.
+            step_hours (float, optional): The length of a step in hours. Defaults to 0.25.
+
+        Returns:
+            StorageMixDispatch: The dispatch.
+        """
+        residual = np.asarray(net_balance, dtype=float)
+        dispatches = []
+
+        for technology in sorted(self.technologies, key=lambda t: t.priority):
+            dispatch = technology.dispatch(residual, step_hours)
+            residual = residual - dispatch.flow
+            dispatches.append(dispatch)
+
+        return StorageMixDispatch(tuple(dispatches), residual)
+
+
+# The storage technologies of the storage selection.
+# The efficiencies follow the round trips described in the scenario view,
+# the capacities and powers are rough German targets for 2030.
+STORAGE_TECHNOLOGIES: dict[str, StorageTechnology] = {
+    'Batteriespeicher': StorageTechnology(
+        name='Batteriespeicher',
+        capacity=Unit.GWh(100),
+        charge_power=Unit.GW(50),
+        discharge_power=Unit.GW(50),
+        charge_efficiency=0.95,
+        discharge_efficiency=0.95,
+        priority=0,
+    ),
+    'Pumpspeicher': StorageTechnology(
+        name='Pumpspeicher',
+        capacity=Unit.GWh(40),
+        charge_power=Unit.GW(10),
+        discharge_power=Unit.GW(10),
+        charge_efficiency=0.9,
+        discharge_efficiency=0.88,
+        priority=1,
+    ),
+    'Power-to-Gas (Wasserstoff)': StorageTechnology(
+        name='Power-to-Gas (Wasserstoff)',
+        capacity=Unit.TWh(13),
+        charge_power=Unit.GW(10),
+        discharge_power=Unit.GW(25),
+        charge_efficiency=0.85,
+        discharge_efficiency=0.9,
+        priority=2,
+    ),
+    'Power-to-Gas (Methanol)': StorageTechnology(
+        name='Power-to-Gas (Methanol)',
+        capacity=Unit.TWh(10),
+        charge_power=Unit.GW(10),
+        discharge_power=Unit.GW(10),
+        charge_efficiency=0.75,
+        discharge_efficiency=0.73,
+        priority=3,
+    ),
+    'Power-to-Liquid (E-Fuels)': StorageTechnology(
+        name='Power-to-Liquid (E-Fuels)',
+        capacity=Unit.TWh(10),
+        charge_power=Unit.GW(10),
+        discharge_power=Unit.GW(10),
+        charge_efficiency=0.5,
+        discharge_efficiency=0.26,
+        priority=4,
+    ),
+}
@@ -0,0 +1,131 @@
+import io
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import asdict, fields, replace
+from typing import Iterable
+
+import pandas as pd
+
+from data_manager.data_manager import Collections, DataManager
+
+from .engine import Engine, ScenarioParameters
+
+
+# The base dataset of a worker process. It is loaded once per process by Sweep.init_worker().
+worker_data: Collections | None = None
+
+
+class Sweep:
+    """
+    Runs many Prototype v0.2 scenarios, e.g. a grid of target capacities, in parallel.
+
+    Every worker process maps the read-only base dataset from the DataManager cache,
+    so all workers share one physical copy of it.
+    """
+    @staticmethod
+    def grid(base: ScenarioParameters, **axes: Iterable) -> list[ScenarioParameters]:
+        """
+        Returns the cartesian product of the given parameter values.
+
+        Example:
+            Sweep.grid(ScenarioParameters(2020, 750), power_target_pv=[Unit.GW(180), Unit.GW(260)], reference_year=[2020, 2021])
+
+        Args:
+            base (ScenarioParameters): The parameters that are not swept.
+            **axes (Iterable): The values per parameter name.
+
+        Returns:
+            list[ScenarioParameters]: The parameters of every grid point.
+
+        Raises:
+            KeyError: If a parameter name does not exist.
+        """
+        names = {f.name for f in fields(ScenarioParameters)}
+
+        for name in axes:
+            if name not in names:
+                raise KeyError(name)
+
+        keys = list(axes.keys())
+
+        return [replace(base, **dict(zip(keys, values))) for values in itertools.product(*axes.values())]
+
+    @staticmethod
+    def run(params: list[ScenarioParameters], data: Collections | None = None, res_path: str = './static/res/', max_workers: int | None = None) -> pd.DataFrame:
+        """
+        Runs all scenarios and returns one row of parameters and key figures per scenario.
+
+        Args:
+            params (list[ScenarioParameters]): The scenarios.
+            data (Collections, optional): The base dataset. Only used when running in this process (max_workers=1).
+            res_path (str, optional): The resources directory the workers load the base dataset from. Defaults to './static/res/'.
+            max_workers (int, optional): The number of worker processes. Defaults to the number of cores.
+
+        Returns:
+            pd.DataFrame: The results table in the order of params.
+        """
+        global worker_data
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        max_workers = min(max_workers, max(len(params), 1))
+
+        if max_workers == 1:
+            if data is None:
+                Sweep.init_worker(res_path)
+            else:
+                worker_data = data
+
+            rows = [Sweep.run_point(p) for p in params]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=Sweep.init_worker, initargs=(res_path,)) as executor:
+                rows = list(executor.map(Sweep.run_point, params, chunksize=max(1, len(params) // (max_workers * 4))))
+
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def init_worker(res_path: str) -> None:
+        """
+        Loads the base dataset once per worker process.
+
+        Args:
+            res_path (str): The resources directory.
+        """
+        global worker_data
+
+        data_manager = DataManager()
+        data_manager.res_path = res_path
+
+        # The loading summary would be printed once per worker
+        with redirect_stdout(io.StringIO()):
+            worker_data = data_manager.get_data()
+
+        worker_data.freeze()
+
+    @staticmethod
+    def run_point(params: ScenarioParameters) -> dict:
+        """
+        Runs one scenario with the base dataset of this process.
+
+        Args:
+            params (ScenarioParameters): The scenario.
+
+        Returns:
+            dict: The parameters and the key figures. Failed scenarios have an error message.
+        """
+        row = asdict(params)
+
+        try:
+            result = Engine.run(worker_data, params)
+        except Exception as e:
+            row['success'] = False
+            row['error'] = f'{type(e).__name__}: {e}'
+            return row
+
+        row.update(result.get_kpis())
+        row['error'] = None
+
+        return row
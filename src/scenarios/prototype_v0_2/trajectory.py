@@ -0,0 +1,254 @@
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from data_manager.data_manager import Collections
+
+from scenarios.cache import ResultCache
+
+from .engine import Engine, MagicStorage, ScenarioParameters, ScenarioResult
+
+
+# The parameters that change from year to year and are interpolated between milestones.
+# All other parameters are the same for every year of a trajectory.
+MILESTONE_FIELDS: tuple[str, ...] = (
+    'load',
+    'power_target_pv',
+    'power_target_windoff',
+    'power_target_windon',
+    'power_target_biomass',
+    'power_target_hydro',
+)
+
+
+@dataclass(frozen=True)
+class Milestone:
+    """
+    The targets of one year of a trajectory.
+
+    Attributes:
+    -----------
+    year (int) : The year the targets are reached.
+    load (float) : The total consumption in TWh.
+    power_target_pv (float) : The installed PV power in W.
+    power_target_windoff (float) : The installed offshore wind power in W.
+    power_target_windon (float) : The installed onshore wind power in W.
+    power_target_biomass (float) : The installed biomass power in W.
+    power_target_hydro (float) : The installed hydro power in W.
+    """
+    year: int
+    load: float
+    power_target_pv: float
+    power_target_windoff: float
+    power_target_windon: float
+    power_target_biomass: float
+    power_target_hydro: float
+
+    @staticmethod
+    def create(year: int, params: ScenarioParameters) -> 'Milestone':
+        """
+        Returns the milestone with the targets of the given parameters.
+
+        Args:
+            year (int): The year.
+            params (ScenarioParameters): The parameters.
+
+        Returns:
+            Milestone: The milestone.
+        """
+        return Milestone(year, **{name: getattr(params, name) for name in MILESTONE_FIELDS})
+
+
+@dataclass(frozen=True)
+class TrajectoryParameters:
+    """
+    The parameters of a multi-year transition, e.g. from 2025 to 2045.
+
+    Attributes:
+    -----------
+    base (ScenarioParameters) : The parameters that are the same for every year.
+                                Its initial balance is the storage at the start of the first year
+                                and its target balance the storage every year has to end above.
+    milestones (tuple[Milestone, ...]) : The targets. Years in between are interpolated linearly,
+                                         years before the first or after the last milestone keep its targets.
+    first_year (int) : The first simulated year.
+    last_year (int) : The last simulated year.
+    """
+    base: ScenarioParameters
+    milestones: tuple[Milestone, ...]
+    first_year: int = 2025
+    last_year: int  = 2045
+
+    def get_years(self) -> range:
+        return range(self.first_year, self.last_year + 1)
+
+    def get_targets(self, year: int) -> dict[str, float]:
+        """
+        Returns the interpolated targets of a year.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            dict[str, float]: The value per name in MILESTONE_FIELDS.
+
+        Raises:
+            ValueError: If there are no milestones.
+        """
+        if not self.milestones:
+            raise ValueError('A trajectory needs at least one milestone.')
+
+        milestones = sorted(self.milestones, key=lambda m: m.year)
+        years = [m.year for m in milestones]
+
+        return {name: float(np.interp(year, years, [getattr(m, name) for m in milestones])) for name in MILESTONE_FIELDS}
+
+
+@dataclass(frozen=True)
+class TrajectoryYear:
+    """
+    The summary of one year of a trajectory.
+    The full ScenarioResult with all series is not kept, see Trajectory.get_result().
+
+    Attributes:
+    -----------
+    year (int) : The simulated year.
+    params (ScenarioParameters) : The parameters of the year, including the carried over initial balance.
+    kpis (dict[str, float]) : The key figures of the year.
+    remaining_storage (float) : The energy in the storage at the end of the year in Wh.
+    """
+    year: int
+    params: ScenarioParameters
+    kpis: dict[str, float]
+    remaining_storage: float
+
+
+@dataclass(frozen=True)
+class TrajectoryResult:
+    """
+    The result of a multi-year transition.
+
+    Attributes:
+    -----------
+    params (TrajectoryParameters) : The parameters.
+    years (tuple[TrajectoryYear, ...]) : The summary per year.
+    """
+    params: TrajectoryParameters
+    years: tuple[TrajectoryYear, ...]
+
+    @property
+    def success(self) -> bool:
+        return all(year.kpis['success'] for year in self.years)
+
+    def get_kpis(self) -> pd.DataFrame:
+        """
+        Returns the targets and key figures per year.
+
+        Returns:
+            pd.DataFrame: One row per year.
+        """
+        return pd.DataFrame([
+            {
+                'year': year.year,
+                **{name: getattr(year.params, name) for name in MILESTONE_FIELDS},
+                'initial_balance': year.params.initial_balance,
+                **year.kpis,
+            }
+            for year in self.years
+        ])
+
+
+class Trajectory:
+    """
+    Runs Prototype v0.2 for consecutive years with targets interpolated between milestones.
+    The storage carries over from the end of one year into the next,
+    while every year has to end above the target balance of the base parameters.
+
+    Every year is simulated on the quarter hours of the Engine's target year.
+    A year only depends on its targets and the storage it starts with, so with a ResultCache
+    every year is reused until the first year whose targets or initial storage changed,
+    e.g. editing the 2040 milestone keeps all years up to the milestone before it.
+    Only the summary of each year is kept, the series are recomputed or taken from the cache on demand.
+    """
+    @staticmethod
+    def iterate(data: Collections, params: TrajectoryParameters, cache: ResultCache | None = None, progress: Callable[[str], None] | None = None) -> Iterator[TrajectoryYear]:
+        """
+        Simulates the years one after the other.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (TrajectoryParameters): The parameters.
+            cache (ResultCache, optional): Where to look up and store the result of every year. Defaults to no caching.
+            progress (Callable[[str], None], optional): Called with the year and its current step, like in Engine.run().
+
+        Yields:
+            TrajectoryYear: The summary of every year in order.
+        """
+        initial_balance = params.base.initial_balance
+        target_balance = params.base.get_target_balance()
+        years = params.get_years()
+
+        for i, year in enumerate(years):
+            year_params = replace(
+                params.base,
+                **params.get_targets(year),
+                initial_balance=initial_balance,
+                target_balance=target_balance,
+            )
+
+            year_progress = None
+
+            if progress is not None:
+                year_progress = lambda step, year=year, i=i: progress(f'{year} ({i + 1}/{len(years)}) {step}')
+
+            result = Trajectory.get_result(data, year_params, cache, year_progress)
+
+            yield TrajectoryYear(
+                year=year,
+                params=year_params,
+                kpis=result.get_kpis(),
+                remaining_storage=result.remaining_storage,
+            )
+
+            # MagicStorage charges the initial balance with electrolysis,
+            # so the hydrogen left at the end is converted back at the same factor
+            initial_balance = float(result.storage_balance[-1] * MagicStorage.W_TO_H)
+
+    @staticmethod
+    def run(data: Collections, params: TrajectoryParameters, cache: ResultCache | None = None, progress: Callable[[str], None] | None = None) -> TrajectoryResult:
+        """
+        Simulates all years.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (TrajectoryParameters): The parameters.
+            cache (ResultCache, optional): Where to look up and store the result of every year. Defaults to no caching.
+            progress (Callable[[str], None], optional): Called with the year and its current step, like in Engine.run().
+
+        Returns:
+            TrajectoryResult: The summary of every year.
+        """
+        return TrajectoryResult(params, tuple(Trajectory.iterate(data, params, cache, progress)))
+
+    @staticmethod
+    def get_result(data: Collections, params: ScenarioParameters, cache: ResultCache | None = None, progress: Callable[[str], None] | None = None) -> ScenarioResult:
+        """
+        Returns the full result of one year, e.g. of TrajectoryYear.params to plot its series.
+
+        Args:
+            data (Collections): The base dataset. It is only read.
+            params (ScenarioParameters): The parameters of the year.
+            cache (ResultCache, optional): Where to look up and store the result. Defaults to no caching.
+            progress (Callable[[str], None], optional): Passed to Engine.run().
+
+        Returns:
+            ScenarioResult: The result.
+        """
+        if cache is None:
+            return Engine.run(data, params, progress)
+
+        key = ResultCache.get_key(params, data.get_version())
+
+        return cache.get_or_compute(key, lambda: Engine.run(data, params, progress))